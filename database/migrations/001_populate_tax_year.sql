@@ -0,0 +1,30 @@
+-- Populate tax_year from transaction_date for existing rows and keep it in sync.
+-- Earlier CSV imports stored the import year and QIF imports left it empty.
+-- Also add the note column that the importers and the categorize window write,
+-- which the original schema lacked (skipped where it already exists).
+
+ALTER TABLE transactions ADD COLUMN note TEXT;
+
+UPDATE transactions
+SET tax_year = CAST(strftime('%Y', transaction_date) AS INTEGER)
+WHERE strftime('%Y', transaction_date) IS NOT NULL
+  AND (tax_year IS NULL OR tax_year != CAST(strftime('%Y', transaction_date) AS INTEGER));
+
+CREATE TRIGGER IF NOT EXISTS trg_transactions_tax_year_insert
+AFTER INSERT ON transactions
+WHEN NEW.tax_year IS NULL
+BEGIN
+    UPDATE transactions
+    SET tax_year = CAST(strftime('%Y', NEW.transaction_date) AS INTEGER)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_transactions_tax_year_update
+AFTER UPDATE OF transaction_date ON transactions
+BEGIN
+    UPDATE transactions
+    SET tax_year = CAST(strftime('%Y', NEW.transaction_date) AS INTEGER)
+    WHERE id = NEW.id;
+END;
+
+CREATE INDEX IF NOT EXISTS idx_transactions_year_amount ON transactions(tax_year, amount);
@@ -0,0 +1,13 @@
+-- Rules that assign categories to transactions automatically
+
+CREATE TABLE IF NOT EXISTS categorization_rules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_type VARCHAR(10) NOT NULL, -- exact, prefix, substring or regex
+    pattern VARCHAR(255) NOT NULL, -- matched against the normalized payee
+    category_id INTEGER NOT NULL,
+    min_amount DECIMAL(10, 2), -- optional inclusive amount range
+    max_amount DECIMAL(10, 2),
+    priority INTEGER DEFAULT 100, -- lower numbers win
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (category_id) REFERENCES categories(id)
+);
@@ -0,0 +1,10 @@
+-- How often each category has been assigned to each payee, for suggestions.
+-- The counts are built from existing history the first time they are read.
+
+CREATE TABLE IF NOT EXISTS payee_category_counts (
+    payee_key VARCHAR(255) NOT NULL, -- normalized payee without numbers
+    category_id INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (payee_key, category_id),
+    FOREIGN KEY (category_id) REFERENCES categories(id)
+) WITHOUT ROWID;
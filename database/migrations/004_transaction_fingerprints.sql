@@ -0,0 +1,32 @@
+-- Fingerprint every transaction so overlapping imports can skip duplicates.
+-- Rows that are already identical are numbered by id, matching how the importer
+-- numbers identical rows on the same date, so they keep distinct fingerprints.
+
+ALTER TABLE transactions ADD COLUMN fingerprint VARCHAR(40);
+
+WITH numbered AS (
+    SELECT id,
+           account_id,
+           transaction_date,
+           amount,
+           payee_description,
+           reference_number,
+           ROW_NUMBER() OVER (
+               PARTITION BY transaction_fingerprint(account_id, transaction_date, amount,
+                                                    payee_description, reference_number, 0)
+               ORDER BY id
+           ) - 1 AS occurrence
+    FROM transactions
+)
+UPDATE transactions
+SET fingerprint = transaction_fingerprint(numbered.account_id, numbered.transaction_date, numbered.amount,
+                                          numbered.payee_description, numbered.reference_number,
+                                          numbered.occurrence)
+FROM numbered
+WHERE numbered.id = transactions.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_fingerprint ON transactions(fingerprint);
+
+-- Database.bulk_insert_transactions fills tax_year itself; a per-row AFTER INSERT
+-- trigger doubled the cost of large imports even when it had nothing to do
+DROP TRIGGER IF EXISTS trg_transactions_tax_year_insert;
@@ -0,0 +1,120 @@
+-- Materialized per-year, per-category totals for the dashboard, maintained by
+-- triggers and filled from the existing categorizations.
+
+CREATE TABLE IF NOT EXISTS category_year_totals (
+    tax_year INTEGER NOT NULL, -- 0 for transactions without a tax year
+    category_id INTEGER NOT NULL,
+    total_cents INTEGER NOT NULL DEFAULT 0,
+    expense_cents INTEGER NOT NULL DEFAULT 0, -- sum of the negative amounts only
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    expense_count INTEGER NOT NULL DEFAULT 0, -- transactions with a negative amount
+    PRIMARY KEY (tax_year, category_id),
+    FOREIGN KEY (category_id) REFERENCES categories(id)
+) WITHOUT ROWID;
+
+-- Keep category_year_totals in step with categorizations. A new transaction is
+-- uncategorized, so inserting transactions never touches the totals.
+CREATE TRIGGER IF NOT EXISTS trg_category_totals_categorize
+AFTER INSERT ON transaction_categories
+BEGIN
+    INSERT INTO category_year_totals (tax_year, category_id, total_cents, expense_cents, transaction_count, expense_count)
+    SELECT tax_year, NEW.category_id, cents, MIN(cents, 0), 1, cents < 0
+    FROM (SELECT COALESCE(tax_year, 0) AS tax_year, CAST(ROUND(amount * 100) AS INTEGER) AS cents
+          FROM transactions WHERE id = NEW.transaction_id)
+    WHERE true
+    ON CONFLICT (tax_year, category_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        expense_cents = expense_cents + excluded.expense_cents,
+        transaction_count = transaction_count + excluded.transaction_count,
+        expense_count = expense_count + excluded.expense_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_category_totals_uncategorize
+AFTER DELETE ON transaction_categories
+BEGIN
+    UPDATE category_year_totals SET
+        total_cents = total_cents - old_row.cents,
+        expense_cents = expense_cents - MIN(old_row.cents, 0),
+        transaction_count = transaction_count - 1,
+        expense_count = expense_count - (old_row.cents < 0)
+    FROM (SELECT COALESCE(tax_year, 0) AS tax_year, CAST(ROUND(amount * 100) AS INTEGER) AS cents
+          FROM transactions WHERE id = OLD.transaction_id) AS old_row
+    WHERE category_year_totals.tax_year = old_row.tax_year
+      AND category_year_totals.category_id = OLD.category_id;
+    DELETE FROM category_year_totals WHERE category_id = OLD.category_id AND transaction_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_category_totals_recategorize
+AFTER UPDATE OF transaction_id, category_id ON transaction_categories
+BEGIN
+    UPDATE category_year_totals SET
+        total_cents = total_cents - old_row.cents,
+        expense_cents = expense_cents - MIN(old_row.cents, 0),
+        transaction_count = transaction_count - 1,
+        expense_count = expense_count - (old_row.cents < 0)
+    FROM (SELECT COALESCE(tax_year, 0) AS tax_year, CAST(ROUND(amount * 100) AS INTEGER) AS cents
+          FROM transactions WHERE id = OLD.transaction_id) AS old_row
+    WHERE category_year_totals.tax_year = old_row.tax_year
+      AND category_year_totals.category_id = OLD.category_id;
+    DELETE FROM category_year_totals WHERE category_id = OLD.category_id AND transaction_count <= 0;
+    INSERT INTO category_year_totals (tax_year, category_id, total_cents, expense_cents, transaction_count, expense_count)
+    SELECT tax_year, NEW.category_id, cents, MIN(cents, 0), 1, cents < 0
+    FROM (SELECT COALESCE(tax_year, 0) AS tax_year, CAST(ROUND(amount * 100) AS INTEGER) AS cents
+          FROM transactions WHERE id = NEW.transaction_id)
+    WHERE true
+    ON CONFLICT (tax_year, category_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        expense_cents = expense_cents + excluded.expense_cents,
+        transaction_count = transaction_count + excluded.transaction_count,
+        expense_count = expense_count + excluded.expense_count;
+END;
+
+-- A categorized transaction whose amount or tax year changes moves between totals
+CREATE TRIGGER IF NOT EXISTS trg_category_totals_transaction_update
+AFTER UPDATE OF amount, tax_year ON transactions
+WHEN OLD.amount IS NOT NEW.amount OR OLD.tax_year IS NOT NEW.tax_year
+BEGIN
+    UPDATE category_year_totals SET
+        total_cents = total_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        expense_cents = expense_cents - MIN(CAST(ROUND(OLD.amount * 100) AS INTEGER), 0),
+        transaction_count = transaction_count - 1,
+        expense_count = expense_count - (CAST(ROUND(OLD.amount * 100) AS INTEGER) < 0)
+    WHERE tax_year = COALESCE(OLD.tax_year, 0)
+      AND category_id IN (SELECT category_id FROM transaction_categories WHERE transaction_id = OLD.id);
+    INSERT INTO category_year_totals (tax_year, category_id, total_cents, expense_cents, transaction_count, expense_count)
+    SELECT COALESCE(NEW.tax_year, 0), category_id, CAST(ROUND(NEW.amount * 100) AS INTEGER),
+           MIN(CAST(ROUND(NEW.amount * 100) AS INTEGER), 0), 1, CAST(ROUND(NEW.amount * 100) AS INTEGER) < 0
+    FROM transaction_categories WHERE transaction_id = NEW.id
+    ON CONFLICT (tax_year, category_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        expense_cents = expense_cents + excluded.expense_cents,
+        transaction_count = transaction_count + excluded.transaction_count,
+        expense_count = expense_count + excluded.expense_count;
+    DELETE FROM category_year_totals WHERE tax_year = COALESCE(OLD.tax_year, 0) AND transaction_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_category_totals_transaction_delete
+AFTER DELETE ON transactions
+BEGIN
+    UPDATE category_year_totals SET
+        total_cents = total_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        expense_cents = expense_cents - MIN(CAST(ROUND(OLD.amount * 100) AS INTEGER), 0),
+        transaction_count = transaction_count - 1,
+        expense_count = expense_count - (CAST(ROUND(OLD.amount * 100) AS INTEGER) < 0)
+    WHERE tax_year = COALESCE(OLD.tax_year, 0)
+      AND category_id IN (SELECT category_id FROM transaction_categories WHERE transaction_id = OLD.id);
+    DELETE FROM category_year_totals WHERE tax_year = COALESCE(OLD.tax_year, 0) AND transaction_count <= 0;
+END;
+
+DELETE FROM category_year_totals;
+
+INSERT INTO category_year_totals (tax_year, category_id, total_cents, expense_cents, transaction_count, expense_count)
+SELECT COALESCE(t.tax_year, 0),
+       tc.category_id,
+       SUM(CAST(ROUND(t.amount * 100) AS INTEGER)),
+       SUM(MIN(CAST(ROUND(t.amount * 100) AS INTEGER), 0)),
+       COUNT(*),
+       SUM(CAST(ROUND(t.amount * 100) AS INTEGER) < 0)
+FROM transactions t
+INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
+GROUP BY COALESCE(t.tax_year, 0), tc.category_id;
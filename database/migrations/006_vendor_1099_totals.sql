@@ -0,0 +1,76 @@
+-- Running 1099 totals per vendor, year and box, maintained by triggers and
+-- filled from the existing reportable transactions.
+
+CREATE TABLE IF NOT EXISTS vendor_1099_totals (
+    tax_year INTEGER NOT NULL, -- 0 for transactions without a tax year
+    vendor_id INTEGER NOT NULL,
+    payment_type_1099_id INTEGER NOT NULL,
+    total_cents INTEGER NOT NULL DEFAULT 0, -- payments as a positive amount
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tax_year, vendor_id, payment_type_1099_id),
+    FOREIGN KEY (vendor_id) REFERENCES vendors(id),
+    FOREIGN KEY (payment_type_1099_id) REFERENCES payment_types_1099(id)
+) WITHOUT ROWID;
+
+-- Threshold queries on the 1099 running totals
+CREATE INDEX IF NOT EXISTS idx_vendor_1099_totals_year_total ON vendor_1099_totals(tax_year, total_cents);
+
+-- Keep vendor_1099_totals in step with the 1099 fields of transactions. The
+-- importers never set vendor_id or is_1099_reportable, so new transactions
+-- only start counting when an UPDATE marks them; there is deliberately no
+-- INSERT trigger, which would double the cost of bulk imports.
+CREATE TRIGGER IF NOT EXISTS trg_vendor_1099_totals_update
+AFTER UPDATE OF vendor_id, payment_type_1099_id, is_1099_reportable, amount, tax_year ON transactions
+WHEN (OLD.is_1099_reportable AND OLD.amount < 0 AND OLD.vendor_id IS NOT NULL AND OLD.payment_type_1099_id IS NOT NULL)
+  OR (NEW.is_1099_reportable AND NEW.amount < 0 AND NEW.vendor_id IS NOT NULL AND NEW.payment_type_1099_id IS NOT NULL)
+BEGIN
+    UPDATE vendor_1099_totals SET
+        total_cents = total_cents - CAST(ROUND(-OLD.amount * 100) AS INTEGER),
+        transaction_count = transaction_count - 1
+    WHERE OLD.is_1099_reportable AND OLD.amount < 0 AND OLD.vendor_id IS NOT NULL AND OLD.payment_type_1099_id IS NOT NULL
+      AND tax_year = COALESCE(OLD.tax_year, 0)
+      AND vendor_id = OLD.vendor_id
+      AND payment_type_1099_id = OLD.payment_type_1099_id;
+    DELETE FROM vendor_1099_totals
+    WHERE tax_year = COALESCE(OLD.tax_year, 0)
+      AND vendor_id = OLD.vendor_id
+      AND payment_type_1099_id = OLD.payment_type_1099_id
+      AND transaction_count <= 0;
+    INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+    SELECT COALESCE(NEW.tax_year, 0), NEW.vendor_id, NEW.payment_type_1099_id,
+           CAST(ROUND(-NEW.amount * 100) AS INTEGER), 1
+    WHERE NEW.is_1099_reportable AND NEW.amount < 0 AND NEW.vendor_id IS NOT NULL AND NEW.payment_type_1099_id IS NOT NULL
+    ON CONFLICT (tax_year, vendor_id, payment_type_1099_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        transaction_count = transaction_count + excluded.transaction_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_vendor_1099_totals_delete
+AFTER DELETE ON transactions
+WHEN OLD.is_1099_reportable AND OLD.amount < 0 AND OLD.vendor_id IS NOT NULL AND OLD.payment_type_1099_id IS NOT NULL
+BEGIN
+    UPDATE vendor_1099_totals SET
+        total_cents = total_cents - CAST(ROUND(-OLD.amount * 100) AS INTEGER),
+        transaction_count = transaction_count - 1
+    WHERE tax_year = COALESCE(OLD.tax_year, 0)
+      AND vendor_id = OLD.vendor_id
+      AND payment_type_1099_id = OLD.payment_type_1099_id;
+    DELETE FROM vendor_1099_totals
+    WHERE tax_year = COALESCE(OLD.tax_year, 0)
+      AND vendor_id = OLD.vendor_id
+      AND payment_type_1099_id = OLD.payment_type_1099_id
+      AND transaction_count <= 0;
+END;
+
+INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+SELECT COALESCE(tax_year, 0),
+       vendor_id,
+       payment_type_1099_id,
+       SUM(CAST(ROUND(-amount * 100) AS INTEGER)),
+       COUNT(*)
+FROM transactions
+WHERE is_1099_reportable
+  AND amount < 0
+  AND vendor_id IS NOT NULL
+  AND payment_type_1099_id IS NOT NULL
+GROUP BY COALESCE(tax_year, 0), vendor_id, payment_type_1099_id;
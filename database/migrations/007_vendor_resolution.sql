@@ -0,0 +1,11 @@
+-- Vendor resolution: a default 1099 box per vendor and payee aliases.
+
+ALTER TABLE vendors ADD COLUMN default_payment_type_1099_id INTEGER REFERENCES payment_types_1099(id);
+
+-- Payee spellings that identify a vendor, in addition to its vendor and
+-- business names. Payees match an alias on a whole-word prefix.
+CREATE TABLE IF NOT EXISTS vendor_aliases (
+    alias VARCHAR(255) PRIMARY KEY, -- normalized with vendors.vendor_key
+    vendor_id INTEGER NOT NULL,
+    FOREIGN KEY (vendor_id) REFERENCES vendors(id)
+) WITHOUT ROWID;
@@ -0,0 +1,42 @@
+-- Full-text search over payee, address and note, kept in sync by triggers and
+-- filled from the existing transactions. Databases that predate the note
+-- column stopped here before migration 001 added it, so add it again (skipped
+-- where it already exists).
+
+ALTER TABLE transactions ADD COLUMN note TEXT;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+    payee_description,
+    address_info,
+    note,
+    content='transactions',
+    content_rowid='id',
+    prefix='2 3'
+);
+
+-- Keep transactions_fts in step with the searchable columns. Bulk imports
+-- suspend the insert trigger and index their new rows in one statement.
+CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_insert
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO transactions_fts (rowid, payee_description, address_info, note)
+    VALUES (NEW.id, NEW.payee_description, NEW.address_info, NEW.note);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_delete
+AFTER DELETE ON transactions
+BEGIN
+    INSERT INTO transactions_fts (transactions_fts, rowid, payee_description, address_info, note)
+    VALUES ('delete', OLD.id, OLD.payee_description, OLD.address_info, OLD.note);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_update
+AFTER UPDATE OF payee_description, address_info, note ON transactions
+BEGIN
+    INSERT INTO transactions_fts (transactions_fts, rowid, payee_description, address_info, note)
+    VALUES ('delete', OLD.id, OLD.payee_description, OLD.address_info, OLD.note);
+    INSERT INTO transactions_fts (rowid, payee_description, address_info, note)
+    VALUES (NEW.id, NEW.payee_description, NEW.address_info, NEW.note);
+END;
+
+INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild');
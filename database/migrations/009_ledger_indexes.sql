@@ -0,0 +1,5 @@
+-- Ledger pages filtered by account are walked in date order; the composite
+-- index also serves every lookup the account_id index did.
+
+DROP INDEX IF EXISTS idx_transactions_account_id;
+CREATE INDEX IF NOT EXISTS idx_transactions_account_date ON transactions(account_id, transaction_date);
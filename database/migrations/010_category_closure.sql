@@ -0,0 +1,72 @@
+-- Category hierarchy: every ancestor/descendant pair of categories.parent_category_id,
+-- maintained by triggers and filled from the existing categories.
+
+CREATE TABLE IF NOT EXISTS category_closure (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL, -- 0 for a category's row for itself, 1 for its parent, ...
+    PRIMARY KEY (ancestor_id, descendant_id),
+    FOREIGN KEY (ancestor_id) REFERENCES categories(id),
+    FOREIGN KEY (descendant_id) REFERENCES categories(id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_category_closure_descendant ON category_closure(descendant_id, depth);
+
+-- A new category is its own ancestor and inherits its parent's ancestors
+CREATE TRIGGER IF NOT EXISTS trg_category_closure_insert
+AFTER INSERT ON categories
+BEGIN
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT NEW.id, NEW.id, 0
+    UNION ALL
+    SELECT ancestor_id, NEW.id, depth + 1 FROM category_closure WHERE descendant_id = NEW.parent_category_id;
+END;
+
+-- A category cannot move under itself or one of its own subcategories
+CREATE TRIGGER IF NOT EXISTS trg_category_closure_check_parent
+BEFORE UPDATE OF parent_category_id ON categories
+WHEN NEW.parent_category_id IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'a category cannot be moved under its own subcategory')
+    WHERE EXISTS (SELECT 1 FROM category_closure
+                  WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_category_id);
+END;
+
+-- Moving a category moves its whole subtree: detach it from the old
+-- ancestors, then attach it below every ancestor of the new parent
+CREATE TRIGGER IF NOT EXISTS trg_category_closure_move
+AFTER UPDATE OF parent_category_id ON categories
+WHEN OLD.parent_category_id IS NOT NEW.parent_category_id
+BEGIN
+    DELETE FROM category_closure
+    WHERE descendant_id IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = NEW.id)
+      AND ancestor_id NOT IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = NEW.id);
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT a.ancestor_id, d.descendant_id, a.depth + d.depth + 1
+    FROM category_closure a
+    INNER JOIN category_closure d ON d.ancestor_id = NEW.id
+    WHERE a.descendant_id = NEW.parent_category_id;
+END;
+
+-- The subcategories of a deleted category move up to its parent
+CREATE TRIGGER IF NOT EXISTS trg_category_closure_delete
+AFTER DELETE ON categories
+BEGIN
+    DELETE FROM category_closure WHERE ancestor_id = OLD.id OR descendant_id = OLD.id;
+    UPDATE categories SET parent_category_id = OLD.parent_category_id WHERE parent_category_id = OLD.id;
+END;
+
+DELETE FROM category_closure;
+
+-- The depth limit stops the walk on a parent_category_id cycle
+INSERT OR IGNORE INTO category_closure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE closure (ancestor_id, descendant_id, depth) AS (
+    SELECT id, id, 0 FROM categories
+    UNION ALL
+    SELECT parent.id, closure.descendant_id, closure.depth + 1
+    FROM closure
+    INNER JOIN categories c ON c.id = closure.ancestor_id
+    INNER JOIN categories parent ON parent.id = c.parent_category_id
+    WHERE closure.depth < (SELECT COUNT(*) FROM categories)
+)
+SELECT ancestor_id, descendant_id, MIN(depth) FROM closure GROUP BY ancestor_id, descendant_id;
@@ -0,0 +1,18 @@
+-- Migration 004 dropped the tax_year insert trigger because bulk imports fill
+-- tax_year themselves, but rows inserted any other way (execute_sql, manual
+-- SQL) were then left without a tax year. Restore it; bulk imports suspend it
+-- for the batch instead. Backfill the rows inserted while it was missing.
+
+UPDATE transactions
+SET tax_year = CAST(strftime('%Y', transaction_date) AS INTEGER)
+WHERE tax_year IS NULL
+  AND strftime('%Y', transaction_date) IS NOT NULL;
+
+CREATE TRIGGER IF NOT EXISTS trg_transactions_tax_year_insert
+AFTER INSERT ON transactions
+WHEN NEW.tax_year IS NULL
+BEGIN
+    UPDATE transactions
+    SET tax_year = CAST(strftime('%Y', NEW.transaction_date) AS INTEGER)
+    WHERE id = NEW.id;
+END;
@@ -0,0 +1,68 @@
+-- Count reportable transactions in vendor_1099_totals as soon as they are
+-- inserted. Migration 006 only counted rows UPDATEd into reportable state, so
+-- rows inserted already reportable with a tax_year were missing from the
+-- totals. Bulk imports suspend the insert trigger and total their new rows in
+-- one statement.
+
+CREATE TRIGGER IF NOT EXISTS trg_vendor_1099_totals_insert
+AFTER INSERT ON transactions
+WHEN NEW.is_1099_reportable AND NEW.amount < 0 AND NEW.vendor_id IS NOT NULL AND NEW.payment_type_1099_id IS NOT NULL
+BEGIN
+    INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+    VALUES (COALESCE(NEW.tax_year, 0), NEW.vendor_id, NEW.payment_type_1099_id,
+            CAST(ROUND(-NEW.amount * 100) AS INTEGER), 1)
+    ON CONFLICT (tax_year, vendor_id, payment_type_1099_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        transaction_count = transaction_count + excluded.transaction_count;
+    DELETE FROM vendor_1099_totals
+    WHERE tax_year = COALESCE(NEW.tax_year, 0)
+      AND vendor_id = NEW.vendor_id
+      AND payment_type_1099_id = NEW.payment_type_1099_id
+      AND transaction_count = 0;
+END;
+
+-- The old values come out and the new ones go in as deltas, and a total is
+-- only dropped once its count is back to zero. An insert with no tax_year
+-- fires the tax_year trigger's UPDATE as well as the insert trigger, in no
+-- guaranteed order, and deltas give the same totals either way.
+DROP TRIGGER IF EXISTS trg_vendor_1099_totals_update;
+CREATE TRIGGER trg_vendor_1099_totals_update
+AFTER UPDATE OF vendor_id, payment_type_1099_id, is_1099_reportable, amount, tax_year ON transactions
+WHEN (OLD.is_1099_reportable AND OLD.amount < 0 AND OLD.vendor_id IS NOT NULL AND OLD.payment_type_1099_id IS NOT NULL)
+  OR (NEW.is_1099_reportable AND NEW.amount < 0 AND NEW.vendor_id IS NOT NULL AND NEW.payment_type_1099_id IS NOT NULL)
+BEGIN
+    INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+    SELECT COALESCE(OLD.tax_year, 0), OLD.vendor_id, OLD.payment_type_1099_id,
+           -CAST(ROUND(-OLD.amount * 100) AS INTEGER), -1
+    WHERE OLD.is_1099_reportable AND OLD.amount < 0 AND OLD.vendor_id IS NOT NULL AND OLD.payment_type_1099_id IS NOT NULL
+    ON CONFLICT (tax_year, vendor_id, payment_type_1099_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        transaction_count = transaction_count + excluded.transaction_count;
+    INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+    SELECT COALESCE(NEW.tax_year, 0), NEW.vendor_id, NEW.payment_type_1099_id,
+           CAST(ROUND(-NEW.amount * 100) AS INTEGER), 1
+    WHERE NEW.is_1099_reportable AND NEW.amount < 0 AND NEW.vendor_id IS NOT NULL AND NEW.payment_type_1099_id IS NOT NULL
+    ON CONFLICT (tax_year, vendor_id, payment_type_1099_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        transaction_count = transaction_count + excluded.transaction_count;
+    DELETE FROM vendor_1099_totals
+    WHERE transaction_count = 0
+      AND ((tax_year = COALESCE(OLD.tax_year, 0) AND vendor_id = OLD.vendor_id AND payment_type_1099_id = OLD.payment_type_1099_id)
+        OR (tax_year = COALESCE(NEW.tax_year, 0) AND vendor_id = NEW.vendor_id AND payment_type_1099_id = NEW.payment_type_1099_id));
+END;
+
+-- Recount, picking up the rows inserted while there was no insert trigger
+DELETE FROM vendor_1099_totals;
+
+INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+SELECT COALESCE(tax_year, 0),
+       vendor_id,
+       payment_type_1099_id,
+       SUM(CAST(ROUND(-amount * 100) AS INTEGER)),
+       COUNT(*)
+FROM transactions
+WHERE is_1099_reportable
+  AND amount < 0
+  AND vendor_id IS NOT NULL
+  AND payment_type_1099_id IS NOT NULL
+GROUP BY COALESCE(tax_year, 0), vendor_id, payment_type_1099_id;
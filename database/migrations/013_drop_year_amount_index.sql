@@ -0,0 +1,6 @@
+-- The dashboard totals come from category_year_totals now, so no query uses
+-- the (tax_year, amount) index that migration 001 added for them. Year
+-- filters on transactions use idx_transactions_tax_year, and the unused index
+-- only slowed every insert.
+
+DROP INDEX IF EXISTS idx_transactions_year_amount;
@@ -30,8 +30,10 @@ CREATE TABLE vendors (
     email VARCHAR(255),
     phone VARCHAR(20),
     requires_1099 BOOLEAN DEFAULT FALSE,
+    default_payment_type_1099_id INTEGER, -- 1099 box for payments matched to this vendor
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (default_payment_type_1099_id) REFERENCES payment_types_1099(id)
 );
 
 -- 1099 Payment Types table
@@ -51,10 +53,12 @@ CREATE TABLE transactions (
     payee_description TEXT,
     address_info VARCHAR(255),
     amount DECIMAL(10, 2) NOT NULL,
+    note TEXT,
     vendor_id INTEGER,
     payment_type_1099_id INTEGER,
     is_1099_reportable BOOLEAN DEFAULT FALSE,
     tax_year INTEGER,
+    fingerprint VARCHAR(40), -- hash of account, date, amount, payee and reference; see db.transaction_fingerprint
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (account_id) REFERENCES accounts(id),
@@ -70,3 +74,87 @@ CREATE TABLE transaction_categories (
     FOREIGN KEY (transaction_id) REFERENCES transactions(id),
     FOREIGN KEY (category_id) REFERENCES categories(id)
 );
+
+-- Rules that assign categories to transactions automatically
+CREATE TABLE categorization_rules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_type VARCHAR(10) NOT NULL, -- exact, prefix, substring or regex
+    pattern VARCHAR(255) NOT NULL, -- matched against the normalized payee
+    category_id INTEGER NOT NULL,
+    min_amount DECIMAL(10, 2), -- optional inclusive amount range
+    max_amount DECIMAL(10, 2),
+    priority INTEGER DEFAULT 100, -- lower numbers win
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (category_id) REFERENCES categories(id)
+);
+
+-- How often each category has been assigned to each payee, for suggestions
+CREATE TABLE payee_category_counts (
+    payee_key VARCHAR(255) NOT NULL, -- normalized payee without numbers
+    category_id INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (payee_key, category_id),
+    FOREIGN KEY (category_id) REFERENCES categories(id)
+) WITHOUT ROWID;
+
+-- Categorized totals per tax year and category, in cents, for the dashboard.
+-- Kept up to date by the trg_category_totals_* triggers; see
+-- Database.rebuild_category_year_totals to recompute it from scratch.
+CREATE TABLE category_year_totals (
+    tax_year INTEGER NOT NULL, -- 0 for transactions without a tax year
+    category_id INTEGER NOT NULL,
+    total_cents INTEGER NOT NULL DEFAULT 0,
+    expense_cents INTEGER NOT NULL DEFAULT 0, -- sum of the negative amounts only
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    expense_count INTEGER NOT NULL DEFAULT 0, -- transactions with a negative amount
+    PRIMARY KEY (tax_year, category_id),
+    FOREIGN KEY (category_id) REFERENCES categories(id)
+) WITHOUT ROWID;
+
+-- Every ancestor/descendant pair of the category hierarchy, so a category's
+-- whole subtree is one indexed lookup. Kept up to date by the
+-- trg_category_closure_* triggers; see Database.rebuild_category_closure.
+CREATE TABLE category_closure (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL, -- 0 for a category's row for itself, 1 for its parent, ...
+    PRIMARY KEY (ancestor_id, descendant_id),
+    FOREIGN KEY (ancestor_id) REFERENCES categories(id),
+    FOREIGN KEY (descendant_id) REFERENCES categories(id)
+) WITHOUT ROWID;
+
+-- Running 1099 totals per tax year, vendor and 1099 box, in cents. Covers the
+-- rows v_1099_summary aggregates: reportable outgoing payments with a vendor
+-- and a payment type. Kept up to date by the trg_vendor_1099_totals_* triggers;
+-- see Database.rebuild_vendor_1099_totals to recompute it from scratch.
+CREATE TABLE vendor_1099_totals (
+    tax_year INTEGER NOT NULL, -- 0 for transactions without a tax year
+    vendor_id INTEGER NOT NULL,
+    payment_type_1099_id INTEGER NOT NULL,
+    total_cents INTEGER NOT NULL DEFAULT 0, -- payments as a positive amount
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tax_year, vendor_id, payment_type_1099_id),
+    FOREIGN KEY (vendor_id) REFERENCES vendors(id),
+    FOREIGN KEY (payment_type_1099_id) REFERENCES payment_types_1099(id)
+) WITHOUT ROWID;
+
+-- Payee spellings that identify a vendor, in addition to its vendor and
+-- business names. Payees match an alias on a whole-word prefix.
+CREATE TABLE vendor_aliases (
+    alias VARCHAR(255) PRIMARY KEY, -- normalized with vendors.vendor_key
+    vendor_id INTEGER NOT NULL,
+    FOREIGN KEY (vendor_id) REFERENCES vendors(id)
+) WITHOUT ROWID;
+
+-- Full-text index over the searchable transaction text, stored as an
+-- external-content FTS5 table so the text itself is not duplicated. Kept in
+-- sync by the trg_transactions_fts_* triggers; prefix indexes make
+-- search-as-you-type prefix queries cheap.
+CREATE VIRTUAL TABLE transactions_fts USING fts5(
+    payee_description,
+    address_info,
+    note,
+    content='transactions',
+    content_rowid='id',
+    prefix='2 3'
+);
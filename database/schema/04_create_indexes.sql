@@ -6,6 +6,17 @@ CREATE INDEX idx_transactions_vendor_id ON transactions(vendor_id);
 CREATE INDEX idx_transactions_1099_reportable ON transactions(is_1099_reportable);
 CREATE INDEX idx_transactions_tax_year ON transactions(tax_year);
 CREATE INDEX idx_transactions_date ON transactions(transaction_date);
-CREATE INDEX idx_transactions_account_id ON transactions(account_id);
 CREATE INDEX idx_transaction_categories_transaction_id ON transaction_categories(transaction_id);
 CREATE INDEX idx_transaction_categories_category_id ON transaction_categories(category_id);
+
+-- One row per fingerprint so re-imported transactions are skipped
+CREATE UNIQUE INDEX idx_transactions_fingerprint ON transactions(fingerprint);
+
+-- Threshold queries on the 1099 running totals
+CREATE INDEX idx_vendor_1099_totals_year_total ON vendor_1099_totals(tax_year, total_cents);
+
+-- Ledger pages filtered by account, walked in date order
+CREATE INDEX idx_transactions_account_date ON transactions(account_id, transaction_date);
+
+-- Ancestors of a category, for rolling totals up the category hierarchy
+CREATE INDEX idx_category_closure_descendant ON category_closure(descendant_id, depth);
@@ -0,0 +1,250 @@
+-- Create triggers that keep derived columns in sync
+
+-- Fill in tax_year for transactions inserted without one. Bulk imports fill it
+-- themselves and suspend this trigger for the batch.
+CREATE TRIGGER trg_transactions_tax_year_insert
+AFTER INSERT ON transactions
+WHEN NEW.tax_year IS NULL
+BEGIN
+    UPDATE transactions
+    SET tax_year = CAST(strftime('%Y', NEW.transaction_date) AS INTEGER)
+    WHERE id = NEW.id;
+END;
+
+-- Move a transaction to the right tax year when its date changes
+CREATE TRIGGER trg_transactions_tax_year_update
+AFTER UPDATE OF transaction_date ON transactions
+BEGIN
+    UPDATE transactions
+    SET tax_year = CAST(strftime('%Y', NEW.transaction_date) AS INTEGER)
+    WHERE id = NEW.id;
+END;
+
+-- Keep category_year_totals in step with categorizations. A new transaction is
+-- uncategorized, so inserting transactions never touches the totals.
+CREATE TRIGGER trg_category_totals_categorize
+AFTER INSERT ON transaction_categories
+BEGIN
+    INSERT INTO category_year_totals (tax_year, category_id, total_cents, expense_cents, transaction_count, expense_count)
+    SELECT tax_year, NEW.category_id, cents, MIN(cents, 0), 1, cents < 0
+    FROM (SELECT COALESCE(tax_year, 0) AS tax_year, CAST(ROUND(amount * 100) AS INTEGER) AS cents
+          FROM transactions WHERE id = NEW.transaction_id)
+    WHERE true
+    ON CONFLICT (tax_year, category_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        expense_cents = expense_cents + excluded.expense_cents,
+        transaction_count = transaction_count + excluded.transaction_count,
+        expense_count = expense_count + excluded.expense_count;
+END;
+
+CREATE TRIGGER trg_category_totals_uncategorize
+AFTER DELETE ON transaction_categories
+BEGIN
+    UPDATE category_year_totals SET
+        total_cents = total_cents - old_row.cents,
+        expense_cents = expense_cents - MIN(old_row.cents, 0),
+        transaction_count = transaction_count - 1,
+        expense_count = expense_count - (old_row.cents < 0)
+    FROM (SELECT COALESCE(tax_year, 0) AS tax_year, CAST(ROUND(amount * 100) AS INTEGER) AS cents
+          FROM transactions WHERE id = OLD.transaction_id) AS old_row
+    WHERE category_year_totals.tax_year = old_row.tax_year
+      AND category_year_totals.category_id = OLD.category_id;
+    DELETE FROM category_year_totals WHERE category_id = OLD.category_id AND transaction_count <= 0;
+END;
+
+CREATE TRIGGER trg_category_totals_recategorize
+AFTER UPDATE OF transaction_id, category_id ON transaction_categories
+BEGIN
+    UPDATE category_year_totals SET
+        total_cents = total_cents - old_row.cents,
+        expense_cents = expense_cents - MIN(old_row.cents, 0),
+        transaction_count = transaction_count - 1,
+        expense_count = expense_count - (old_row.cents < 0)
+    FROM (SELECT COALESCE(tax_year, 0) AS tax_year, CAST(ROUND(amount * 100) AS INTEGER) AS cents
+          FROM transactions WHERE id = OLD.transaction_id) AS old_row
+    WHERE category_year_totals.tax_year = old_row.tax_year
+      AND category_year_totals.category_id = OLD.category_id;
+    DELETE FROM category_year_totals WHERE category_id = OLD.category_id AND transaction_count <= 0;
+    INSERT INTO category_year_totals (tax_year, category_id, total_cents, expense_cents, transaction_count, expense_count)
+    SELECT tax_year, NEW.category_id, cents, MIN(cents, 0), 1, cents < 0
+    FROM (SELECT COALESCE(tax_year, 0) AS tax_year, CAST(ROUND(amount * 100) AS INTEGER) AS cents
+          FROM transactions WHERE id = NEW.transaction_id)
+    WHERE true
+    ON CONFLICT (tax_year, category_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        expense_cents = expense_cents + excluded.expense_cents,
+        transaction_count = transaction_count + excluded.transaction_count,
+        expense_count = expense_count + excluded.expense_count;
+END;
+
+-- A categorized transaction whose amount or tax year changes moves between totals
+CREATE TRIGGER trg_category_totals_transaction_update
+AFTER UPDATE OF amount, tax_year ON transactions
+WHEN OLD.amount IS NOT NEW.amount OR OLD.tax_year IS NOT NEW.tax_year
+BEGIN
+    UPDATE category_year_totals SET
+        total_cents = total_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        expense_cents = expense_cents - MIN(CAST(ROUND(OLD.amount * 100) AS INTEGER), 0),
+        transaction_count = transaction_count - 1,
+        expense_count = expense_count - (CAST(ROUND(OLD.amount * 100) AS INTEGER) < 0)
+    WHERE tax_year = COALESCE(OLD.tax_year, 0)
+      AND category_id IN (SELECT category_id FROM transaction_categories WHERE transaction_id = OLD.id);
+    INSERT INTO category_year_totals (tax_year, category_id, total_cents, expense_cents, transaction_count, expense_count)
+    SELECT COALESCE(NEW.tax_year, 0), category_id, CAST(ROUND(NEW.amount * 100) AS INTEGER),
+           MIN(CAST(ROUND(NEW.amount * 100) AS INTEGER), 0), 1, CAST(ROUND(NEW.amount * 100) AS INTEGER) < 0
+    FROM transaction_categories WHERE transaction_id = NEW.id
+    ON CONFLICT (tax_year, category_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        expense_cents = expense_cents + excluded.expense_cents,
+        transaction_count = transaction_count + excluded.transaction_count,
+        expense_count = expense_count + excluded.expense_count;
+    DELETE FROM category_year_totals WHERE tax_year = COALESCE(OLD.tax_year, 0) AND transaction_count <= 0;
+END;
+
+CREATE TRIGGER trg_category_totals_transaction_delete
+AFTER DELETE ON transactions
+BEGIN
+    UPDATE category_year_totals SET
+        total_cents = total_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER),
+        expense_cents = expense_cents - MIN(CAST(ROUND(OLD.amount * 100) AS INTEGER), 0),
+        transaction_count = transaction_count - 1,
+        expense_count = expense_count - (CAST(ROUND(OLD.amount * 100) AS INTEGER) < 0)
+    WHERE tax_year = COALESCE(OLD.tax_year, 0)
+      AND category_id IN (SELECT category_id FROM transaction_categories WHERE transaction_id = OLD.id);
+    DELETE FROM category_year_totals WHERE tax_year = COALESCE(OLD.tax_year, 0) AND transaction_count <= 0;
+END;
+
+-- Keep vendor_1099_totals in step with the 1099 fields of transactions. Bulk
+-- imports suspend the insert trigger and total their new rows in one statement.
+CREATE TRIGGER trg_vendor_1099_totals_insert
+AFTER INSERT ON transactions
+WHEN NEW.is_1099_reportable AND NEW.amount < 0 AND NEW.vendor_id IS NOT NULL AND NEW.payment_type_1099_id IS NOT NULL
+BEGIN
+    INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+    VALUES (COALESCE(NEW.tax_year, 0), NEW.vendor_id, NEW.payment_type_1099_id,
+            CAST(ROUND(-NEW.amount * 100) AS INTEGER), 1)
+    ON CONFLICT (tax_year, vendor_id, payment_type_1099_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        transaction_count = transaction_count + excluded.transaction_count;
+    DELETE FROM vendor_1099_totals
+    WHERE tax_year = COALESCE(NEW.tax_year, 0)
+      AND vendor_id = NEW.vendor_id
+      AND payment_type_1099_id = NEW.payment_type_1099_id
+      AND transaction_count = 0;
+END;
+
+-- The old values come out and the new ones go in as deltas, and a total is
+-- only dropped once its count is back to zero. An insert with no tax_year
+-- fires the tax_year trigger's UPDATE as well as the insert trigger, in no
+-- guaranteed order, and deltas give the same totals either way.
+CREATE TRIGGER trg_vendor_1099_totals_update
+AFTER UPDATE OF vendor_id, payment_type_1099_id, is_1099_reportable, amount, tax_year ON transactions
+WHEN (OLD.is_1099_reportable AND OLD.amount < 0 AND OLD.vendor_id IS NOT NULL AND OLD.payment_type_1099_id IS NOT NULL)
+  OR (NEW.is_1099_reportable AND NEW.amount < 0 AND NEW.vendor_id IS NOT NULL AND NEW.payment_type_1099_id IS NOT NULL)
+BEGIN
+    INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+    SELECT COALESCE(OLD.tax_year, 0), OLD.vendor_id, OLD.payment_type_1099_id,
+           -CAST(ROUND(-OLD.amount * 100) AS INTEGER), -1
+    WHERE OLD.is_1099_reportable AND OLD.amount < 0 AND OLD.vendor_id IS NOT NULL AND OLD.payment_type_1099_id IS NOT NULL
+    ON CONFLICT (tax_year, vendor_id, payment_type_1099_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        transaction_count = transaction_count + excluded.transaction_count;
+    INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+    SELECT COALESCE(NEW.tax_year, 0), NEW.vendor_id, NEW.payment_type_1099_id,
+           CAST(ROUND(-NEW.amount * 100) AS INTEGER), 1
+    WHERE NEW.is_1099_reportable AND NEW.amount < 0 AND NEW.vendor_id IS NOT NULL AND NEW.payment_type_1099_id IS NOT NULL
+    ON CONFLICT (tax_year, vendor_id, payment_type_1099_id) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        transaction_count = transaction_count + excluded.transaction_count;
+    DELETE FROM vendor_1099_totals
+    WHERE transaction_count = 0
+      AND ((tax_year = COALESCE(OLD.tax_year, 0) AND vendor_id = OLD.vendor_id AND payment_type_1099_id = OLD.payment_type_1099_id)
+        OR (tax_year = COALESCE(NEW.tax_year, 0) AND vendor_id = NEW.vendor_id AND payment_type_1099_id = NEW.payment_type_1099_id));
+END;
+
+CREATE TRIGGER trg_vendor_1099_totals_delete
+AFTER DELETE ON transactions
+WHEN OLD.is_1099_reportable AND OLD.amount < 0 AND OLD.vendor_id IS NOT NULL AND OLD.payment_type_1099_id IS NOT NULL
+BEGIN
+    UPDATE vendor_1099_totals SET
+        total_cents = total_cents - CAST(ROUND(-OLD.amount * 100) AS INTEGER),
+        transaction_count = transaction_count - 1
+    WHERE tax_year = COALESCE(OLD.tax_year, 0)
+      AND vendor_id = OLD.vendor_id
+      AND payment_type_1099_id = OLD.payment_type_1099_id;
+    DELETE FROM vendor_1099_totals
+    WHERE tax_year = COALESCE(OLD.tax_year, 0)
+      AND vendor_id = OLD.vendor_id
+      AND payment_type_1099_id = OLD.payment_type_1099_id
+      AND transaction_count <= 0;
+END;
+
+-- Keep transactions_fts in step with the searchable columns. Bulk imports
+-- suspend the insert trigger and index their new rows in one statement.
+CREATE TRIGGER trg_transactions_fts_insert
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO transactions_fts (rowid, payee_description, address_info, note)
+    VALUES (NEW.id, NEW.payee_description, NEW.address_info, NEW.note);
+END;
+
+CREATE TRIGGER trg_transactions_fts_delete
+AFTER DELETE ON transactions
+BEGIN
+    INSERT INTO transactions_fts (transactions_fts, rowid, payee_description, address_info, note)
+    VALUES ('delete', OLD.id, OLD.payee_description, OLD.address_info, OLD.note);
+END;
+
+CREATE TRIGGER trg_transactions_fts_update
+AFTER UPDATE OF payee_description, address_info, note ON transactions
+BEGIN
+    INSERT INTO transactions_fts (transactions_fts, rowid, payee_description, address_info, note)
+    VALUES ('delete', OLD.id, OLD.payee_description, OLD.address_info, OLD.note);
+    INSERT INTO transactions_fts (rowid, payee_description, address_info, note)
+    VALUES (NEW.id, NEW.payee_description, NEW.address_info, NEW.note);
+END;
+
+-- Keep category_closure in step with categories.parent_category_id. A new
+-- category is its own ancestor and inherits its parent's ancestors.
+CREATE TRIGGER trg_category_closure_insert
+AFTER INSERT ON categories
+BEGIN
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT NEW.id, NEW.id, 0
+    UNION ALL
+    SELECT ancestor_id, NEW.id, depth + 1 FROM category_closure WHERE descendant_id = NEW.parent_category_id;
+END;
+
+-- A category cannot move under itself or one of its own subcategories
+CREATE TRIGGER trg_category_closure_check_parent
+BEFORE UPDATE OF parent_category_id ON categories
+WHEN NEW.parent_category_id IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'a category cannot be moved under its own subcategory')
+    WHERE EXISTS (SELECT 1 FROM category_closure
+                  WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_category_id);
+END;
+
+-- Moving a category moves its whole subtree: detach it from the old
+-- ancestors, then attach it below every ancestor of the new parent
+CREATE TRIGGER trg_category_closure_move
+AFTER UPDATE OF parent_category_id ON categories
+WHEN OLD.parent_category_id IS NOT NEW.parent_category_id
+BEGIN
+    DELETE FROM category_closure
+    WHERE descendant_id IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = NEW.id)
+      AND ancestor_id NOT IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = NEW.id);
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT a.ancestor_id, d.descendant_id, a.depth + d.depth + 1
+    FROM category_closure a
+    INNER JOIN category_closure d ON d.ancestor_id = NEW.id
+    WHERE a.descendant_id = NEW.parent_category_id;
+END;
+
+-- The subcategories of a deleted category move up to its parent
+CREATE TRIGGER trg_category_closure_delete
+AFTER DELETE ON categories
+BEGIN
+    DELETE FROM category_closure WHERE ancestor_id = OLD.id OR descendant_id = OLD.id;
+    UPDATE categories SET parent_category_id = OLD.parent_category_id WHERE parent_category_id = OLD.id;
+END;
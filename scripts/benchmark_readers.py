@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming CSV/QIF readers against the memory-mapped fast path.
+
+Generates synthetic exports of each requested size, then times every reader
+over every file in a fresh process so the peak memory of one reader does not
+hide another's. Usage:
+
+    python scripts/benchmark_readers.py                   # 1 MB to 1 GB
+    python scripts/benchmark_readers.py --sizes 1 10 100 --formats csv
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Add the project root and the CLI scripts to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'cli'))
+
+DEFAULT_SIZES_MB = [1, 10, 100, 1000]
+
+# Share of generated CSV rows with a quoted payee, as bank exports have for names with commas
+QUOTED_SHARE = 0.01
+
+READERS = {
+    "csv": [("csv_to_rows", "import_csv", "csv_to_rows"), ("csv_to_rows_mmap", "import_csv", "csv_to_rows_mmap")],
+    "qif": [("qif_to_rows", "import_qif", "qif_to_rows"), ("qif_to_rows_mmap", "import_qif", "qif_to_rows_mmap")],
+}
+
+
+def csv_record(rng, i):
+    payee = f"PAYEE {rng.randrange(5000)} STORE #{rng.randrange(999)}"
+    if rng.random() < QUOTED_SHARE:
+        payee = f'"{payee}, INC"'
+    return (f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(2018, 2025)},{i},{payee},"
+            f"{rng.randrange(9999)} MAIN ST SEATTLE WA,{rng.uniform(-2000, 2000):.2f}\n")
+
+
+def qif_record(rng, i):
+    return (f"D{rng.randint(1, 12)}/{rng.randint(1, 28)}'{rng.randint(18, 25)}\n"
+            f"T{rng.uniform(-2000, 2000):,.2f}\nN{i}\nPPAYEE {rng.randrange(5000)} STORE #{rng.randrange(999)}\n"
+            f"A{rng.randrange(9999)} MAIN ST\nMmemo\n^\n")
+
+
+def generate(path, file_format, size_mb):
+    """Write a synthetic export of about size_mb megabytes to path"""
+    rng = random.Random(size_mb)
+    target = size_mb * 1024 * 1024
+    make_record = csv_record if file_format == "csv" else qif_record
+    written = 0
+    i = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        header = "Posted Date,Reference Number,Payee,Address,Amount\n" if file_format == "csv" else "!Type:Bank\n"
+        f.write(header)
+        written += len(header)
+        while written < target:
+            block = "".join(make_record(rng, i + n) for n in range(1000))
+            f.write(block)
+            written += len(block)
+            i += 1000
+
+
+def run_reader(module_name, function_name, path, results):
+    """Child process: consume every row and report (rows, seconds, peak RSS bytes)"""
+    module = __import__(module_name)
+    reader = getattr(module, function_name)
+    start = time.perf_counter()
+    rows = 0
+    for _ in reader(path):
+        rows += 1
+    elapsed = time.perf_counter() - start
+    results.put((rows, elapsed, peak_rss()))
+
+
+def peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None  # Not available on Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(module_name, function_name, path):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=run_reader, args=(module_name, function_name, path, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CSV/QIF readers against the memory-mapped fast path")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES_MB, help="file sizes in MB")
+    parser.add_argument("--formats", nargs="+", choices=sorted(READERS), default=sorted(READERS))
+    parser.add_argument("--dir", help="where to write the generated files (default: a temporary directory)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated files")
+    args = parser.parse_args()
+
+    work_dir = args.dir or tempfile.mkdtemp(prefix="reader_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+    print(f"{'File':<16}  {'Reader':<18}  {'Rows':>10}  {'Seconds':>8}  {'MB/s':>7}  {'Rows/s':>10}  {'Peak MB':>8}")
+    try:
+        for file_format in args.formats:
+            for size_mb in args.sizes:
+                path = os.path.join(work_dir, f"bench_{size_mb}mb.{file_format}")
+                if not os.path.exists(path):
+                    generate(path, file_format, size_mb)
+                actual_mb = os.path.getsize(path) / (1024 * 1024)
+                baseline = None
+                for label, module_name, function_name in READERS[file_format]:
+                    rows, seconds, peak = measure(module_name, function_name, path)
+                    speedup = "" if baseline is None else f"  {baseline / seconds:.2f}x"
+                    baseline = baseline or seconds
+                    peak_mb = "n/a" if peak is None else f"{peak / (1024 * 1024):.0f}"
+                    print(f"{os.path.basename(path):<16}  {label:<18}  {rows:>10,}  {seconds:>8.2f}  "
+                          f"{actual_mb / seconds:>7.1f}  {rows / seconds:>10,.0f}  {peak_mb:>8}{speedup}")
+    finally:
+        if not args.keep and not args.dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
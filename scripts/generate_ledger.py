@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic ledgers for benchmarks.
+
+The same size and seed always produce the same transactions, so timings taken
+on different commits are measured on identical data. A ledger is written as a
+bank CSV export, a QIF export or a database with accounts, categories, rules,
+1099 vendors, categorized transactions and the running totals filled in.
+Usage:
+
+    python scripts/generate_ledger.py 100k ledger.csv
+    python scripts/generate_ledger.py 1m ledger.db --seed 7
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+# Add the project root and this directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.dirname(__file__))
+from src.core.db import Database, tax_year_of
+from src.core.vendors import resolve_vendors
+from setup_database import setup_database
+
+DEFAULT_SEED = 2024
+
+# Transactions are spread evenly over these calendar years, oldest first
+FIRST_YEAR = 2019
+LAST_YEAR = 2025
+
+# Share of the transactions that are categorized in a generated database
+CATEGORIZED_SHARE = 0.7
+
+# Categorizations written per save_categorizations call
+CATEGORIZE_BATCH_SIZE = 100000
+
+# accounts.id 1 and 2, matching import_qif.ACCOUNT_IDS
+ACCOUNTS = [("bank", "Business Checking"), ("ccard", "Business Card")]
+
+# QIF section header of each account
+QIF_TYPES = {1: "Bank", 2: "CCard"}
+
+# Share of the transactions on the bank account; the rest are on the card
+BANK_SHARE = 0.6
+
+# payment_types_1099 ids from 03_insert_reference_data.sql
+NONEMPLOYEE_COMPENSATION = 1
+RENTS = 2
+
+# (payee, category, smallest amount, largest amount, relative frequency)
+MERCHANTS = [
+    ("AMAZON MKTPLACE PMTS", "supplies", -250, -5, 12),
+    ("STAPLES", "office expense", -180, -4, 8),
+    ("OFFICE DEPOT", "office expense", -150, -4, 5),
+    ("HOME DEPOT", "supplies", -400, -10, 6),
+    ("COSTCO WHSE", "supplies", -350, -20, 4),
+    ("SHELL OIL", "car and truck", -90, -25, 7),
+    ("CHEVRON", "car and truck", -90, -25, 5),
+    ("UBER TRIP", "travel", -60, -8, 4),
+    ("DELTA AIR LINES", "travel", -900, -120, 1),
+    ("STARBUCKS STORE", "meals", -25, -3, 9),
+    ("CHIPOTLE", "meals", -40, -9, 4),
+    ("GOOGLE ADS", "advertising", -500, -20, 3),
+    ("META PLATFORMS ADS", "advertising", -400, -15, 2),
+    ("COMCAST BUSINESS", "utilities", -220, -90, 1),
+    ("PUGET SOUND ENERGY", "utilities", -300, -60, 1),
+    ("ADOBE CREATIVE CLOUD", "office expense", -60, -55, 1),
+    ("INTUIT QUICKBOOKS", "office expense", -90, -30, 1),
+    ("STRIPE TRANSFER", "income", 50, 5000, 6),
+    ("SQUARE INC DEPOSIT", "income", 20, 2500, 5),
+    ("VENMO CASHOUT", "no category", -500, 500, 2),
+]
+
+# (vendor, category, 1099 payment type, smallest amount, largest amount, relative frequency).
+# The comma in one name makes the CSV exports quote it, as real exports do.
+VENDORS = [
+    ("JANE DOE DESIGN", "contract labor", NONEMPLOYEE_COMPENSATION, -2500, -150, 1),
+    ("ACME PLUMBING LLC", "repairs", NONEMPLOYEE_COMPENSATION, -1200, -90, 1),
+    ("SMITH, JONES & ASSOCIATES", "legal and professional", NONEMPLOYEE_COMPENSATION, -3000, -250, 1),
+    ("NORTHWEST BOOKKEEPING", "legal and professional", NONEMPLOYEE_COMPENSATION, -800, -200, 1),
+    ("BRIGHT PIXEL MEDIA", "advertising", NONEMPLOYEE_COMPENSATION, -1500, -100, 1),
+    ("RIVERSIDE PROPERTY MGMT", "rent", RENTS, -2400, -2400, 1),
+]
+
+# Prefix rules for the most common payees, as a user would set them up
+RULES = [
+    ("AMAZON MKTPLACE", "supplies"),
+    ("STAPLES", "office expense"),
+    ("SHELL OIL", "car and truck"),
+    ("STARBUCKS", "meals"),
+    ("STRIPE TRANSFER", "income"),
+]
+
+CITIES = ["SEATTLE WA", "BELLEVUE WA", "TACOMA WA", "PORTLAND OR", "SPOKANE WA", "BOISE ID"]
+
+STREETS = ["MAIN ST", "PINE ST", "1ST AVE", "BROADWAY", "MARKET ST", "LAKE WAY"]
+
+NOTES = ["client meeting", "reimbursed", "split with personal", "annual renewal"]
+
+# Share of the transactions that carry a note
+NOTE_SHARE = 0.02
+
+SIZE_SUFFIXES = {"k": 1000, "m": 1000 * 1000}
+
+
+def parse_size(text):
+    """Transaction count from '10000', '10k' or '1m'"""
+    text = text.strip().lower()
+    multiplier = SIZE_SUFFIXES.get(text[-1:], 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+
+def size_label(count):
+    """Short name of a transaction count, the inverse of parse_size"""
+    for suffix, multiplier in sorted(SIZE_SUFFIXES.items(), key=lambda item: -item[1]):
+        if count >= multiplier and count % multiplier == 0:
+            return f"{count // multiplier}{suffix}"
+    return str(count)
+
+
+def category_names():
+    """Every category used by the generated ledgers, in first-use order"""
+    names = [merchant[1] for merchant in MERCHANTS] + [vendor[1] for vendor in VENDORS]
+    return list(dict.fromkeys(names))
+
+
+def ledger_entries(count, seed=DEFAULT_SEED):
+    """
+    Lazily yield (row, category name) for count transactions, oldest first.
+    row is ordered like TRANSACTION_COLUMNS; every reference number is unique,
+    so no two rows share a fingerprint.
+    """
+    rng = random.Random(seed)
+    payees = [(name, category, low, high, False) for name, category, low, high, _ in MERCHANTS]
+    payees += [(name, category, low, high, True) for name, category, _, low, high, _ in VENDORS]
+    cum_weights = []
+    total = 0
+    for weight in [merchant[4] for merchant in MERCHANTS] + [vendor[5] for vendor in VENDORS]:
+        total += weight
+        cum_weights.append(total)
+    first_day = date(FIRST_YEAR, 1, 1)
+    days = (date(LAST_YEAR, 12, 31) - first_day).days + 1
+    dates = {}
+
+    for i in range(count):
+        day = i * days // count
+        transaction_date = dates.get(day)
+        if transaction_date is None:
+            transaction_date = dates[day] = (first_day + timedelta(days=day)).isoformat()
+        name, category, low, high, is_vendor = rng.choices(payees, cum_weights=cum_weights)[0]
+        city = CITIES[rng.randrange(len(CITIES))]
+        payee = f"{name} {city}" if is_vendor else f"{name} #{rng.randrange(1, 9999):04d} {city}"
+        yield (
+            1 if rng.random() < BANK_SHARE else 2,
+            transaction_date,
+            str(i + 1),
+            payee,
+            f"{rng.randrange(1, 20000)} {STREETS[rng.randrange(len(STREETS))]}",
+            round(rng.uniform(low, high), 2),
+            NOTES[rng.randrange(len(NOTES))] if rng.random() < NOTE_SHARE else None,
+            tax_year_of(transaction_date),
+        ), category
+
+
+def ledger_rows(count, seed=DEFAULT_SEED):
+    """Lazily yield the rows of ledger_entries, ready for Database.bulk_insert_transactions"""
+    return (row for row, _ in ledger_entries(count, seed))
+
+
+def write_csv(path, count, seed=DEFAULT_SEED):
+    """Write the ledger as a bank CSV export: MM/DD/YYYY dates, one account, notes dropped"""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["Posted Date", "Reference Number", "Payee", "Address", "Amount"])
+        for _, transaction_date, ref, payee, address, amount, _, _ in ledger_rows(count, seed):
+            year, month, day = transaction_date.split("-")
+            writer.writerow([f"{month}/{day}/{year}", ref, payee, address, f"{amount:.2f}"])
+
+
+def write_qif(path, count, seed=DEFAULT_SEED):
+    """Write the ledger as a QIF export with one !Type section per account"""
+    with open(path, "w", encoding="utf-8") as f:
+        for account_id, qif_type in QIF_TYPES.items():
+            f.write(f"!Type:{qif_type}\n")
+            for row in ledger_rows(count, seed):
+                if row[0] != account_id:
+                    continue
+                _, transaction_date, ref, payee, address, amount, note, _ = row
+                year, month, day = transaction_date.split("-")
+                f.write(f"D{int(month)}/{int(day)}'{year[2:]}\nT{amount:,.2f}\nN{ref}\nP{payee}\nA{address}\n")
+                if note:
+                    f.write(f"M{note}\n")
+                f.write("^\n")
+
+
+def create_database(db_path):
+    """Create an empty database at db_path with the accounts, categories, rules and vendors of the ledgers"""
+    setup_database(db_path)
+    db = Database(db_path)
+    with db.transaction() as conn:
+        conn.executemany("INSERT INTO accounts (account_type, account_name) VALUES (?, ?)", ACCOUNTS)
+        conn.executemany("INSERT INTO categories (name) VALUES (?)", [(name,) for name in category_names()])
+    category_ids = {name: category_id for category_id, name in db.fetch_categories()}
+    for pattern, category in RULES:
+        db.add_rule("prefix", pattern, category_ids[category])
+    for number, (vendor_name, _, payment_type, _, _, _) in enumerate(VENDORS, start=1):
+        db.add_vendor(vendor_name, tax_id=f"91-{number:07d}", requires_1099=True,
+                      default_payment_type_1099_id=payment_type)
+    return db
+
+
+def build_database(db_path, count, seed=DEFAULT_SEED, categorized_share=CATEGORIZED_SHARE):
+    """
+    Create a database at db_path holding the ledger, with categorized_share of
+    the transactions categorized through save_categorizations and the vendors
+    resolved so the 1099 totals are filled in. Returns a dict of the seconds
+    each step took.
+    """
+    timings = {}
+    start = time.perf_counter()
+    db = create_database(db_path)
+    category_ids = {name: category_id for category_id, name in db.fetch_categories()}
+    timings["setup_seconds"] = time.perf_counter() - start
+
+    stats = db.bulk_insert_transactions(ledger_rows(count, seed))
+    timings["insert_seconds"] = stats["seconds"]
+
+    start = time.perf_counter()
+    pick = random.Random(seed + 1)
+    changes = {}
+    for txn_id, (_, category) in enumerate(ledger_entries(count, seed), start=stats["previous_max_id"] + 1):
+        if pick.random() < categorized_share:
+            changes[txn_id] = category_ids[category]
+        if len(changes) >= CATEGORIZE_BATCH_SIZE:
+            db.save_categorizations(changes, {})
+            changes = {}
+    if changes:
+        db.save_categorizations(changes, {})
+    timings["categorize_seconds"] = time.perf_counter() - start
+
+    timings["resolve_seconds"] = resolve_vendors(db)["seconds"]
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic ledger as CSV, QIF or a database")
+    parser.add_argument("size", type=parse_size, help="number of transactions, e.g. 10000, 100k or 1m")
+    parser.add_argument("output", help="file to write; the extension (.csv, .qif or .db) picks the format")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"random seed (default {DEFAULT_SEED})")
+    args = parser.parse_args()
+
+    file_format = os.path.splitext(args.output)[1].lower()
+    start = time.perf_counter()
+    if file_format == ".csv":
+        write_csv(args.output, args.size, args.seed)
+    elif file_format == ".qif":
+        write_qif(args.output, args.size, args.seed)
+    elif file_format in (".db", ".sqlite"):
+        if os.path.exists(args.output):
+            print(f"{args.output} already exists")
+            sys.exit(1)
+        build_database(args.output, args.size, args.seed)
+    else:
+        print("The output file must end in .csv, .qif or .db")
+        sys.exit(1)
+    print(f"Wrote {args.size:,} transactions to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
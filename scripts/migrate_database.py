@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Database migration script
+"""
+import os
+import sys
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.core.db import Database, DB_PATH
+
+def migrate_database(db_path=DB_PATH):
+    """Bring an existing database up to the current schema"""
+    applied = Database(db_path).migrate()
+    if applied:
+        for name in applied:
+            print(f"Applied {name}")
+    else:
+        print("Database is already up to date.")
+
+if __name__ == "__main__":
+    migrate_database(*sys.argv[1:2])
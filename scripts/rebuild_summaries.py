@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Rebuild the derived summary tables from the transactions
+"""
+import os
+import sys
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.core.db import Database, DB_PATH
+
+def rebuild_summaries(db_path=DB_PATH):
+    """Recompute category_year_totals, category_closure, vendor_1099_totals, payee_category_counts and the search index from scratch"""
+    db = Database(db_path)
+    print(f"Rebuilt category_year_totals: {db.rebuild_category_year_totals()} rows")
+    print(f"Rebuilt category_closure: {db.rebuild_category_closure()} rows")
+    print(f"Rebuilt vendor_1099_totals: {db.rebuild_vendor_1099_totals()} rows")
+    print(f"Rebuilt payee_category_counts: {len(db.rebuild_payee_category_counts())} rows")
+    db.rebuild_search_index()
+    print("Rebuilt transactions_fts search index")
+
+if __name__ == "__main__":
+    rebuild_summaries(*sys.argv[1:2])
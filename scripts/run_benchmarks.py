@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for imports, dashboard totals, monthly and quarterly
+time series, the categorize window, search and 1099 reporting.
+
+Every benchmark runs against the deterministic ledgers of generate_ledger.py,
+so results from different commits are comparable. Results are written as
+JSON; pass an earlier file with --compare to list what got slower. Usage:
+
+    python scripts/run_benchmarks.py                          # 10k, 100k and 1m transactions
+    python scripts/run_benchmarks.py --sizes 10k 100k 1m 10m --dir ~/ledgers
+    python scripts/run_benchmarks.py --compare benchmark-1a2b3c4.json
+
+Generated files are reused from --dir when it is given, which saves most of
+the time of a 1m or 10m run.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Add the project root, this directory and the CLI scripts to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'cli'))
+from src.core.db import Database
+from src.core.form_1099 import export_1099_batch, vendors_approaching_threshold
+from src.core.rules import auto_categorize
+from src.core.suggestions import PayeeCategoryIndex
+from src.core.vendors import resolve_vendors
+from generate_ledger import (DEFAULT_SEED, LAST_YEAR, build_database, create_database, parse_size,
+                             size_label, write_csv, write_qif)
+from import_csv import csv_to_rows, csv_to_rows_mmap
+from import_qif import qif_to_rows, qif_to_rows_mmap
+
+DEFAULT_SIZES = ["10k", "100k", "1m"]
+
+DEFAULT_REPEAT = 5
+
+# Imports of ledgers this large run once, whatever --repeat says
+IMPORT_REPEAT_LIMIT = 1000 * 1000
+
+# Change in median time, in percent, that --compare reports as a regression
+DEFAULT_TOLERANCE = 10.0
+
+# Slowdowns smaller than this are timer noise, whatever the percentage
+REGRESSION_FLOOR_SECONDS = 0.001
+
+# Rows the categorize window shows before the first scroll (FETCH_BATCH_SIZE
+# in src/gui/categorize_window.py, which cannot be imported without Qt)
+CATEGORIZE_PAGE_ROWS = 200
+
+# (benchmark, export format, reader)
+IMPORTS = [
+    ("import_csv", "csv", csv_to_rows),
+    ("import_csv_mmap", "csv", csv_to_rows_mmap),
+    ("import_qif", "qif", qif_to_rows),
+    ("import_qif_mmap", "qif", qif_to_rows_mmap),
+]
+
+# (benchmark, query, tax year or None)
+SEARCHES = [
+    ("search_word", "starbucks", None),
+    ("search_prefix", "st", None),
+    ("search_phrase", "smith jones", None),
+    ("search_rare_in_year", "delta", LAST_YEAR),
+]
+
+
+def import_ledger(template_path, db_path, reader, file_path):
+    """Import one export into a copy of the empty template the way the import CLIs do"""
+    shutil.copyfile(template_path, db_path)
+    db = Database(db_path)
+    start = time.perf_counter()
+    stats = db.bulk_insert_transactions(reader(file_path))
+    rules = auto_categorize(db, after_id=stats["previous_max_id"])
+    vendors = resolve_vendors(db, after_id=stats["previous_max_id"])
+    return {
+        "seconds": time.perf_counter() - start,
+        "rows": stats["rows"],
+        "insert_seconds": stats["seconds"],
+        "categorize_seconds": rules["seconds"],
+        "resolve_seconds": vendors["seconds"],
+    }
+
+
+def load_dashboard(db_path, year):
+    """The year summary MainWindow.refresh_totals loads, on a fresh Database so nothing is memoized"""
+    db = Database(db_path, persistent=True)
+    start = time.perf_counter()
+    summary = db.get_year_summary(year)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return {"seconds": elapsed, "rows": len(summary["categories"])}
+
+
+def load_time_series(db_path, start_date, end_date, grain):
+    """Database.get_time_series on a fresh Database so nothing is memoized"""
+    db = Database(db_path, persistent=True)
+    start = time.perf_counter()
+    series = db.get_time_series(start_date, end_date, grain)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return {"seconds": elapsed, "rows": len(series["periods"])}
+
+
+def load_categorize_window(db_path):
+    """What CategorizeWindow loads before it first paints: categories, suggestions and the first rows"""
+    db = Database(db_path, persistent=True)
+    start = time.perf_counter()
+    db.fetch_categories()
+    suggestions = PayeeCategoryIndex.load(db)
+    rows = db.fetch_uncategorized_page(limit=CATEGORIZE_PAGE_ROWS)
+    for row in rows:
+        suggestions.suggest(row[2])
+    elapsed = time.perf_counter() - start
+    db.close()
+    return {"seconds": elapsed, "rows": len(rows)}
+
+
+def export_1099_forms(db, year, output_path):
+    """Write the 1099 batch file for a year, as report_1099.py export does"""
+    start = time.perf_counter()
+    stats = export_1099_batch(db, year, output_path)
+    return {"seconds": time.perf_counter() - start, "rows": sum(stats["forms"].values())}
+
+
+def timed(fn, *args):
+    """Time a call that returns a list of rows"""
+    start = time.perf_counter()
+    rows = fn(*args)
+    return {"seconds": time.perf_counter() - start, "rows": len(rows)}
+
+
+def is_selected(name, prefixes):
+    return not prefixes or any(name.startswith(prefix) for prefix in prefixes)
+
+
+def run(name, count, repeat, fn, *args):
+    """Run fn(*args) repeat times and summarize the runs; fn returns a dict with seconds and rows"""
+    runs = [fn(*args) for _ in range(repeat)]
+    seconds = [r["seconds"] for r in runs]
+    median = statistics.median(seconds)
+    result = {
+        "benchmark": name,
+        "size": count,
+        "median_seconds": median,
+        "min_seconds": min(seconds),
+        "runs": seconds,
+        "rows": runs[0]["rows"],
+        "rows_per_sec": runs[0]["rows"] / median if median > 0 else None,
+    }
+    # Keep the step timings of the median run, e.g. the insert time of an import
+    median_run = min(runs, key=lambda r: abs(r["seconds"] - median))
+    result.update((key, value) for key, value in median_run.items() if key.endswith("_seconds"))
+    print(f"{size_label(count):>6}  {name:<24}  {median * 1000:>10.2f}  {min(seconds) * 1000:>10.2f}  {result['rows']:>10,}")
+    return result
+
+
+def prepare_files(work_dir, count, seed):
+    """Generate (or reuse) the CSV, QIF and database ledgers of one size; returns their paths"""
+    base = os.path.join(work_dir, f"ledger_{size_label(count)}_{seed}")
+    paths = {"csv": base + ".csv", "qif": base + ".qif", "db": base + ".db"}
+    if not os.path.exists(paths["csv"]):
+        write_csv(paths["csv"], count, seed)
+    if not os.path.exists(paths["qif"]):
+        write_qif(paths["qif"], count, seed)
+    if not os.path.exists(paths["db"]):
+        print(f"Generating {os.path.basename(paths['db'])}...")
+        # Build under a temporary name so an interrupted build is not reused
+        build_database(paths["db"] + ".partial", count, seed)
+        os.replace(paths["db"] + ".partial", paths["db"])
+    return paths
+
+
+def run_size(work_dir, template_path, count, seed, repeat, benchmarks):
+    """Run the selected benchmarks on the ledger of one size"""
+    paths = prepare_files(work_dir, count, seed)
+    results = []
+    import_repeat = 1 if count >= IMPORT_REPEAT_LIMIT else repeat
+    scratch_path = os.path.join(work_dir, "import_scratch.db")
+    for name, file_format, reader in IMPORTS:
+        if is_selected(name, benchmarks):
+            results.append(run(name, count, import_repeat, import_ledger,
+                               template_path, scratch_path, reader, paths[file_format]))
+    if os.path.exists(scratch_path):
+        os.remove(scratch_path)
+
+    db_path = paths["db"]
+    if is_selected("dashboard_year", benchmarks):
+        results.append(run("dashboard_year", count, repeat, load_dashboard, db_path, LAST_YEAR))
+    if is_selected("dashboard_all_years", benchmarks):
+        results.append(run("dashboard_all_years", count, repeat, load_dashboard, db_path, None))
+    if is_selected("time_series_year", benchmarks):
+        results.append(run("time_series_year", count, repeat, load_time_series, db_path,
+                           f"{LAST_YEAR}-01-01", f"{LAST_YEAR}-12-31", "month"))
+    if is_selected("time_series_all_years", benchmarks):
+        results.append(run("time_series_all_years", count, repeat, load_time_series, db_path, None, None, "quarter"))
+    if is_selected("categorize_load", benchmarks):
+        results.append(run("categorize_load", count, repeat, load_categorize_window, db_path))
+
+    db = Database(db_path, persistent=True)
+    for name, query, year in SEARCHES:
+        if is_selected(name, benchmarks):
+            results.append(run(name, count, repeat, timed, db.search_transactions, query, year))
+    if is_selected("report_1099_approaching", benchmarks):
+        results.append(run("report_1099_approaching", count, repeat, timed,
+                           vendors_approaching_threshold, db, LAST_YEAR))
+    if is_selected("report_1099_export", benchmarks):
+        export_path = os.path.join(work_dir, "1099_batch.csv")
+        results.append(run("report_1099_export", count, repeat, export_1099_forms, db, LAST_YEAR, export_path))
+    db.close()
+    return results
+
+
+def git_commit():
+    """Short hash of the checked-out commit, with -dirty for uncommitted changes, or None"""
+    root = os.path.join(os.path.dirname(__file__), '..')
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if status else "")
+
+
+def compare(previous_path, results, tolerance):
+    """
+    Print the change in median time per benchmark and size against an earlier
+    results file. Returns the number of regressions: benchmarks more than
+    tolerance percent and REGRESSION_FLOOR_SECONDS slower.
+    """
+    with open(previous_path, 'r') as f:
+        previous = json.load(f)
+    before = {(r["benchmark"], r["size"]): r["median_seconds"] for r in previous["results"]}
+    print(f"\nCompared with {previous.get('commit') or previous_path}:")
+    print(f"{'Size':>6}  {'Benchmark':<24}  {'Before ms':>10}  {'After ms':>10}  {'Change':>8}")
+    regressions = 0
+    for result in results:
+        old = before.get((result["benchmark"], result["size"]))
+        if old is None:
+            continue
+        slowdown = result["median_seconds"] - old
+        change = slowdown / old * 100 if old > 0 else 0.0
+        flag = "  REGRESSION" if change > tolerance and slowdown > REGRESSION_FLOOR_SECONDS else ""
+        regressions += bool(flag)
+        print(f"{size_label(result['size']):>6}  {result['benchmark']:<24}  {old * 1000:>10.2f}  "
+              f"{result['median_seconds'] * 1000:>10.2f}  {change:>+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark imports, dashboard totals, categorize, search and 1099 reports")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES,
+                        help=f"ledger sizes in transactions, e.g. 10k 1m (default {' '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--benchmarks", nargs="+", metavar="PREFIX",
+                        help="run only the benchmarks whose names start with these prefixes, e.g. import search")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"runs per benchmark; the median is reported (default {DEFAULT_REPEAT})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"ledger random seed (default {DEFAULT_SEED})")
+    parser.add_argument("--dir", help="where to keep the generated ledgers for reuse (default: a temporary directory)")
+    parser.add_argument("--output", help="JSON results file (default benchmark-<commit>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"percent slowdown reported as a regression (default {DEFAULT_TOLERANCE:g})")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes]
+    commit = git_commit()
+    output = args.output or f"benchmark-{commit or 'local'}.json"
+    work_dir = args.dir or tempfile.mkdtemp(prefix="ledger_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+
+    results = []
+    try:
+        template_path = os.path.join(work_dir, "empty.db")
+        if os.path.exists(template_path):
+            os.remove(template_path)
+        create_database(template_path)
+        print(f"{'Size':>6}  {'Benchmark':<24}  {'Median ms':>10}  {'Min ms':>10}  {'Rows':>10}")
+        for count in sizes:
+            results.extend(run_size(work_dir, template_path, count, args.seed, args.repeat, args.benchmarks))
+    finally:
+        if not args.dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(output, 'w') as f:
+        json.dump({
+            "commit": commit,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "results": results,
+        }, f, indent=2)
+    print(f"Wrote {len(results)} results to {output}")
+
+    if args.compare and compare(args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,18 @@ Database setup script
 """
 import sqlite3
 import os
+import sys
 from pathlib import Path
 
-def setup_database():
-    """Create and initialize the expense tracker database"""
+def setup_database(db_path=None):
+    """Create and initialize the expense tracker database (database/tax_prep.db unless db_path is given)"""
     
     # Define paths
     project_root = Path(__file__).parent.parent
-    db_path = project_root / "database" / "tax_prep.db"
+    if db_path is None:
+        db_path = project_root / "database" / "tax_prep.db"
     schema_dir = project_root / "database" / "schema"
+    migrations_dir = project_root / "database" / "migrations"
     
     # Create database connection
     conn = sqlite3.connect(db_path)
@@ -24,7 +27,8 @@ def setup_database():
             "01_create_tables.sql",
             "02_create_views.sql", 
             "03_insert_reference_data.sql",
-            "04_create_indexes.sql"
+            "04_create_indexes.sql",
+            "05_create_triggers.sql"
         ]
         
         for sql_file in schema_files:
@@ -37,6 +41,11 @@ def setup_database():
             else:
                 print(f"Warning: {sql_file} not found")
         
+        # The schema files already include every migration
+        migrations = sorted(migrations_dir.glob("[0-9][0-9][0-9]_*.sql"))
+        if migrations:
+            cursor.execute(f"PRAGMA user_version = {int(migrations[-1].name[:3])}")
+        
         conn.commit()
         print("Database setup completed successfully!")
         
@@ -48,4 +57,4 @@ def setup_database():
         conn.close()
 
 if __name__ == "__main__":
-    setup_database()
+    setup_database(*sys.argv[1:2])
@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, DB_PATH, RULE_MATCH_TYPES
+from src.core.rules import auto_categorize
+
+
+def print_rules(db):
+    """Print every categorization rule with its category name"""
+    category_names = dict(db.fetch_categories())
+    rules = db.fetch_rules()
+    if not rules:
+        print("No categorization rules defined.")
+        return
+    print(f"{'ID':>4}  {'Type':<9}  {'Priority':>8}  {'Amount range':<21}  {'Category':<20}  Pattern")
+    for rule_id, match_type, pattern, category_id, min_amount, max_amount, priority in rules:
+        amount_range = f"{'' if min_amount is None else min_amount}..{'' if max_amount is None else max_amount}"
+        category = category_names.get(category_id, f"#{category_id}")
+        print(f"{rule_id:>4}  {match_type:<9}  {priority:>8}  {amount_range:<21}  {category:<20}  {pattern}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Categorize transactions with rules")
+    parser.add_argument("--db", default=DB_PATH, help="path to the database")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("run", help="categorize every uncategorized transaction (default)")
+    subparsers.add_parser("list", help="list the rules")
+
+    add_parser = subparsers.add_parser("add", help="add a rule")
+    add_parser.add_argument("match_type", choices=RULE_MATCH_TYPES)
+    add_parser.add_argument("pattern")
+    add_parser.add_argument("category", help="category name")
+    add_parser.add_argument("--min-amount", type=float)
+    add_parser.add_argument("--max-amount", type=float)
+    add_parser.add_argument("--priority", type=int, default=100, help="lower numbers win (default 100)")
+
+    delete_parser = subparsers.add_parser("delete", help="delete a rule")
+    delete_parser.add_argument("rule_id", type=int)
+
+    args = parser.parse_args()
+    db = Database(args.db)
+
+    if args.command == "list":
+        print_rules(db)
+    elif args.command == "add":
+        category_ids = {name.lower(): cat_id for cat_id, name in db.fetch_categories()}
+        category_id = category_ids.get(args.category.lower())
+        if category_id is None:
+            print(f"Unknown category '{args.category}'")
+            sys.exit(1)
+        rule_id = db.add_rule(args.match_type, args.pattern, category_id,
+                              args.min_amount, args.max_amount, args.priority)
+        print(f"Added rule {rule_id}")
+    elif args.command == "delete":
+        db.delete_rule(args.rule_id)
+    else:
+        stats = auto_categorize(db)
+        print(f"Categorized {stats['categorized']:,} of {stats['examined']:,} uncategorized transactions "
+              f"in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+# Add the project root and this directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.dirname(__file__))
+from src.core.db import Database, DB_PATH
+from src.core.form_1099 import DEFAULT_THRESHOLD, vendors_over_threshold
+from src.core.reports import REPORT_FORMATS, profit_loss, render_report
+from src.core.rules import auto_categorize
+from src.core.vendors import resolve_vendors
+from import_files import import_files
+
+# A client directory holds its database under the same name as DB_PATH
+CLIENT_DB_NAME = os.path.basename(DB_PATH)
+
+# Files imported for each client, relative to the directory of its database
+DEFAULT_IMPORT_PATTERNS = ["imports/*.qif", "imports/*.csv"]
+
+# Result columns shown for each task, after the client name
+TASK_COLUMNS = {
+    "import": ["files", "inserted", "duplicates", "categorized", "resolved"],
+    "categorize": ["examined", "categorized", "resolved"],
+    "year-end": ["revenue", "expenses", "profit_loss", "uncategorized", "forms_1099"],
+}
+
+# Columns written with two decimals
+MONEY_COLUMNS = {"revenue", "expenses", "profit_loss"}
+
+
+def find_client_databases(paths):
+    """
+    Client database files from a list of files and directories. A directory
+    contributes its *.db files and the CLIENT_DB_NAME file of each of its
+    subdirectories, so both clients/acme.db and clients/acme/tax_prep.db work.
+    """
+    db_paths = []
+    for path in paths:
+        if not os.path.isdir(path):
+            db_paths.append(path)
+            continue
+        for name in sorted(os.listdir(path)):
+            entry = os.path.join(path, name)
+            if os.path.isdir(entry):
+                if os.path.isfile(os.path.join(entry, CLIENT_DB_NAME)):
+                    db_paths.append(os.path.join(entry, CLIENT_DB_NAME))
+            elif name.endswith(".db"):
+                db_paths.append(entry)
+    # A database listed twice would be written by two workers at once
+    unique = {}
+    for db_path in db_paths:
+        unique.setdefault(os.path.abspath(db_path), db_path)
+    return list(unique.values())
+
+
+def client_name(db_path):
+    """The client directory's name for CLIENT_DB_NAME files, otherwise the file name without .db"""
+    db_path = os.path.abspath(db_path)
+    if os.path.basename(db_path) == CLIENT_DB_NAME:
+        return os.path.basename(os.path.dirname(db_path))
+    return os.path.splitext(os.path.basename(db_path))[0]
+
+
+def import_client(db, db_path, options):
+    """Import the client's pending files, then apply the rules and vendors to the new rows"""
+    client_dir = os.path.dirname(os.path.abspath(db_path))
+    file_paths = sorted({path for pattern in options["patterns"]
+                         for path in glob.glob(os.path.join(client_dir, pattern))})
+    # One process per client already keeps every core busy
+    stats = import_files(db, file_paths, options["csv_account"], workers=1, use_mmap=options["mmap"])
+    result = {
+        "files": len(file_paths),
+        "inserted": stats["inserted"],
+        "duplicates": stats["duplicates"],
+        "categorized": 0,
+        "resolved": 0,
+    }
+    if stats["previous_max_id"] is not None:
+        result["categorized"] = auto_categorize(db, after_id=stats["previous_max_id"])["categorized"]
+        result["resolved"] = resolve_vendors(db, after_id=stats["previous_max_id"])["resolved"]
+    failed = [f"{os.path.basename(file['file'])}: {file['error']}" for file in stats["files"] if file["error"]]
+    if failed:
+        result["error"] = "; ".join(failed)
+    return result
+
+
+def categorize_client(db, db_path, options):
+    """Apply the rules to every uncategorized transaction and backfill vendors"""
+    rule_stats = auto_categorize(db)
+    vendor_stats = resolve_vendors(db)
+    return {
+        "examined": rule_stats["examined"],
+        "categorized": rule_stats["categorized"],
+        "resolved": vendor_stats["resolved"],
+    }
+
+
+def year_end_client(db, db_path, options):
+    """Profit or loss, open categorization work and 1099 count for the tax year, with an optional report file"""
+    year = options["year"]
+    with db.transaction():
+        summary = db.get_year_summary(year)
+        uncategorized = db.count_uncategorized(year)
+        over_threshold = vendors_over_threshold(db, year, options["threshold"])
+    if options["report_dir"]:
+        report_path = os.path.join(options["report_dir"],
+                                   f"{client_name(db_path)}_schedule_c_{year}.{options['report_format']}")
+        with open(report_path, "w", encoding="utf-8", newline="") as f:
+            f.write(render_report([(year, summary)], options["report_format"]))
+    return {
+        "revenue": summary["revenue"],
+        "expenses": abs(summary["expenses"]),
+        "profit_loss": profit_loss(summary),
+        "uncategorized": uncategorized,
+        "forms_1099": len({(total.vendor_id, total.form_type) for total in over_threshold}),
+    }
+
+
+TASKS = {"import": import_client, "categorize": categorize_client, "year-end": year_end_client}
+
+
+def run_client(task, db_path, options):
+    """
+    Run one task against one client database, bringing it up to the current
+    schema first. Runs in a worker process; never raises, so one broken client
+    does not stop the batch. Returns the task's result dict plus client, db,
+    seconds and error (None on success).
+    """
+    start = time.perf_counter()
+    result = {"client": client_name(db_path), "db": db_path}
+    try:
+        if not os.path.isfile(db_path):
+            raise FileNotFoundError(f"No such database: {db_path}")
+        db = Database(db_path)
+        db.migrate()
+        result.update(TASKS[task](db, db_path, options))
+    except Exception as e:
+        result["error"] = str(e)
+    result.setdefault("error", None)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_clients(task, db_paths, options, workers=None, on_client_done=None):
+    """
+    Run a task against many client databases in a process pool, one database
+    per task and at most workers processes (default one per core). Each
+    database is only ever opened by one process, so clients do not contend
+    for locks.
+
+    on_client_done, if given, is called with each client's result as it
+    finishes. Returns a dict with the "clients" results sorted by client name,
+    elapsed seconds and the number of failed clients.
+    """
+    db_paths = list(db_paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(db_paths)))
+
+    results = []
+    start = time.perf_counter()
+
+    def record(result):
+        results.append(result)
+        if on_client_done is not None:
+            on_client_done(result)
+
+    if workers == 1:
+        for db_path in db_paths:
+            record(run_client(task, db_path, options))
+    else:
+        # spawn rather than fork, as in import_files
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(run_client, task, db_path, options) for db_path in db_paths]
+            try:
+                for future in as_completed(futures):
+                    record(future.result())
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    results.sort(key=lambda result: (result["client"].lower(), result["db"]))
+    return {
+        "clients": results,
+        "seconds": time.perf_counter() - start,
+        "failed": sum(1 for result in results if result["error"]),
+    }
+
+
+def format_value(column, value):
+    if value is None:
+        return ""
+    if column in MONEY_COLUMNS:
+        return f"{value:,.2f}"
+    return f"{value:,}"
+
+
+def print_table(task, results):
+    """Print one row per client with the task's columns, timing and status"""
+    columns = TASK_COLUMNS[task]
+    name_width = max([len("Client")] + [len(result["client"]) for result in results])
+    widths = {column: max(len(column), 12) for column in columns}
+    print(f"{'Client':<{name_width}}  " + "  ".join(f"{column:>{widths[column]}}" for column in columns)
+          + f"  {'Seconds':>8}  Status")
+    for result in results:
+        values = "  ".join(f"{format_value(column, result.get(column)):>{widths[column]}}" for column in columns)
+        status = f"FAILED - {result['error']}" if result["error"] else "ok"
+        print(f"{result['client']:<{name_width}}  {values}  {result['seconds']:>8.2f}  {status}")
+
+
+def write_results(path, task, results):
+    """Write the results as CSV, or JSON if path ends in .json"""
+    if path.lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"task": task, "clients": results}, f, indent=2)
+        return
+    columns = ["client", "db"] + TASK_COLUMNS[task] + ["seconds", "error"]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            row = dict(result, seconds=round(result["seconds"], 3))
+            for column in MONEY_COLUMNS & row.keys():
+                row[column] = round(row[column], 2)
+            writer.writerow(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run imports, auto-categorization or year-end summaries across many client databases in parallel")
+    parser.add_argument("task", choices=TASKS, help="what to run for every client")
+    parser.add_argument("clients", nargs="+",
+                        help=f"client database files, or directories of *.db files and of client "
+                             f"directories holding {CLIENT_DB_NAME}")
+    parser.add_argument("--workers", type=int, help="client processes (default: one per core)")
+    parser.add_argument("--output", help="also write the results to a CSV file, or JSON if it ends in .json")
+
+    import_group = parser.add_argument_group("import")
+    import_group.add_argument("--pattern", action="append", dest="patterns",
+                              help="files to import, relative to each client's database directory; repeatable "
+                                   f"(default: {' '.join(DEFAULT_IMPORT_PATTERNS)})")
+    import_group.add_argument("--csv-account", type=int, default=1, help="account id for CSV rows (default 1)")
+    import_group.add_argument("--mmap", action="store_true", help="use the memory-mapped parsers")
+
+    year_end_group = parser.add_argument_group("year-end")
+    year_end_group.add_argument("--year", type=int, default=date.today().year - 1,
+                                help="tax year (default: last year)")
+    year_end_group.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help=f"1099 reporting threshold in dollars (default {DEFAULT_THRESHOLD})")
+    year_end_group.add_argument("--report-dir", help="also write each client's Schedule C report to this directory")
+    year_end_group.add_argument("--report-format", choices=REPORT_FORMATS, default="html",
+                                help="format of the --report-dir reports (default html)")
+    args = parser.parse_args()
+
+    db_paths = find_client_databases(args.clients)
+    if not db_paths:
+        print("No client databases found.", file=sys.stderr)
+        sys.exit(1)
+    if args.report_dir:
+        os.makedirs(args.report_dir, exist_ok=True)
+
+    options = {
+        "patterns": args.patterns or DEFAULT_IMPORT_PATTERNS,
+        "csv_account": args.csv_account,
+        "mmap": args.mmap,
+        "year": args.year,
+        "threshold": args.threshold,
+        "report_dir": args.report_dir,
+        "report_format": args.report_format,
+    }
+    done = 0
+
+    def print_progress(result):
+        nonlocal done
+        done += 1
+        status = "FAILED" if result["error"] else "ok"
+        print(f"[{done}/{len(db_paths)}] {result['client']}: {status} ({result['seconds']:.2f}s)", file=sys.stderr)
+
+    stats = run_clients(args.task, db_paths, options, args.workers, on_client_done=print_progress)
+    print_table(args.task, stats["clients"])
+    client_seconds = sum(result["seconds"] for result in stats["clients"])
+    print(f"{len(stats['clients'])} clients in {stats['seconds']:.2f}s "
+          f"({client_seconds:.2f}s of client time), {stats['failed']} failed")
+    if args.output:
+        write_results(args.output, args.task, stats["clients"])
+
+    if stats["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,34 @@
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk
-import sqlite3
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, LEDGER_PAGE_SIZE
 
 DB_NAME = "database/tax_prep.db"
 
 def fetch_categories():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, name FROM categories")
-    categories = cursor.fetchall()
-    conn.close()
-    return categories
-
-def fetch_transactions():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, transaction_date, payee_description, amount FROM transactions")
-    transactions = cursor.fetchall()
-    conn.close()
-    return transactions
-
-def fetch_transaction_category(transaction_id):
-    """Returns category_id for a given transaction_id, or None if not assigned."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT category_id FROM transaction_categories WHERE transaction_id = ?", (transaction_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result[0] if result else None
+    return Database(DB_NAME).fetch_categories()
+
+def fetch_transactions(after=None):
+    """
+    Returns one page of (id, date, payee, amount, category name) rows, newest
+    first, plus the key the next page starts after (None on the last page).
+    """
+    # One extra row tells whether there is a next page
+    rows = Database(DB_NAME).fetch_transaction_page(after, LEDGER_PAGE_SIZE + 1)
+    next_key = (rows[LEDGER_PAGE_SIZE - 1][1], rows[LEDGER_PAGE_SIZE - 1][0]) if len(rows) > LEDGER_PAGE_SIZE else None
+    return [(txn_id, txn_date, txn_payee, txn_amount, category_name)
+            for txn_id, txn_date, _, txn_payee, txn_amount, category_name, _ in rows[:LEDGER_PAGE_SIZE]], next_key
 
 def update_transaction_category(transaction_id, category_id):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    # Remove existing category assignment for this transaction (if any)
-    cursor.execute("DELETE FROM transaction_categories WHERE transaction_id = ?", (transaction_id,))
-    # Only insert if category is not "unassigned"
-    if category_id is not None:
-        cursor.execute("INSERT INTO transaction_categories (transaction_id, category_id) VALUES (?, ?)", (transaction_id, category_id))
-    conn.commit()
-    conn.close()
+    # Replaces any existing assignment; None leaves the transaction unassigned
+    Database(DB_NAME).update_transaction_category(transaction_id, category_id)
 
 def main():
     categories = fetch_categories()
-    transactions = fetch_transactions()
 
     # Insert "unassigned" at the start of the choices
     category_choices = ["unassigned"] + [cat[1] for cat in categories]
@@ -66,39 +52,69 @@ def main():
     for col_num, header in enumerate(headers):
         tk.Label(frame, text=header, font=("Verdana", 10, "bold")).grid(row=0, column=col_num, padx=4, pady=4, sticky=header_alignments[col_num])
 
-    dropdown_vars = []
-    for row_num, txn in enumerate(transactions, start=1):
-        txn_id, txn_date, txn_payee, txn_amount = txn
-
-        tk.Label(frame, text=txn_id).grid(row=row_num, column=0, padx=2, pady=2, sticky="w")
-        tk.Label(frame, text=txn_date).grid(row=row_num, column=1, padx=2, pady=2, sticky="w")
-        tk.Label(frame, text=txn_payee).grid(row=row_num, column=2, padx=2, pady=2, sticky="w")
-        tk.Label(frame, text=txn_amount).grid(row=row_num, column=3, padx=2, pady=2, sticky="e")
-
-        # Get current category assignment via junction table
-        assigned_cat_id = fetch_transaction_category(txn_id)
-        if assigned_cat_id is not None:
-            # Find matching category name
-            default_cat_name = next((cat[1] for cat in categories if cat[0] == assigned_cat_id), "unassigned")
-        else:
-            default_cat_name = "unassigned"
-
-        var = tk.StringVar(value=default_cat_name)
-        dropdown_vars.append(var)
-        dropdown = ttk.OptionMenu(frame, var, default_cat_name, *category_choices)
-        dropdown.grid(row=row_num, column=4, padx=2, pady=2, sticky="ew")  # Fill width and align right
-
-        def make_update_callback(transaction_id, var):
-            def callback():
-                selected = var.get()
-                if selected == "unassigned":
-                    update_transaction_category(transaction_id, None)
-                else:
-                    update_transaction_category(transaction_id, category_id_map[selected])
-            return callback
-
-        btn = tk.Button(frame, text="Update", command=make_update_callback(txn_id, var))
-        btn.grid(row=row_num, column=5, padx=2, pady=2, sticky="w")
+    nav = tk.Frame(root)
+    nav.pack(fill=tk.X)
+    newer_btn = tk.Button(nav, text="< Newer")
+    newer_btn.pack(side=tk.LEFT)
+    page_label = tk.Label(nav)
+    page_label.pack(side=tk.LEFT, padx=10)
+    older_btn = tk.Button(nav, text="Older >")
+    older_btn.pack(side=tk.LEFT)
+
+    page_keys = [None]  # key each visited page starts after
+    page = {"number": 0, "widgets": []}
+
+    def make_update_callback(transaction_id, var):
+        def callback():
+            selected = var.get()
+            if selected == "unassigned":
+                update_transaction_category(transaction_id, None)
+            else:
+                update_transaction_category(transaction_id, category_id_map[selected])
+        return callback
+
+    def show_page(number):
+        transactions, next_key = fetch_transactions(page_keys[number])
+        page["number"] = number
+        del page_keys[number + 1:]
+        if next_key is not None:
+            page_keys.append(next_key)
+
+        # Only the current page's widgets exist at any time
+        for widget in page["widgets"]:
+            widget.destroy()
+        page["widgets"] = []
+
+        for row_num, txn in enumerate(transactions, start=1):
+            txn_id, txn_date, txn_payee, txn_amount, category_name = txn
+
+            row_widgets = [
+                tk.Label(frame, text=txn_id),
+                tk.Label(frame, text=txn_date),
+                tk.Label(frame, text=txn_payee),
+                tk.Label(frame, text=txn_amount),
+            ]
+            for col_num, sticky in enumerate(["w", "w", "w", "e"]):
+                row_widgets[col_num].grid(row=row_num, column=col_num, padx=2, pady=2, sticky=sticky)
+
+            # Current category assignment comes with the page
+            default_cat_name = category_name or "unassigned"
+
+            var = tk.StringVar(value=default_cat_name)
+            dropdown = ttk.OptionMenu(frame, var, default_cat_name, *category_choices)
+            dropdown.grid(row=row_num, column=4, padx=2, pady=2, sticky="ew")  # Fill width and align right
+
+            btn = tk.Button(frame, text="Update", command=make_update_callback(txn_id, var))
+            btn.grid(row=row_num, column=5, padx=2, pady=2, sticky="w")
+            page["widgets"].extend(row_widgets + [dropdown, btn])
+
+        page_label.config(text=f"Page {number + 1}")
+        newer_btn.config(state=tk.NORMAL if number > 0 else tk.DISABLED)
+        older_btn.config(state=tk.NORMAL if next_key is not None else tk.DISABLED)
+
+    newer_btn.config(command=lambda: show_page(page["number"] - 1))
+    older_btn.config(command=lambda: show_page(page["number"] + 1))
+    show_page(0)
 
     root.mainloop()
 
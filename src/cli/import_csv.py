@@ -1,19 +1,40 @@
 import csv
+import os
 import re
+import sys
 from datetime import datetime
+from itertools import chain, islice
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, TRANSACTION_COLUMNS, sql_literal, tax_year_of
+from src.core.mapped_file import iter_text_chunks
+from src.core.rules import auto_categorize
+from src.core.vendors import resolve_vendors
+
+
+# Date formats commonly found in CSV exports, in order of preference
+DATE_FORMATS = [
+    '%m/%d/%Y',    # MM/DD/YYYY
+    '%Y-%m-%d',    # YYYY-MM-DD
+    '%m/%d/%y',    # MM/DD/YY
+    '%d/%m/%Y',    # DD/MM/YYYY
+    '%Y/%m/%d',    # YYYY/MM/DD
+]
+
+# Number of data rows inspected to pick a file's date format
+DATE_SAMPLE_ROWS = 100
+
+# Header names that mark the first row as a header
+HEADER_NAMES = ['date', 'reference', 'payee', 'address', 'amount']
+
+# Currency symbols, thousands separators, parentheses and spaces
+AMOUNT_JUNK = re.compile(r'[\$,\s()]')
 
 
 def parse_csv_date(date_str):
     """Parse various date formats commonly found in CSV files"""
-    date_formats = [
-        '%m/%d/%Y',    # MM/DD/YYYY
-        '%Y-%m-%d',    # YYYY-MM-DD
-        '%m/%d/%y',    # MM/DD/YY
-        '%d/%m/%Y',    # DD/MM/YYYY
-        '%Y/%m/%d',    # YYYY/MM/DD
-    ]
-    
-    for fmt in date_formats:
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str.strip(), fmt).strftime('%Y-%m-%d')
         except ValueError:
@@ -23,10 +44,58 @@ def parse_csv_date(date_str):
     return date_str.strip()
 
 
+def detect_date_format(date_strs):
+    """Return the first format in DATE_FORMATS that parses every sample date, or None"""
+    samples = [d.strip() for d in date_strs if d.strip()]
+    if not samples:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            for sample in samples:
+                datetime.strptime(sample, fmt)
+        except ValueError:
+            continue
+        return fmt
+    return None
+
+
+class CsvDateParser:
+    """
+    Parse the dates of one CSV file using a format detected once from a sample.
+    Rows that don't match the detected format fall back to parse_csv_date, and
+    results are cached by input string since exports repeat the same dates.
+    """
+    
+    def __init__(self, sample_dates):
+        self.date_format = detect_date_format(sample_dates)
+        self.cache = {}
+    
+    def parse(self, date_str):
+        parsed = self.cache.get(date_str)
+        if parsed is None:
+            parsed = self._parse(date_str)
+            self.cache[date_str] = parsed
+        return parsed
+    
+    def _parse(self, date_str):
+        if self.date_format:
+            try:
+                return datetime.strptime(date_str.strip(), self.date_format).strftime('%Y-%m-%d')
+            except ValueError:
+                pass
+        return parse_csv_date(date_str)
+
+
 def clean_amount(amount_str):
     """Clean and convert amount string to float"""
+    # Fast path: most exports already contain plain numbers
+    try:
+        return float(amount_str)
+    except ValueError:
+        pass
+    
     # Remove currency symbols, parentheses, and spaces
-    cleaned = re.sub(r'[\$,\s()]', '', amount_str)
+    cleaned = AMOUNT_JUNK.sub('', amount_str)
     
     # Handle negative amounts in parentheses
     if '(' in amount_str and ')' in amount_str:
@@ -38,17 +107,16 @@ def clean_amount(amount_str):
         return 0.0
 
 
-def csv_to_sql(csv_file_path, account_id=1):
+def csv_to_rows(csv_file_path, account_id=1):
     """
-    Convert CSV file to SQL INSERT statements for transactions
+    Lazily yield transaction row tuples ordered like TRANSACTION_COLUMNS,
+    ready for Database.bulk_insert_transactions.
     
     Expected CSV format:
     Posted Date, Reference Number, Payee, Address, Amount
     """
     
-    sql_statements = []
-    
-    with open(csv_file_path, 'r', encoding='utf-8') as file:
+    with open(csv_file_path, 'r', encoding='utf-8', newline='') as file:
         # Try to detect delimiter
         sample = file.read(1024)
         file.seek(0)
@@ -59,41 +127,158 @@ def csv_to_sql(csv_file_path, account_id=1):
         
         # Skip header row if it exists
         first_row = next(reader, None)
-        if first_row and any(header.lower() in ['date', 'reference', 'payee', 'address', 'amount'] 
-                           for header in first_row):
+        if first_row is None:
+            return
+        if any(header.lower() in HEADER_NAMES for header in first_row):
             # This is likely a header row, continue to data
-            pass
-        else:
-            # This is data, process it
-            file.seek(0)
-            reader = csv.reader(file, delimiter=delimiter)
+            first_row = None
         
-        for row in reader:
+        # Buffer a few rows to detect the date format, then replay them
+        head = [] if first_row is None else [first_row]
+        head.extend(islice(reader, DATE_SAMPLE_ROWS - len(head)))
+        date_parser = CsvDateParser(row[0] for row in head if len(row) >= 5)
+        parse_date = date_parser.parse
+        
+        for row in chain(head, reader):
             if len(row) < 5:
                 continue  # Skip rows with insufficient data
             
-            posted_date = row[0]
-            reference_number = row[1].replace("'", "''") if row[1] else ""
-            payee = row[2].replace("'", "''") if row[2] else ""
-            address = row[3].replace("'", "''") if row[3] else ""
-            amount = clean_amount(row[4])
-            
-            # Parse date
-            parsed_date = parse_csv_date(posted_date)
-            
-            # Create SQL INSERT statement mapping to database schema
-            sql = f"INSERT INTO transactions (account_id, transaction_date, reference_number, payee_description, address_info, amount, note, tax_year) VALUES ({account_id}, '{parsed_date}', '{reference_number}', '{payee}', '{address}', {amount}, NULL, {datetime.now().year});"
-            sql_statements.append(sql)
-    
-    return '\n'.join(sql_statements)
+            transaction_date = parse_date(row[0])
+            yield (
+                account_id,
+                transaction_date,
+                row[1] or "",
+                row[2] or "",
+                row[3] or "",
+                clean_amount(row[4]),
+                None,  # note
+                tax_year_of(transaction_date),
+            )
+
+
+def split_quoted_lines(lines, delimiter):
+    """
+    Split lines into fields like csv.reader, but send only the records that
+    contain quotes through the csv module; a quoted record may span lines.
+    """
+    record = []
+    for line in lines:
+        if record:
+            record.append(line)
+        elif '"' in line:
+            record = [line]
+        else:
+            yield line.rstrip('\r').split(delimiter)
+            continue
+        # The record is complete once its quotes balance
+        text = '\n'.join(record)
+        if text.count('"') % 2 == 0:
+            yield from csv.reader([text], delimiter=delimiter)
+            record = []
+    if record:
+        yield from csv.reader(['\n'.join(record)], delimiter=delimiter)
+
+
+def csv_to_rows_mmap(csv_file_path, account_id=1):
+    """
+    Fast path for csv_to_rows on large files: yields the same rows, but reads
+    the file memory-mapped a few MB at a time. Records without quotes are
+    split with str.split instead of the csv module; dates and their tax year
+    are parsed once per distinct date string.
+    """
+    chunks = iter_text_chunks(csv_file_path, quote=b'"')
+    # Sniff the same sample as csv_to_rows, the first 1024 characters, even
+    # when the first chunk is shorter
+    first_chunks = []
+    sampled = 0
+    for text in chunks:
+        first_chunks.append(text)
+        sampled += len(text)
+        if sampled >= 1024:
+            break
+    if not first_chunks:
+        return
+    delimiter = csv.Sniffer().sniff("".join(first_chunks)[:1024]).delimiter
+
+    def split_chunk(text):
+        lines = text.split('\n')
+        if '"' in text:
+            return split_quoted_lines(lines, delimiter)
+        if '\r' in text:
+            return (line.rstrip('\r').split(delimiter) for line in lines)
+        return (line.split(delimiter) for line in lines)
+
+    rows = chain.from_iterable(split_chunk(chunk) for chunk in chain(first_chunks, chunks))
+
+    # Skip header row if it exists
+    first_row = next(rows, None)
+    if first_row is None:
+        return
+    if any(header.lower() in HEADER_NAMES for header in first_row):
+        first_row = None
+
+    # Buffer a few rows to detect the date format, then replay them
+    head = [] if first_row is None else [first_row]
+    head.extend(islice(rows, DATE_SAMPLE_ROWS - len(head)))
+    parse_date = CsvDateParser(row[0] for row in head if len(row) >= 5).parse
+    dates = {}  # raw date -> (YYYY-MM-DD, tax year)
+
+    for row in chain(head, rows):
+        if len(row) < 5:
+            continue  # Skip blank rows and rows with insufficient data
+        date = dates.get(row[0])
+        if date is None:
+            transaction_date = parse_date(row[0])
+            date = dates[row[0]] = (transaction_date, tax_year_of(transaction_date))
+        yield (
+            account_id,
+            date[0],
+            row[1],
+            row[2],
+            row[3],
+            clean_amount(row[4]),
+            None,  # note
+            date[1],
+        )
+
+
+def iter_csv_sql(csv_file_path, account_id=1):
+    """Lazily yield one INSERT statement per transaction in a CSV file"""
+    columns = ', '.join(TRANSACTION_COLUMNS)
+    for row in csv_to_rows(csv_file_path, account_id):
+        values = ", ".join(sql_literal(value) for value in row)
+        yield f"INSERT INTO transactions ({columns}) VALUES ({values});"
+
+
+def csv_to_sql(csv_file_path, account_id=1):
+    """Convert CSV file to SQL INSERT statements for transactions"""
+    return '\n'.join(iter_csv_sql(csv_file_path, account_id))
 
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) != 2:
-        print("Usage: python import_csv.py <csv_file>")
+    args = sys.argv[1:]
+    print_sql = "--sql" in args
+    if print_sql:
+        args.remove("--sql")
+    use_mmap = "--mmap" in args
+    if use_mmap:
+        args.remove("--mmap")
+    if len(args) != 1:
+        print("Usage: python import_csv.py [--sql] [--mmap] <csv_file>")
         sys.exit(1)
     
-    csv_file = sys.argv[1]
-    sql_output = csv_to_sql(csv_file)
-    print(sql_output)
\ No newline at end of file
+    csv_file = args[0]
+    if print_sql:
+        for statement in iter_csv_sql(csv_file):
+            print(statement)
+    else:
+        db = Database()
+        stats = db.bulk_insert_transactions((csv_to_rows_mmap if use_mmap else csv_to_rows)(csv_file))
+        print(f"Imported {stats['inserted']} new transactions, skipped {stats['duplicates']} duplicates "
+              f"in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+        # Apply the categorization rules to the new rows only
+        rule_stats = auto_categorize(db, after_id=stats['previous_max_id'])
+        print(f"Auto-categorized {rule_stats['categorized']} of them")
+        # Link the new rows to vendors for 1099 reporting
+        vendor_stats = resolve_vendors(db, after_id=stats['previous_max_id'])
+        print(f"Linked {vendor_stats['resolved']} to vendors ({vendor_stats['reportable']} 1099 reportable)")
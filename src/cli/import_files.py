@@ -0,0 +1,244 @@
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+
+# Add the project root and this directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.dirname(__file__))
+from src.core.db import Database, DB_PATH, IMPORT_BATCH_SIZE, TRANSACTION_COLUMNS, fingerprint_rows
+from src.core.instrumentation import DEFAULT_SLOW_QUERY_MS, profile_until_exit
+from src.core.rules import auto_categorize
+from src.core.vendors import resolve_vendors
+from import_csv import csv_to_rows, csv_to_rows_mmap
+from import_qif import qif_to_rows, qif_to_rows_mmap
+
+
+def detect_file_format(file_path):
+    """Return 'qif' or 'csv' from the file extension, falling back to the first line"""
+    file_ext = os.path.splitext(file_path)[1].lower()
+    if file_ext in ('.qif', '.csv'):
+        return file_ext[1:]
+    with open(file_path, 'r', encoding='utf-8') as f:
+        first_line = f.readline().strip()
+    if first_line.startswith('!Type:'):
+        return 'qif'
+    if ',' in first_line:
+        return 'csv'
+    raise ValueError(f"Unsupported file format: {os.path.basename(file_path)}. Please use QIF or CSV files.")
+
+
+def file_to_rows(file_path, csv_account_id=1, use_mmap=False):
+    """Lazily yield transaction rows from a QIF or CSV file, through the memory-mapped readers if use_mmap"""
+    if detect_file_format(file_path) == 'qif':
+        return qif_to_rows_mmap(file_path) if use_mmap else qif_to_rows(file_path)
+    return csv_to_rows_mmap(file_path, csv_account_id) if use_mmap else csv_to_rows(file_path, csv_account_id)
+
+
+def parse_file(file_path, staging_path, csv_account_id=1, use_mmap=False):
+    """
+    Parse and fingerprint every row of one file into a new SQLite file at
+    staging_path, IMPORT_BATCH_SIZE rows at a time. Runs in a worker process:
+    only one batch is in memory and nothing large is pickled back to the
+    writer, which reads the rows with staged_rows. Returns (rows, seconds).
+    """
+    start = time.perf_counter()
+    columns = TRANSACTION_COLUMNS + ("fingerprint",)
+    rows = fingerprint_rows(file_to_rows(file_path, csv_account_id, use_mmap))
+    count = 0
+    conn = sqlite3.connect(staging_path)
+    try:
+        # A scratch file: nothing to recover if the process dies
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(f"CREATE TABLE staged ({', '.join(columns)})")
+        sql = f"INSERT INTO staged VALUES ({', '.join('?' * len(columns))})"
+        while True:
+            batch = list(islice(rows, IMPORT_BATCH_SIZE))
+            if not batch:
+                break
+            conn.executemany(sql, batch)
+            count += len(batch)
+        conn.commit()
+    finally:
+        conn.close()
+    return count, time.perf_counter() - start
+
+
+def staged_rows(staging_path):
+    """Lazily yield the rows parse_file wrote to staging_path, in file order"""
+    conn = sqlite3.connect(staging_path)
+    try:
+        yield from conn.execute("SELECT * FROM staged ORDER BY rowid")
+    finally:
+        conn.close()
+
+
+def import_files(db, file_paths, csv_account_id=1, workers=None, on_file_done=None, progress=None, use_mmap=False):
+    """
+    Import several QIF and CSV files into db.
+
+    Files are parsed in parallel in a process pool (one file per task, at most
+    workers processes, default one per core). Each worker stages its file's
+    rows in a temporary SQLite file rather than returning them, so memory
+    stays at about one batch per process whatever the file sizes, at the cost
+    of temporary disk space about the size of the files. This process is the
+    only writer: each file is streamed from its staging file into
+    bulk_insert_transactions as soon as its parse finishes, so a file is
+    written in one transaction and a bad file does not undo the others. A
+    single file, or workers=1, is streamed in this process.
+    use_mmap=True reads the files with the memory-mapped fast-path parsers.
+
+    on_file_done, if given, is called with each file's result dict, and
+    progress with the total rows written so far after each batch. An exception
+    raised by either of them that is not an Exception (such as
+    KeyboardInterrupt) stops the import: queued parses are dropped and the file
+    being written is rolled back.
+
+    Returns a dict with a "files" list of per-file results (file, rows,
+    inserted, duplicates, parse_seconds, write_seconds, error), totals for
+    rows, inserted and duplicates, elapsed seconds, rows/sec and the
+    previous_max_id of the first file written.
+    """
+    file_paths = list(file_paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(file_paths)))
+
+    results = []
+    previous_max_id = None
+    rows_written = 0
+    start = time.perf_counter()
+
+    def file_progress(rows):
+        progress(rows_written + rows)
+
+    def record(file_path, parse_seconds, stats=None, error=None):
+        nonlocal previous_max_id, rows_written
+        result = {
+            "file": file_path,
+            "rows": 0,
+            "inserted": 0,
+            "duplicates": 0,
+            "parse_seconds": parse_seconds,
+            "write_seconds": 0.0,
+            "error": error,
+        }
+        if stats is not None:
+            result.update(
+                rows=stats["rows"],
+                inserted=stats["inserted"],
+                duplicates=stats["duplicates"],
+                write_seconds=stats["seconds"],
+            )
+            rows_written += stats["rows"]
+            if previous_max_id is None:
+                previous_max_id = stats["previous_max_id"]
+        results.append(result)
+        if on_file_done is not None:
+            on_file_done(result)
+
+    if workers == 1:
+        for file_path in file_paths:
+            try:
+                stats = db.bulk_insert_transactions(file_to_rows(file_path, csv_account_id, use_mmap),
+                                                    progress=progress and file_progress)
+            except Exception as e:
+                record(file_path, 0.0, error=str(e))
+            else:
+                record(file_path, 0.0, stats)
+    else:
+        # spawn rather than fork: the GUI calls this with Qt threads running
+        context = multiprocessing.get_context("spawn")
+        with tempfile.TemporaryDirectory(prefix="tax_prep_import_") as staging_dir, \
+                ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {}
+            for i, path in enumerate(file_paths):
+                staging_path = os.path.join(staging_dir, f"{i}.db")
+                futures[pool.submit(parse_file, path, staging_path, csv_account_id, use_mmap)] = (path, staging_path)
+            try:
+                for future in as_completed(futures):
+                    file_path, staging_path = futures[future]
+                    try:
+                        _, parse_seconds = future.result()
+                    except Exception as e:
+                        record(file_path, 0.0, error=str(e))
+                        continue
+                    rows = staged_rows(staging_path)
+                    try:
+                        stats = db.bulk_insert_transactions(rows, fingerprinted=True,
+                                                            progress=progress and file_progress)
+                    except Exception as e:
+                        record(file_path, parse_seconds, error=str(e))
+                    else:
+                        record(file_path, parse_seconds, stats)
+                    finally:
+                        rows.close()
+                        os.remove(staging_path)
+            except BaseException:
+                # Abandoned part way: don't start parsing the files still queued
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    elapsed = time.perf_counter() - start
+    total_rows = sum(result["rows"] for result in results)
+    return {
+        "files": results,
+        "rows": total_rows,
+        "inserted": sum(result["inserted"] for result in results),
+        "duplicates": sum(result["duplicates"] for result in results),
+        "seconds": elapsed,
+        "rows_per_sec": total_rows / elapsed if elapsed > 0 else 0.0,
+        "previous_max_id": previous_max_id,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import several QIF and CSV files in parallel")
+    parser.add_argument("files", nargs="+", help="QIF or CSV files to import")
+    parser.add_argument("--db", default=DB_PATH, help="path to the database")
+    parser.add_argument("--workers", type=int, help="parser processes (default: one per core)")
+    parser.add_argument("--csv-account", type=int, default=1, help="account id for CSV rows (default 1)")
+    parser.add_argument("--mmap", action="store_true", help="use the memory-mapped parsers (faster on large files)")
+    parser.add_argument("--profile", nargs="?", const="-", metavar="FILE",
+                        help="time the database work and print a summary at the end, or write it to FILE "
+                             "(JSON if FILE ends in .json)")
+    parser.add_argument("--slow-query-ms", type=float,
+                        help=f"log the query plan of statements slower than this (default {DEFAULT_SLOW_QUERY_MS})")
+    args = parser.parse_args()
+    if args.profile:
+        profile_until_exit(args.profile, args.slow_query_ms)
+
+    def print_file(result):
+        name = os.path.basename(result["file"])
+        if result["error"]:
+            print(f"{name}: FAILED - {result['error']}")
+        else:
+            print(f"{name}: {result['inserted']:,} new, {result['duplicates']:,} duplicates "
+                  f"(parse {result['parse_seconds']:.2f}s, write {result['write_seconds']:.2f}s)")
+
+    db = Database(args.db)
+    stats = import_files(db, args.files, args.csv_account, args.workers, on_file_done=print_file,
+                         use_mmap=args.mmap)
+    print(f"Imported {stats['inserted']:,} new transactions, skipped {stats['duplicates']:,} duplicates "
+          f"from {len(stats['files'])} files in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+
+    # Apply the categorization rules to the new rows only
+    if stats['previous_max_id'] is not None:
+        rule_stats = auto_categorize(db, after_id=stats['previous_max_id'])
+        print(f"Auto-categorized {rule_stats['categorized']:,} of them")
+        # Link the new rows to vendors for 1099 reporting
+        vendor_stats = resolve_vendors(db, after_id=stats['previous_max_id'])
+        print(f"Linked {vendor_stats['resolved']:,} to vendors ({vendor_stats['reportable']:,} 1099 reportable)")
+
+    if any(result["error"] for result in stats["files"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,16 @@
+import os
 import re
+import sys
+from collections import namedtuple
 from datetime import datetime
 
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, TRANSACTION_COLUMNS, sql_literal, tax_year_of
+from src.core.mapped_file import iter_text_chunks
+from src.core.rules import auto_categorize
+from src.core.vendors import resolve_vendors
+
 def parse_qif_date(qif_date):
     """
     Converts QIF date formats (like MM/DD'YY or MM/DD/YYYY, possibly with different separators)
@@ -23,77 +33,161 @@ def parse_qif_date(qif_date):
     # If parsing fails, return as is
     return qif_date
 
-def qif_to_sql(qif_filename):
-    with open(qif_filename, "r", encoding="utf-8") as f:
-        lines = f.readlines()
+# One parsed QIF transaction entry. date is YYYY-MM-DD (or the raw text if it
+# could not be parsed), amount is a float and account_type is the lowercased
+# value of the most recent !Type: header.
+QifTransaction = namedtuple(
+    "QifTransaction", ["date", "amount", "ref", "payee", "address", "memo", "account_type"]
+)
 
-    entries = []
+# Map QIF account types to accounts.id; entries under other types are skipped
+ACCOUNT_IDS = {"bank": 1, "ccard": 2}
+
+def iter_qif_transactions(qif_filename):
+    """
+    Lazily yield a QifTransaction for each ^-terminated entry in a QIF file.
+    The file is read line by line, so memory use does not grow with file size.
+    """
     current_entry = {}
-    account_id = None
+    account_type = None
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
+    with open(qif_filename, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
 
-        if line.startswith("!Type:"):
-            type_val = line.split(":", 1)[1].strip()
-            if type_val.lower() == "bank":
-                account_id = 1
-            elif type_val.lower() == "ccard":
-                account_id = 2
-            else:
-                account_id = None  # Unknown type, skip
-            continue
+            if line.startswith("!Type:"):
+                account_type = line.split(":", 1)[1].strip().lower()
+                continue
 
-        if line == "^":  # End of transaction entry
-            if current_entry and account_id:
-                # Prepare SQL statement for this entry - specify columns explicitly
-                sql = (
-                    "INSERT INTO transactions (account_id, transaction_date, reference_number, payee_description, address_info, amount, note) VALUES ("
-                    "{account_id}, '{date}', {ref}, {payee}, {addr}, {amount}, NULL)"
-                )
-                # Ensure required fields
-                transaction_date = parse_qif_date(current_entry.get("D", ""))
-                amount = current_entry.get("T", "0.00").replace(",", "")  # Remove commas from amount
-                # Optional fields
-                reference_number = f"'{current_entry.get('N', '')}'" if current_entry.get("N") else "NULL"
-                payee_description = f"'{current_entry.get('P', '')}'" if current_entry.get("P") else "NULL"
-                address_info = f"'{current_entry.get('A', '')}'" if current_entry.get("A") else "NULL"
+            if line == "^":  # End of transaction entry
+                if current_entry and account_type:
+                    yield QifTransaction(
+                        date=parse_qif_date(current_entry.get("D", "")),
+                        amount=float(current_entry.get("T", "0.00").replace(",", "")),  # Remove commas from amount
+                        ref=current_entry.get("N") or None,
+                        payee=current_entry.get("P") or None,
+                        address=current_entry.get("A") or None,
+                        memo=current_entry.get("M") or None,
+                        account_type=account_type,
+                    )
+                current_entry = {}
+                continue
 
-                statement = sql.format(
-                    account_id=account_id,
-                    date=transaction_date,
-                    ref=reference_number,
-                    payee=payee_description,
-                    addr=address_info,
-                    amount=amount
+            # Transaction field prefixes per QIF spec:
+            # D: Date, T: Amount, N: Reference/Num, P: Payee, M: Memo, A: Address, C: Cleared status
+            if len(line) > 1 and line[0] in "DTNPMABC":
+                key = line[0]
+                val = line[1:].strip()
+                # If address, allow multiline
+                if key == "A":
+                    if "A" in current_entry:
+                        current_entry["A"] += " " + val
+                    else:
+                        current_entry["A"] = val
+                else:
+                    current_entry[key] = val
+
+def qif_to_rows(qif_filename):
+    """
+    Lazily yield transaction row tuples ordered like TRANSACTION_COLUMNS,
+    ready for Database.bulk_insert_transactions.
+    """
+    for txn in iter_qif_transactions(qif_filename):
+        account_id = ACCOUNT_IDS.get(txn.account_type)
+        if account_id is None:
+            continue  # Unknown account type, skip
+        yield (
+            account_id,
+            txn.date,
+            txn.ref,
+            txn.payee,
+            txn.address,
+            txn.amount,
+            None,  # note
+            tax_year_of(txn.date),
+        )
+
+def qif_to_rows_mmap(qif_filename):
+    """
+    Fast path for qif_to_rows on large files: yields the same rows, but reads
+    the file memory-mapped a few MB at a time, splits each chunk into entries
+    on the ^ lines and parses each distinct date only once.
+    """
+    account_type = None
+    dates = {}  # raw QIF date -> (YYYY-MM-DD, tax year)
+    entry = {}
+    for text in iter_text_chunks(qif_filename, separator=b"\n^"):
+        # Every piece but the last ends at a ^ line; the last ends the chunk
+        pieces = text.split("\n^")
+        for piece_number, piece in enumerate(pieces):
+            for line in piece.split("\n"):
+                line = line.strip()
+                if not line:
+                    continue
+                code = line[0]
+                if line.startswith("!Type:"):
+                    account_type = line.split(":", 1)[1].strip().lower()
+                elif len(line) > 1 and code in "DTNPMA":
+                    val = line[1:].strip()
+                    if code == "A" and "A" in entry:
+                        entry["A"] += " " + val
+                    else:
+                        entry[code] = val
+            if piece_number == len(pieces) - 1:
+                break  # Entry continues in the next chunk, if any
+            account_id = ACCOUNT_IDS.get(account_type)
+            if entry and account_id is not None:
+                raw_date = entry.get("D", "")
+                date = dates.get(raw_date)
+                if date is None:
+                    transaction_date = parse_qif_date(raw_date)
+                    date = dates[raw_date] = (transaction_date, tax_year_of(transaction_date))
+                yield (
+                    account_id,
+                    date[0],
+                    entry.get("N") or None,
+                    entry.get("P") or None,
+                    entry.get("A") or None,
+                    float(entry.get("T", "0.00").replace(",", "")),
+                    None,  # note
+                    date[1],
                 )
-                entries.append(statement)
-            current_entry = {}
-            continue
+            entry = {}
 
-        # Transaction field prefixes per QIF spec:
-        # D: Date, T: Amount, N: Reference/Num, P: Payee, M: Memo, A: Address, C: Cleared status
-        if len(line) > 1 and line[0] in "DTNPMABC":
-            key = line[0]
-            val = line[1:].strip()
-            # If address, allow multiline
-            if key == "A":
-                if "A" in current_entry:
-                    current_entry["A"] += " " + val
-                else:
-                    current_entry["A"] = val
-            else:
-                current_entry[key] = val
+def iter_qif_sql(qif_filename):
+    """Lazily yield one INSERT statement per transaction in a QIF file"""
+    columns = ", ".join(TRANSACTION_COLUMNS)
+    for row in qif_to_rows(qif_filename):
+        yield f"INSERT INTO transactions ({columns}) VALUES ({', '.join(sql_literal(v) for v in row)})"
 
-    return "\n".join(entries)
+def qif_to_sql(qif_filename):
+    return "\n".join(iter_qif_sql(qif_filename))
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) != 2:
-        print("Usage: python qif_to_sql.py <filename.qif>")
+    args = sys.argv[1:]
+    print_sql = "--sql" in args
+    if print_sql:
+        args.remove("--sql")
+    use_mmap = "--mmap" in args
+    if use_mmap:
+        args.remove("--mmap")
+    if len(args) != 1:
+        print("Usage: python import_qif.py [--sql] [--mmap] <filename.qif>")
         sys.exit(1)
-    qif_file = sys.argv[1]
-    sql_statements = qif_to_sql(qif_file)
-    print(sql_statements)
\ No newline at end of file
+    qif_file = args[0]
+    if print_sql:
+        for statement in iter_qif_sql(qif_file):
+            print(statement)
+    else:
+        db = Database()
+        stats = db.bulk_insert_transactions((qif_to_rows_mmap if use_mmap else qif_to_rows)(qif_file))
+        print(f"Imported {stats['inserted']} new transactions, skipped {stats['duplicates']} duplicates "
+              f"in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+        # Apply the categorization rules to the new rows only
+        rule_stats = auto_categorize(db, after_id=stats['previous_max_id'])
+        print(f"Auto-categorized {rule_stats['categorized']} of them")
+        # Link the new rows to vendors for 1099 reporting
+        vendor_stats = resolve_vendors(db, after_id=stats['previous_max_id'])
+        print(f"Linked {vendor_stats['resolved']} to vendors ({vendor_stats['reportable']} 1099 reportable)")
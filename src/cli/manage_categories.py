@@ -0,0 +1,84 @@
+import argparse
+import os
+import sqlite3
+import sys
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, DB_PATH
+
+
+def print_hierarchy(db, year=None):
+    """Print every category under its parent with its expenses, including its subcategories'"""
+    categories = db.fetch_category_hierarchy()
+    if not categories:
+        print("No categories defined.")
+        return
+    expenses = {}
+    pending = list(db.get_category_tree(year))
+    while pending:
+        node = pending.pop()
+        expenses[node["id"]] = node["expenses"]
+        pending.extend(node["children"])
+
+    children = {}
+    known_ids = {category_id for category_id, _, _ in categories}
+    for category_id, name, parent_id in categories:
+        children.setdefault(parent_id if parent_id in known_ids else None, []).append((category_id, name))
+
+    print(f"{'ID':>4}  {'Expenses':>14}  Category")
+
+    def print_children(parent_id, depth):
+        for category_id, name in children.get(parent_id, []):
+            amount = f"{abs(expenses[category_id]):,.2f}" if category_id in expenses else ""
+            print(f"{category_id:>4}  {amount:>14}  {'    ' * depth}{name}")
+            print_children(category_id, depth + 1)
+
+    print_children(None, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arrange categories into a hierarchy")
+    parser.add_argument("--db", default=DB_PATH, help="path to the database")
+    subparsers = parser.add_subparsers(dest="command")
+
+    list_parser = subparsers.add_parser("list", help="show the category hierarchy with expenses (default)")
+    list_parser.add_argument("--year", type=int, help="tax year of the expenses (default: all years)")
+
+    add_parser = subparsers.add_parser("add", help="add a category")
+    add_parser.add_argument("name")
+    add_parser.add_argument("--parent", help="name of the parent category")
+
+    move_parser = subparsers.add_parser("move", help="move a category and its subcategories")
+    move_parser.add_argument("name")
+    destination = move_parser.add_mutually_exclusive_group(required=True)
+    destination.add_argument("--parent", help="name of the new parent category")
+    destination.add_argument("--top", action="store_true", help="make it a top-level category")
+
+    args = parser.parse_args()
+    db = Database(args.db)
+
+    def category_id(name):
+        category_ids = {category_name.lower(): cat_id for cat_id, category_name in db.fetch_categories()}
+        cat_id = category_ids.get(name.lower())
+        if cat_id is None:
+            print(f"Unknown category '{name}'")
+            sys.exit(1)
+        return cat_id
+
+    if args.command == "add":
+        parent_id = category_id(args.parent) if args.parent else None
+        print(f"Added category {db.add_category(args.name, parent_id)}")
+    elif args.command == "move":
+        parent_id = None if args.top else category_id(args.parent)
+        try:
+            db.set_category_parent(category_id(args.name), parent_id)
+        except sqlite3.IntegrityError as e:
+            print(f"Cannot move '{args.name}': {e}")
+            sys.exit(1)
+    else:
+        print_hierarchy(db, getattr(args, "year", None))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, DB_PATH
+from src.core.form_1099 import (DEFAULT_MARGIN, DEFAULT_THRESHOLD, export_1099_batch,
+                                vendors_approaching_threshold, vendors_over_threshold)
+
+
+def print_totals(totals):
+    """Print vendor 1099 totals one box per line"""
+    if not totals:
+        print("No vendors found.")
+        return
+    print(f"{'Vendor':<30}  {'Form':<9}  {'Box':>3}  {'Payments':>8}  {'Total':>12}")
+    for total in totals:
+        print(f"{total.vendor_name[:30]:<30}  {total.form_type:<9}  {total.box_number:>3}  "
+              f"{total.transaction_count:>8}  ${total.total:>11,.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="1099 reporting from the running vendor totals")
+    parser.add_argument("--db", default=DB_PATH, help="path to the database")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"reporting threshold in dollars (default {DEFAULT_THRESHOLD})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    over_parser = subparsers.add_parser("over", help="vendors at or over the threshold")
+    over_parser.add_argument("year", type=int)
+
+    approaching_parser = subparsers.add_parser("approaching", help="vendors just under the threshold")
+    approaching_parser.add_argument("year", type=int)
+    approaching_parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN,
+                                    help=f"dollars below the threshold (default {DEFAULT_MARGIN})")
+
+    export_parser = subparsers.add_parser("export", help="write a 1099-NEC/MISC batch CSV")
+    export_parser.add_argument("year", type=int)
+    export_parser.add_argument("output", help="CSV file to write")
+
+    subparsers.add_parser("rebuild", help="recompute the running totals from the transactions")
+
+    args = parser.parse_args()
+    db = Database(args.db)
+
+    if args.command == "over":
+        print_totals(vendors_over_threshold(db, args.year, args.threshold))
+    elif args.command == "approaching":
+        print_totals(vendors_approaching_threshold(db, args.year, args.threshold, args.margin))
+    elif args.command == "export":
+        stats = export_1099_batch(db, args.year, args.output, args.threshold)
+        for form_type, count in stats["forms"].items():
+            print(f"{form_type}: {count} forms")
+        if stats["missing_tin"]:
+            print("Missing tax id: " + ", ".join(stats["missing_tin"]))
+    else:
+        print(f"Rebuilt {db.rebuild_vendor_1099_totals()} vendor totals")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import csv
+import os
+import sys
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, DB_PATH, TIME_SERIES_GRAINS, iso_date
+
+# What each row of the report breaks the totals down by
+BREAKDOWNS = ("total", "category", "account")
+
+CSV_COLUMNS = ["period", "breakdown", "name", "revenue", "expenses", "net"]
+
+
+def report_rows(series, breakdown):
+    """(period, name, revenue, expenses, net) rows of a get_time_series result, expenses positive"""
+    if breakdown == "total":
+        groups = [dict(series, name="total")]
+    else:
+        groups = series["categories" if breakdown == "category" else "accounts"]
+    rows = []
+    for i, period in enumerate(series["periods"]):
+        for group in groups:
+            if group["revenue"][i] or group["expenses"][i]:
+                rows.append((period, group["name"], group["revenue"][i], abs(group["expenses"][i]), group["net"][i]))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Revenue, expenses and net by month or quarter, for estimated tax planning")
+    parser.add_argument("--db", default=DB_PATH, help="path to the database")
+    parser.add_argument("--year", type=int, help="tax year to report (shorthand for --start/--end)")
+    parser.add_argument("--start", help="first date, YYYY-MM-DD (default: the first transaction)")
+    parser.add_argument("--end", help="last date, YYYY-MM-DD (default: the last transaction)")
+    parser.add_argument("--grain", choices=TIME_SERIES_GRAINS, default="quarter", help="period length (default quarter)")
+    parser.add_argument("--by", choices=BREAKDOWNS, default="total",
+                        help="break each period down by category or account (default: totals only)")
+    parser.add_argument("--output", help="write the report as CSV to this file instead of printing it")
+    args = parser.parse_args()
+
+    try:
+        start, end = iso_date(args.start), iso_date(args.end)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.year:
+        start = start or f"{args.year}-01-01"
+        end = end or f"{args.year}-12-31"
+
+    db = Database(args.db)
+    series = db.get_time_series(start, end, args.grain)
+    rows = report_rows(series, args.by)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS)
+            for period, name, revenue, expenses, net in rows:
+                writer.writerow([period, args.by, name, f"{revenue:.2f}", f"{expenses:.2f}", f"{net:.2f}"])
+        print(f"Wrote {len(rows)} rows to {args.output}")
+        return
+
+    if not rows:
+        print("No categorized transactions in that range.")
+        return
+    name_width = max([len("Name")] + [len(str(row[1])) for row in rows])
+    print(f"{'Period':<8}  {'Name':<{name_width}}  {'Revenue':>14}  {'Expenses':>14}  {'Net':>14}")
+    for period, name, revenue, expenses, net in rows:
+        print(f"{period:<8}  {str(name):<{name_width}}  {revenue:>14,.2f}  {expenses:>14,.2f}  {net:>14,.2f}")
+
+
+if __name__ == "__main__":
+    main()
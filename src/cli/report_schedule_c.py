@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, DB_PATH
+from src.core.reports import REPORT_FORMATS, render_report, year_reports
+
+
+def parse_years(values):
+    """Tax years from arguments such as 2024 or 2016-2025"""
+    years = []
+    for value in values:
+        first, _, last = value.partition("-")
+        years.extend(range(int(first), int(last or first) + 1))
+    return sorted(set(years))
+
+
+def write_file(path, content):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Schedule C profit/loss and category reports without the GUI, for one or many tax years")
+    parser.add_argument("years", nargs="*",
+                        help="tax years such as 2024 or 2016-2025 (default: every year with categorized transactions)")
+    parser.add_argument("--db", default=DB_PATH, help="path to the database")
+    parser.add_argument("--format", choices=REPORT_FORMATS,
+                        help="report format (default: from the --output extension, otherwise html)")
+    output_group = parser.add_mutually_exclusive_group()
+    output_group.add_argument("--output", help="file to write every year to (default: standard output)")
+    output_group.add_argument("--output-dir", help="directory to write one schedule_c_<year> file per year to")
+    args = parser.parse_args()
+
+    report_format = args.format
+    if report_format is None and args.output:
+        extension = os.path.splitext(args.output)[1].lower().lstrip(".")
+        report_format = extension if extension in REPORT_FORMATS else None
+    report_format = report_format or "html"
+
+    start = time.perf_counter()
+    db = Database(args.db)
+    # One connection for the year list and the grouped totals query
+    with db.transaction():
+        years = parse_years(args.years) if args.years else db.fetch_tax_years()
+        reports = year_reports(db, years)
+    if not reports:
+        print("No categorized transactions found.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for year, summary in reports:
+            write_file(os.path.join(args.output_dir, f"schedule_c_{year}.{report_format}"),
+                       render_report([(year, summary)], report_format))
+    elif args.output:
+        write_file(args.output, render_report(reports, report_format))
+    else:
+        sys.stdout.write(render_report(reports, report_format))
+        return
+
+    print(f"Wrote {len(reports)} {report_format.upper()} reports ({years[0]}-{years[-1]}) "
+          f"in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, DB_PATH
+from src.core.vendors import resolve_vendors
+
+
+def print_vendors(db):
+    """Print every vendor with its 1099 settings and aliases"""
+    aliases = {}
+    for alias, vendor_id in db.fetch_vendor_aliases():
+        aliases.setdefault(vendor_id, []).append(alias)
+    vendors = db.fetch_vendors()
+    if not vendors:
+        print("No vendors defined.")
+        return
+    print(f"{'ID':>4}  {'1099':<4}  {'Box':>4}  {'Vendor':<30}  Aliases")
+    for vendor_id, vendor_name, _, requires_1099, payment_type_id in vendors:
+        box = '' if payment_type_id is None else payment_type_id
+        print(f"{vendor_id:>4}  {'yes' if requires_1099 else 'no':<4}  {box:>4}  {vendor_name[:30]:<30}  "
+              f"{', '.join(aliases.get(vendor_id, []))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Link transactions to vendors for 1099 reporting")
+    parser.add_argument("--db", default=DB_PATH, help="path to the database")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("run", help="link every transaction without a vendor (default)")
+    subparsers.add_parser("list", help="list vendors and their aliases")
+
+    add_parser = subparsers.add_parser("add", help="add a vendor")
+    add_parser.add_argument("name")
+    add_parser.add_argument("--business-name")
+    add_parser.add_argument("--tax-id")
+    add_parser.add_argument("--requires-1099", action="store_true")
+    add_parser.add_argument("--payment-type", type=int,
+                            help="payment_types_1099 id for the vendor's payments (1 = 1099-NEC box 1)")
+
+    alias_parser = subparsers.add_parser("alias", help="map a payee spelling to a vendor")
+    alias_parser.add_argument("vendor_id", type=int)
+    alias_parser.add_argument("payee")
+
+    args = parser.parse_args()
+    db = Database(args.db)
+
+    if args.command == "list":
+        print_vendors(db)
+    elif args.command == "add":
+        vendor_id = db.add_vendor(args.name, args.business_name, args.tax_id,
+                                  args.requires_1099, args.payment_type)
+        print(f"Added vendor {vendor_id}")
+    elif args.command == "alias":
+        print(f"Payees starting with '{db.add_vendor_alias(args.vendor_id, args.payee)}' "
+              f"now resolve to vendor {args.vendor_id}")
+    else:
+        stats = resolve_vendors(db, progress=lambda examined: print(f"\r{examined:,} examined", end="", flush=True))
+        if stats['examined']:
+            print()
+        print(f"Linked {stats['resolved']:,} of {stats['examined']:,} transactions to vendors "
+              f"({stats['reportable']:,} 1099 reportable) in {stats['seconds']:.2f}s "
+              f"({stats['rows_per_sec']:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
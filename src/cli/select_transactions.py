@@ -1,49 +1,66 @@
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk
-import sqlite3
-
-def show_transactions():
-    conn = sqlite3.connect('tax_prep.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT transaction_date, payee_description, amount FROM transactions")
-    rows = cursor.fetchall()
-    columns = [desc[0] for desc in cursor.description]
-    conn.close()
-    return columns, rows
-
-def get_column_widths(columns, rows):
-    # Get max width for each column (header and data)
-    col_widths = []
-    for col_idx, col in enumerate(columns):
-        max_len = len(str(col))
-        for row in rows:
-            entry_len = len(str(row[col_idx]))
-            if entry_len > max_len:
-                max_len = entry_len
-        col_widths.append(max_len)
-    return col_widths
-
-def display_transactions():
-    columns, rows = show_transactions()
-    col_widths = get_column_widths(columns, rows)
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, DB_PATH, LEDGER_PAGE_SIZE
+
+COLUMNS = ("transaction_date", "payee_description", "amount")
+
+# Column widths in characters
+COLUMN_WIDTHS = (10, 40, 10)
+
+def display_transactions(db_path=DB_PATH):
+    """Show the transactions one page at a time, newest first"""
+    db = Database(db_path)
+    page_keys = [None]  # key each visited page starts after
+    page = {"number": 0, "has_older": False}
 
     root = tk.Tk()
     root.title("All Transactions")
 
-    tree = ttk.Treeview(root, columns=columns, show='headings')
+    tree = ttk.Treeview(root, columns=COLUMNS, show='headings')
     tree.pack(fill=tk.BOTH, expand=True)
 
-    # Set up columns with calculated widths
-    for idx, col in enumerate(columns):
-        width_px = col_widths[idx] * 6 + 1  # 8 pixels per character + padding
+    for col, width in zip(COLUMNS, COLUMN_WIDTHS):
+        width_px = width * 6 + 1  # 6 pixels per character + padding
         tree.heading(col, text=col)
         tree.column(col, width=width_px, anchor=tk.W, stretch=True)
 
-    # Insert rows
-    for row in rows:
-        tree.insert("", tk.END, values=row)
+    nav = tk.Frame(root)
+    nav.pack(fill=tk.X)
+    newer_btn = tk.Button(nav, text="< Newer")
+    newer_btn.pack(side=tk.LEFT)
+    page_label = tk.Label(nav)
+    page_label.pack(side=tk.LEFT, padx=10)
+    older_btn = tk.Button(nav, text="Older >")
+    older_btn.pack(side=tk.LEFT)
+
+    def show_page(number):
+        # One extra row tells whether there is an older page
+        rows = db.fetch_transaction_page(page_keys[number], LEDGER_PAGE_SIZE + 1)
+        page["number"] = number
+        page["has_older"] = len(rows) > LEDGER_PAGE_SIZE
+        rows = rows[:LEDGER_PAGE_SIZE]
+        del page_keys[number + 1:]
+        if page["has_older"]:
+            page_keys.append((rows[-1][1], rows[-1][0]))
+
+        # Only the current page is kept in the widget
+        tree.delete(*tree.get_children())
+        for _, txn_date, _, txn_payee, txn_amount, _, _ in rows:
+            tree.insert("", tk.END, values=(txn_date, txn_payee, txn_amount))
+        page_label.config(text=f"Page {number + 1}")
+        newer_btn.config(state=tk.NORMAL if number > 0 else tk.DISABLED)
+        older_btn.config(state=tk.NORMAL if page["has_older"] else tk.DISABLED)
+
+    newer_btn.config(command=lambda: show_page(page["number"] - 1))
+    older_btn.config(command=lambda: show_page(page["number"] + 1))
+    show_page(0)
 
     root.mainloop()
 
 if __name__ == "__main__":
-    display_transactions()
\ No newline at end of file
+    display_transactions(*sys.argv[1:2])
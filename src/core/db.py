@@ -1,145 +1,1322 @@
+import hashlib
+import os
+import re
 import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
+from itertools import islice
+
+from src.core.instrumentation import open_connection, profile_methods
+from src.core.rules import compile_regex_rule, normalize_payee
+from src.core.suggestions import payee_key
+from src.core.vendors import vendor_key
 
 DB_PATH = "database/tax_prep.db"
 
+# Numbered NNN_description.sql files applied in order by Database.migrate
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'database', 'migrations')
+
+# Column order of the row tuples accepted by bulk_insert_transactions
+TRANSACTION_COLUMNS = (
+    "account_id",
+    "transaction_date",
+    "reference_number",
+    "payee_description",
+    "address_info",
+    "amount",
+    "note",
+    "tax_year",
+)
+
+# Rows handed to executemany per call during a bulk import
+IMPORT_BATCH_SIZE = 5000
+
+# Per-row AFTER INSERT triggers that bulk_insert_transactions drops for the
+# batch and recreates afterwards: it fills tax_year itself, and indexes the new
+# rows for search and adds them to the 1099 totals in one statement each
+BULK_SUSPENDED_TRIGGERS = (
+    "trg_transactions_tax_year_insert",
+    "trg_transactions_fts_insert",
+    "trg_vendor_1099_totals_insert",
+)
+
+# Rows returned per page by fetch_transaction_page
+LEDGER_PAGE_SIZE = 200
+
+# Rows returned per page by search_transactions
+SEARCH_PAGE_SIZE = 200
+
+# Applied once to each connection opened in persistent mode
+PERSISTENT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",       # 64 MB page cache
+    "PRAGMA mmap_size=268435456",     # 256 MB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Display order of expense categories, matching the Schedule C layout
+CATEGORY_ORDER = """
+    CASE c.name
+        WHEN 'contract labor' THEN 1
+        WHEN 'rent' THEN 2
+        WHEN 'advertising' THEN 3
+        WHEN 'supplies' THEN 4
+        WHEN 'office expense' THEN 5
+        WHEN 'no category' THEN 6
+        ELSE 7
+    END
+"""
+
+# Period label of a transaction for each get_time_series grain: 2024-03 or 2024-Q1
+TIME_SERIES_GRAINS = {
+    "month": "substr(t.transaction_date, 1, 7)",
+    "quarter": "substr(t.transaction_date, 1, 4) || '-Q' || ((CAST(substr(t.transaction_date, 6, 2) AS INTEGER) + 2) / 3)",
+}
+
+# What those expressions give for a YYYY-MM-DD date, as opposed to a date in some other format
+PERIOD_LABEL_PATTERNS = {
+    "month": re.compile(r"\d{4}-(0[1-9]|1[0-2])"),
+    "quarter": re.compile(r"\d{4}-Q[1-4]"),
+}
+
+# Date bounds get_time_series accepts, as text
+ISO_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Ways a categorization rule's pattern can match a payee
+RULE_MATCH_TYPES = ("exact", "prefix", "substring", "regex")
+
+UNCATEGORIZED_TRANSACTIONS_SQL = """
+    SELECT t.id, t.transaction_date, t.payee_description, t.amount, t.note 
+    FROM transactions t
+    LEFT JOIN transaction_categories tc ON t.id = tc.transaction_id
+    WHERE tc.transaction_id IS NULL
+    ORDER BY t.transaction_date DESC
+"""
+
+
+def tax_year_of(transaction_date):
+    """Return the year of a YYYY-MM-DD date string, or None if it has no year"""
+    year = transaction_date[:4] if transaction_date else ""
+    return int(year) if year.isdigit() else None
+
+
+# Imports repeat the same payees over and over
+cached_normalize_payee = lru_cache(maxsize=65536)(normalize_payee)
+
+
+def transaction_fingerprint(account_id, transaction_date, amount, payee, reference_number, occurrence=0):
+    """
+    Hash identifying a transaction across imports: account, date, amount,
+    normalized payee and reference number, plus the occurrence number that
+    keeps identical transactions on the same day apart.
+    """
+    try:
+        amount = f"{float(amount):.2f}"
+    except (TypeError, ValueError):
+        amount = str(amount)
+    key = "|".join((
+        str(account_id),
+        str(transaction_date),
+        amount,
+        cached_normalize_payee(payee),
+        str(reference_number or "").strip(),
+        str(occurrence),
+    ))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def fingerprint_rows(rows):
+    """
+    Yield each TRANSACTION_COLUMNS row with its fingerprint appended, filling
+    in tax_year from the date when the row leaves it empty.
+
+    Identical rows on the same date are numbered in file order, so two genuine
+    $5 coffees on one day stay distinct while re-importing an overlapping
+    export reproduces the same fingerprints. The count is kept per fingerprint
+    for the whole file, since exports sorted by payee or not sorted at all
+    separate identical rows; memory grows with the number of distinct
+    transactions, a couple of hundred bytes each.
+    """
+    occurrences = {}
+    for row in rows:
+        account_id, transaction_date, reference_number, payee, _, amount = row[:6]
+        fingerprint = transaction_fingerprint(account_id, transaction_date, amount, payee, reference_number)
+        occurrence = occurrences.get(fingerprint, 0)
+        occurrences[fingerprint] = occurrence + 1
+        if occurrence:
+            fingerprint = transaction_fingerprint(account_id, transaction_date, amount, payee, reference_number, occurrence)
+        if row[7] is None:
+            row = row[:7] + (tax_year_of(transaction_date),)
+        yield row + (fingerprint,)
+
+
+def fts_query(text):
+    """
+    Turn free text typed into a search box into an FTS5 MATCH expression: every
+    word must appear, and the last one may be a prefix so results follow the
+    user's typing. Returns None when the text has no searchable words.
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def summarize_category_totals(rows):
+    """
+    Build a year summary from (category name, total cents, expense cents,
+    expense count) rows of category_year_totals; see Database.get_year_summary.
+    """
+    revenue = 0.0
+    expenses = 0.0
+    categories = []
+    for name, total_cents, expense_cents, expense_count in rows:
+        if name == 'income':
+            revenue += total_cents / 100
+        if expense_count:
+            expenses += expense_cents / 100
+            if name != 'income':
+                categories.append((name, expense_cents / 100))
+    return {"revenue": revenue, "expenses": expenses, "categories": categories}
+
+
+def nest_category_rollups(rows):
+    """
+    Build the category tree from (id, name, parent id, own expense cents,
+    subtree expense cents) rows in display order; see Database.get_category_tree.
+    A category whose parent has no rows of its own is shown at the top level.
+    """
+    nodes = {}
+    for category_id, name, parent_id, own_cents, total_cents in rows:
+        nodes[category_id] = {
+            "id": category_id,
+            "name": name,
+            "parent_id": parent_id,
+            "own_expenses": own_cents / 100,
+            "expenses": total_cents / 100,
+            "children": [],
+        }
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_id"])
+        (parent["children"] if parent is not None else roots).append(node)
+    return roots
+
+
+def iso_date(value):
+    """
+    value, a date or YYYY-MM-DD string, as YYYY-MM-DD; None for None or "".
+    Raises ValueError for anything else, such as 7/18/2025 or 2025-02-30.
+    """
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    text = str(value).strip()
+    if ISO_DATE_PATTERN.fullmatch(text):
+        try:
+            return date.fromisoformat(text).isoformat()
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid date: {value!r}. Use YYYY-MM-DD.")
+
+
+def period_of(date_text, grain):
+    """The TIME_SERIES_GRAINS period label of a YYYY-MM-DD date"""
+    if grain == "month":
+        return date_text[:7]
+    return f"{date_text[:4]}-Q{(int(date_text[5:7]) + 2) // 3}"
+
+
+def period_range(first, last, grain):
+    """Every period label from first to last inclusive, so gaps show as zeros"""
+    per_year = 12 if grain == "month" else 4
+    index = int(first[:4]) * per_year + int(first[-2:].lstrip("Q")) - 1
+    end = int(last[:4]) * per_year + int(last[-2:].lstrip("Q")) - 1
+    periods = []
+    while index <= end:
+        year, number = divmod(index, per_year)
+        periods.append(f"{year}-{number + 1:02d}" if grain == "month" else f"{year}-Q{number + 1}")
+        index += 1
+    return periods
+
+
+def build_time_series(rows, periods, category_names, account_names):
+    """
+    Assemble get_time_series results from (period, category id, account id,
+    revenue cents, expense cents) rows: the totals and the per-category and
+    per-account series all come from the same rows.
+    """
+    position = {period: i for i, period in enumerate(periods)}
+
+    def empty():
+        return {"revenue": [0] * len(periods), "expenses": [0] * len(periods)}
+
+    totals = empty()
+    categories = {}
+    accounts = {}
+    for period, category_id, account_id, revenue_cents, expense_cents in rows:
+        i = position.get(period)
+        if i is None:
+            continue  # a transaction_date that is not YYYY-MM-DD
+        for series in (totals, categories.setdefault(category_id, empty()), accounts.setdefault(account_id, empty())):
+            series["revenue"][i] += revenue_cents
+            series["expenses"][i] += expense_cents
+
+    def in_dollars(series):
+        revenue = [cents / 100 for cents in series["revenue"]]
+        expenses = [cents / 100 for cents in series["expenses"]]
+        return {
+            "revenue": revenue,
+            "expenses": expenses,
+            "net": [(r + e) / 100 for r, e in zip(series["revenue"], series["expenses"])],
+        }
+
+    return {
+        "periods": periods,
+        **in_dollars(totals),
+        "categories": [dict(id=category_id, name=category_names.get(category_id), **in_dollars(series))
+                       for category_id, series in sorted(categories.items(),
+                                                         key=lambda item: str(category_names.get(item[0])))],
+        "accounts": [dict(id=account_id, name=account_names.get(account_id), **in_dollars(series))
+                     for account_id, series in sorted(accounts.items())],
+    }
+
+
+def sql_literal(value):
+    """Format a Python value as a SQL literal"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+ADD_COLUMN_PATTERN = re.compile(r"ALTER\s+TABLE\s+(\w+)\s+ADD\s+(?:COLUMN\s+)?(\w+)[^;]*;", re.IGNORECASE)
+
+
+def skip_existing_columns(conn, script):
+    """
+    Remove the ALTER TABLE ... ADD COLUMN statements of a migration script whose
+    column already exists, since SQLite has no ADD COLUMN IF NOT EXISTS
+    """
+    def guard(match):
+        table, column = match.groups()
+        columns = {row[1].lower() for row in conn.execute(f"PRAGMA table_info({table})")}
+        return "" if column.lower() in columns else match.group(0)
+
+    return ADD_COLUMN_PATTERN.sub(guard, script)
+
 class Database:
-    def __init__(self, db_path=DB_PATH):
+    def __init__(self, db_path=DB_PATH, persistent=False):
+        """
+        With persistent=True each thread keeps one tuned connection open until
+        close() instead of opening a new connection for every call.
+        """
         self.db_path = db_path
+        self.persistent = persistent
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._year_summaries = {}
+        self._category_trees = {}
+        self._time_series = {}
+        # Bumped by every invalidation, so a result read before one is not memoized after it
+        self._memo_generation = 0
+        self._memo_lock = threading.Lock()
 
     def connect(self):
-        return sqlite3.connect(self.db_path)
+        """
+        Return a connection for the calling thread.
+
+        Inside a transaction() block this is the block's connection. In persistent
+        mode it is the thread's long-lived connection; sqlite3 connections are
+        bound to the thread that uses them, so every thread gets its own.
+        Otherwise a new connection is opened and the caller must close it.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        if not self.persistent:
+            return open_connection(self.db_path)
+        # check_same_thread is off only so close() can run from any thread;
+        # the thread-local lookup above keeps each connection on its own thread
+        conn = open_connection(self.db_path, check_same_thread=False)
+        for pragma in PERSISTENT_PRAGMAS:
+            conn.execute(pragma)
+        self._local.conn = conn
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close every connection opened in persistent mode"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several statements on one connection and commit them together.
+
+        Rolls back if the block raises. Database methods called inside the
+        block, and nested transaction() blocks, join the outer transaction.
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        conn = self.connect()
+        owns_connection = depth == 0 and not self.persistent
+        if owns_connection:
+            local.conn = conn
+        if depth == 0:
+            local.pending_invalidations = []
+        local.depth = depth + 1
+        try:
+            if depth:
+                yield conn
+            else:
+                with conn:
+                    yield conn
+        finally:
+            local.depth = depth
+            if depth == 0:
+                for years in local.pending_invalidations:
+                    self._drop_year_summaries(years)
+                local.pending_invalidations = None
+            if owns_connection:
+                local.conn = None
+                conn.close()
+
+    def migrate(self):
+        """
+        Apply the migrations in MIGRATIONS_DIR that are newer than the database's
+        PRAGMA user_version, each in its own transaction. ADD COLUMN statements
+        for columns that already exist are skipped. Returns the names of the
+        files applied.
+        """
+        migrations = sorted(
+            name for name in os.listdir(MIGRATIONS_DIR)
+            if name[:3].isdigit() and name.endswith(".sql")
+        )
+        applied = []
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for name in migrations:
+                number = int(name[:3])
+                if number <= version:
+                    continue
+                with open(os.path.join(MIGRATIONS_DIR, name), 'r') as f:
+                    script = f.read()
+                # Python helpers available to migration scripts
+                conn.create_function("transaction_fingerprint", 6, transaction_fingerprint, deterministic=True)
+                script = skip_existing_columns(conn, script)
+                try:
+                    conn.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {number};\nCOMMIT;")
+                except sqlite3.Error:
+                    conn.rollback()
+                    raise
+                applied.append(name)
+        if applied:
+            self.invalidate_year_summaries()
+        return applied
 
     def fetch_categories(self):
-        with self.connect() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT id, name FROM categories")
             return cursor.fetchall()
 
+    def fetch_category_hierarchy(self):
+        """(id, name, parent_category_id) of every category, by name"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name, parent_category_id FROM categories ORDER BY name, id")
+            return cursor.fetchall()
+
+    def add_category(self, name, parent_id=None):
+        """Add a category, optionally under a parent category; returns its id"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO categories (name, parent_category_id) VALUES (?, ?)", (name, parent_id))
+            category_id = cursor.lastrowid
+        self.invalidate_year_summaries()
+        return category_id
+
+    def set_category_parent(self, category_id, parent_id):
+        """
+        Move a category and its subcategories under parent_id, or to the top
+        level if parent_id is None. The trg_category_closure_* triggers update
+        the hierarchy; moving a category under its own subcategory raises
+        sqlite3.IntegrityError.
+        """
+        with self.transaction() as conn:
+            conn.execute("UPDATE categories SET parent_category_id = ? WHERE id = ?", (parent_id, category_id))
+        self.invalidate_year_summaries()
+
     def fetch_transactions(self):
-        with self.connect() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT id, transaction_date, payee_description, amount FROM transactions")
             return cursor.fetchall()
     
+    def fetch_accounts(self):
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, account_type, account_name FROM accounts ORDER BY id")
+            return cursor.fetchall()
+
+    def fetch_transaction_page(self, after=None, limit=LEDGER_PAGE_SIZE, start_date=None, end_date=None,
+                               account_id=None, category_id=None, min_amount=None, max_amount=None,
+                               categorized=None):
+        """
+        Fetch one page of the ledger, newest first, as (id, transaction_date,
+        account_id, payee_description, amount, category_name, note) rows.
+
+        Optional filters: an inclusive start_date/end_date range (YYYY-MM-DD),
+        an account, a category, an inclusive amount range, and categorized
+        (True for categorized rows only, False for uncategorized only). Pass
+        after=(transaction_date, id) of the last row received to fetch the next
+        page; each page continues from that key along an index instead of
+        skipping rows, so a deep page costs the same as the first.
+        """
+        conditions = []
+        params = []
+        if after is not None:
+            conditions.append("(t.transaction_date, t.id) < (?, ?)")
+            params.extend(after)
+        elif end_date is not None:
+            # Later pages are already below end_date; leaving it out lets the
+            # planner bound the index scan by the key alone
+            conditions.append("t.transaction_date <= ?")
+            params.append(end_date)
+        if start_date is not None:
+            conditions.append("t.transaction_date >= ?")
+            params.append(start_date)
+        if account_id is not None:
+            conditions.append("t.account_id = ?")
+            params.append(account_id)
+        if category_id is not None:
+            conditions.append("EXISTS (SELECT 1 FROM transaction_categories tc "
+                              "WHERE tc.transaction_id = t.id AND tc.category_id = ?)")
+            params.append(category_id)
+        if min_amount is not None:
+            conditions.append("t.amount >= ?")
+            params.append(min_amount)
+        if max_amount is not None:
+            conditions.append("t.amount <= ?")
+            params.append(max_amount)
+        if categorized is not None:
+            conditions.append(f"{'' if categorized else 'NOT '}EXISTS "
+                              "(SELECT 1 FROM transaction_categories tc WHERE tc.transaction_id = t.id)")
+        params.append(limit)
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT t.id, t.transaction_date, t.account_id, t.payee_description, t.amount,
+                       (SELECT c.name
+                        FROM transaction_categories tc
+                        INNER JOIN categories c ON tc.category_id = c.id
+                        WHERE tc.transaction_id = t.id
+                        LIMIT 1),
+                       t.note
+                FROM transactions t
+                {"WHERE " + " AND ".join(conditions) if conditions else ""}
+                ORDER BY t.transaction_date DESC, t.id DESC
+                LIMIT ?
+            """, params)
+            return cursor.fetchall()
+
+    def iter_transaction_pages(self, page_size=LEDGER_PAGE_SIZE, **filters):
+        """
+        Yield the ledger a page at a time, for callers that walk every matching
+        transaction without holding them all; takes fetch_transaction_page's filters.
+        """
+        after = None
+        while True:
+            page = self.fetch_transaction_page(after, page_size, **filters)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            after = (page[-1][1], page[-1][0])
+
     def fetch_uncategorized_transactions(self):
         """Fetch only transactions that have not been categorized"""
-        with self.connect() as conn:
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(UNCATEGORIZED_TRANSACTIONS_SQL)
+            return cursor.fetchall()
+
+    def fetch_uncategorized_page(self, after=None, limit=LEDGER_PAGE_SIZE):
+        """
+        Fetch one page of the uncategorized transactions, newest first, as
+        (id, transaction_date, payee_description, amount, note) rows. Pass
+        after=(transaction_date, id) of the last row received to fetch the next
+        page. Each page is a short query that is read to the end, so no
+        statement stays open between pages to hold back other writers.
+        """
+        conditions = ["NOT EXISTS (SELECT 1 FROM transaction_categories tc WHERE tc.transaction_id = t.id)"]
+        params = []
+        if after is not None:
+            conditions.append("(t.transaction_date, t.id) < (?, ?)")
+            params.extend(after)
+        params.append(limit)
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT t.id, t.transaction_date, t.payee_description, t.amount, t.note
+                FROM transactions t
+                WHERE {" AND ".join(conditions)}
+                ORDER BY t.transaction_date DESC, t.id DESC
+                LIMIT ?
+            """, params)
+            return cursor.fetchall()
+
+    def fetch_uncategorized_after(self, after_id, limit):
+        """
+        Fetch up to limit (id, payee_description, amount) rows of uncategorized
+        transactions with id greater than after_id, in id order. Callers page
+        through the table by passing the last id they received.
+        """
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT t.id, t.transaction_date, t.payee_description, t.amount, t.note 
+                SELECT t.id, t.payee_description, t.amount
                 FROM transactions t
-                LEFT JOIN transaction_categories tc ON t.id = tc.transaction_id
-                WHERE tc.transaction_id IS NULL
-                ORDER BY t.transaction_date DESC
+                WHERE t.id > ?
+                  AND NOT EXISTS (SELECT 1 FROM transaction_categories tc WHERE tc.transaction_id = t.id)
+                ORDER BY t.id
+                LIMIT ?
+            """, (after_id, limit))
+            return cursor.fetchall()
+
+    def count_uncategorized(self, year=None):
+        """Number of uncategorized transactions in a tax year, or in all years when year is None"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT COUNT(*)
+                FROM transactions t
+                WHERE NOT EXISTS (SELECT 1 FROM transaction_categories tc WHERE tc.transaction_id = t.id)
+                {"AND t.tax_year = ?" if year else ""}
+            """, (int(year),) if year else ())
+            return cursor.fetchone()[0]
+
+    def fetch_rules(self):
+        """Fetch all categorization rules as (id, match_type, pattern, category_id, min_amount, max_amount, priority)"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, match_type, pattern, category_id, min_amount, max_amount, priority
+                FROM categorization_rules
+                ORDER BY priority, id
             """)
             return cursor.fetchall()
 
+    def add_rule(self, match_type, pattern, category_id, min_amount=None, max_amount=None, priority=100):
+        """Add a categorization rule and return its id"""
+        if match_type not in RULE_MATCH_TYPES:
+            raise ValueError(f"Unknown match type '{match_type}', expected one of {', '.join(RULE_MATCH_TYPES)}")
+        if match_type == 'regex':
+            compile_regex_rule(pattern)  # Reject invalid patterns up front
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO categorization_rules (match_type, pattern, category_id, min_amount, max_amount, priority)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (match_type, pattern, category_id, min_amount, max_amount, priority))
+            return cursor.lastrowid
+
+    def delete_rule(self, rule_id):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM categorization_rules WHERE id = ?", (rule_id,))
+
+    def fetch_vendors(self):
+        """Fetch all vendors as (id, vendor_name, business_name, requires_1099, default_payment_type_1099_id)"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, vendor_name, business_name, requires_1099, default_payment_type_1099_id
+                FROM vendors
+                ORDER BY id
+            """)
+            return cursor.fetchall()
+
+    def add_vendor(self, vendor_name, business_name=None, tax_id=None, requires_1099=False,
+                   default_payment_type_1099_id=None):
+        """Add a vendor and return its id"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO vendors (vendor_name, business_name, tax_id, requires_1099, default_payment_type_1099_id)
+                VALUES (?, ?, ?, ?, ?)
+            """, (vendor_name, business_name, tax_id, bool(requires_1099), default_payment_type_1099_id))
+            return cursor.lastrowid
+
+    def fetch_vendor_aliases(self):
+        """Fetch all vendor aliases as (alias, vendor_id)"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT alias, vendor_id FROM vendor_aliases ORDER BY alias")
+            return cursor.fetchall()
+
+    def add_vendor_alias(self, vendor_id, payee):
+        """
+        Map a payee spelling to a vendor, replacing any vendor it mapped to
+        before. Returns the normalized alias that was stored.
+        """
+        alias = vendor_key(payee)
+        if not alias:
+            raise ValueError(f"'{payee}' has no letters to match on")
+        with self.transaction() as conn:
+            conn.execute("""
+                INSERT INTO vendor_aliases (alias, vendor_id) VALUES (?, ?)
+                ON CONFLICT (alias) DO UPDATE SET vendor_id = excluded.vendor_id
+            """, (alias, vendor_id))
+        return alias
+
+    def fetch_unresolved_after(self, after_id, limit):
+        """
+        Fetch up to limit (id, payee_description) rows of transactions without a
+        vendor and with id greater than after_id, in id order.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, payee_description
+                FROM transactions
+                WHERE id > ? AND vendor_id IS NULL
+                ORDER BY id
+                LIMIT ?
+            """, (after_id, limit))
+            return cursor.fetchall()
+
+    def assign_vendors(self, assignments):
+        """
+        Set vendor_id and is_1099_reportable from (transaction id, vendor id,
+        reportable, payment type id) tuples in one executemany. A payment type
+        already set on a transaction is kept.
+        """
+        with self.transaction() as conn:
+            conn.executemany("""
+                UPDATE transactions
+                SET vendor_id = ?,
+                    is_1099_reportable = ?,
+                    payment_type_1099_id = COALESCE(payment_type_1099_id, ?)
+                WHERE id = ?
+            """, [(vendor_id, reportable, payment_type_id, txn_id)
+                  for txn_id, vendor_id, reportable, payment_type_id in assignments])
+
     def fetch_transaction_category(self, transaction_id):
-        with self.connect() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT category_id FROM transaction_categories WHERE transaction_id = ?", (transaction_id,))
             result = cursor.fetchone()
             return result[0] if result else None
 
     def update_transaction_category(self, transaction_id, category_id):
-        with self.connect() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM transaction_categories WHERE transaction_id = ?", (transaction_id,))
             if category_id is not None:
                 cursor.execute("INSERT INTO transaction_categories (transaction_id, category_id) VALUES (?, ?)", (transaction_id, category_id))
-            conn.commit()
+            cursor.execute("SELECT tax_year FROM transactions WHERE id = ?", (transaction_id,))
+            result = cursor.fetchone()
+        self.invalidate_year_summaries([result[0]] if result else None)
 
-    def get_total_categorized_expenses(self, year=None):
-        """Calculate the total amount of all categorized transactions (expenses)"""
-        with self.connect() as conn:
+    def save_categorizations(self, category_changes, note_changes):
+        """
+        Write category assignments ({transaction id: category id, None to clear})
+        and notes ({transaction id: text, blank to clear}) with executemany in a
+        single transaction, keeping the payee/category history counts in step.
+        Work is proportional to the number of changes.
+        Returns a dict with the counts written and the elapsed seconds.
+        """
+        start = time.perf_counter()
+        years = set()
+        history = Counter()
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            if year:
-                cursor.execute("""
-                    SELECT SUM(t.amount) 
-                    FROM transactions t
-                    INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
-                    WHERE t.amount < 0 AND strftime('%Y', t.transaction_date) = ?
-                """, (str(year),))
-            else:
-                cursor.execute("""
-                    SELECT SUM(t.amount) 
+            # Look up the years and payees the changes touch, and the categories being replaced
+            txn_ids = list(category_changes)
+            payees = {}
+            for i in range(0, len(txn_ids), 500):
+                chunk = txn_ids[i:i + 500]
+                cursor.execute(f"""
+                    SELECT t.id, t.tax_year, t.payee_description, tc.category_id
                     FROM transactions t
-                    INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
-                    WHERE t.amount < 0
-                """)
-            result = cursor.fetchone()
-            return result[0] if result[0] is not None else 0.0
+                    LEFT JOIN transaction_categories tc ON t.id = tc.transaction_id
+                    WHERE t.id IN ({', '.join('?' * len(chunk))})
+                """, chunk)
+                for txn_id, tax_year, payee, old_category_id in cursor.fetchall():
+                    years.add(tax_year)
+                    payees[txn_id] = payee_key(payee)
+                    if old_category_id is not None:
+                        history[(payees[txn_id], old_category_id)] -= 1
+            for txn_id, category_id in category_changes.items():
+                if category_id is not None and txn_id in payees:
+                    history[(payees[txn_id], category_id)] += 1
 
-    def get_total_categorized_revenue(self, year=None):
-        """Calculate the total amount of transactions categorized as 'income'"""
-        with self.connect() as conn:
+            cursor.executemany(
+                "DELETE FROM transaction_categories WHERE transaction_id = ?",
+                [(txn_id,) for txn_id in category_changes],
+            )
+            cursor.executemany(
+                "INSERT INTO transaction_categories (transaction_id, category_id) VALUES (?, ?)",
+                [(txn_id, category_id) for txn_id, category_id in category_changes.items() if category_id is not None],
+            )
+            cursor.executemany(
+                "UPDATE transactions SET note = ? WHERE id = ?",
+                [(note.strip() or None, txn_id) for txn_id, note in note_changes.items()],
+            )
+            self._update_payee_category_counts(cursor, history)
+        self.invalidate_year_summaries(years)
+        return {
+            "categories": len(category_changes),
+            "notes": len(note_changes),
+            "seconds": time.perf_counter() - start,
+        }
+
+    def _update_payee_category_counts(self, cursor, deltas):
+        """Apply {(payee key, category id): change in hits} to payee_category_counts"""
+        deltas = [(key, category_id, hits) for (key, category_id), hits in deltas.items() if key and hits]
+        if not deltas:
+            return
+        cursor.executemany("""
+            INSERT INTO payee_category_counts (payee_key, category_id, hits) VALUES (?, ?, ?)
+            ON CONFLICT (payee_key, category_id) DO UPDATE SET hits = hits + excluded.hits
+        """, deltas)
+        cursor.execute("DELETE FROM payee_category_counts WHERE hits <= 0")
+
+    def fetch_payee_category_counts(self):
+        """
+        Fetch the persisted (payee key, category id, hits) history counts. If the
+        table is empty but transactions have been categorized, it is built from
+        the full history first.
+        """
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            if year:
-                cursor.execute("""
-                    SELECT SUM(t.amount) 
-                    FROM transactions t
-                    INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
-                    INNER JOIN categories c ON tc.category_id = c.id
-                    WHERE c.name = 'income' AND strftime('%Y', t.transaction_date) = ?
-                """, (str(year),))
-            else:
-                cursor.execute("""
-                    SELECT SUM(t.amount) 
-                    FROM transactions t
-                    INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
-                    INNER JOIN categories c ON tc.category_id = c.id
-                    WHERE c.name = 'income'
-                """)
-            result = cursor.fetchone()
-            return result[0] if result[0] is not None else 0.0
+            cursor.execute("SELECT payee_key, category_id, hits FROM payee_category_counts")
+            counts = cursor.fetchall()
+            if counts:
+                return counts
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM transaction_categories)")
+            if not cursor.fetchone()[0]:
+                return counts
+        return self.rebuild_payee_category_counts()
 
-    def get_expense_totals_by_category(self, year=None):
-        """Get the total expenses grouped by category (excluding income)"""
-        with self.connect() as conn:
+    def rebuild_payee_category_counts(self):
+        """Recount payee_category_counts from every categorized transaction"""
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            if year:
-                cursor.execute("""
-                    SELECT c.name, SUM(t.amount) as total
-                    FROM transactions t
-                    INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
-                    INNER JOIN categories c ON tc.category_id = c.id
-                    WHERE t.amount < 0 AND c.name != 'income' AND strftime('%Y', t.transaction_date) = ?
-                    GROUP BY c.id, c.name
-                    ORDER BY 
-                        CASE c.name
-                            WHEN 'contract labor' THEN 1
-                            WHEN 'rent' THEN 2
-                            WHEN 'advertising' THEN 3
-                            WHEN 'supplies' THEN 4
-                            WHEN 'office expense' THEN 5
-                            WHEN 'no category' THEN 6
-                            ELSE 7
-                        END
-                """, (str(year),))
+            cursor.execute("""
+                SELECT t.payee_description, tc.category_id
+                FROM transactions t
+                INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
+            """)
+            history = Counter((payee_key(payee), category_id) for payee, category_id in cursor)
+            cursor.execute("DELETE FROM payee_category_counts")
+            self._update_payee_category_counts(cursor, history)
+            cursor.execute("SELECT payee_key, category_id, hits FROM payee_category_counts")
+            return cursor.fetchall()
+
+    def get_year_summary(self, year=None):
+        """
+        Revenue, expenses and per-category expense totals for a tax year (or all
+        years when year is None), read from the trigger-maintained
+        category_year_totals table and memoized until a write touches that year.
+        The cost depends on the number of categories, not transactions.
+
+        Returns a dict with 'revenue', 'expenses' (negative) and 'categories', a
+        list of (category name, negative total) excluding income.
+        """
+        year = int(year) if year else None
+        summary = self._year_summaries.get(year)
+        if summary is not None:
+            return summary
+        generation = self._memo_generation
+
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT c.name,
+                       SUM(s.total_cents) AS total_cents,
+                       SUM(s.expense_cents) AS expense_cents,
+                       SUM(s.expense_count) AS expense_count
+                FROM category_year_totals s
+                INNER JOIN categories c ON s.category_id = c.id
+                {"WHERE s.tax_year = ?" if year else ""}
+                GROUP BY c.id, c.name
+                ORDER BY {CATEGORY_ORDER}
+            """, (year,) if year else ())
+            rows = cursor.fetchall()
+
+        summary = summarize_category_totals(rows)
+        self._memoize(self._year_summaries, {year: summary}, generation)
+        return summary
+
+    def get_year_summaries(self, years):
+        """
+        get_year_summary for several tax years at once: the years not already
+        memoized are read with one grouped query. Returns {year: summary}.
+        """
+        years = [int(year) for year in years]
+        summaries = {year: self._year_summaries[year] for year in years if year in self._year_summaries}
+        missing = sorted(set(years) - set(summaries))
+        if missing:
+            generation = self._memo_generation
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT s.tax_year,
+                           c.name,
+                           SUM(s.total_cents) AS total_cents,
+                           SUM(s.expense_cents) AS expense_cents,
+                           SUM(s.expense_count) AS expense_count
+                    FROM category_year_totals s
+                    INNER JOIN categories c ON s.category_id = c.id
+                    WHERE s.tax_year IN ({", ".join("?" * len(missing))})
+                    GROUP BY s.tax_year, c.id, c.name
+                    ORDER BY s.tax_year, {CATEGORY_ORDER}
+                """, missing)
+                rows_by_year = {year: [] for year in missing}
+                for tax_year, *row in cursor:
+                    rows_by_year[tax_year].append(row)
+            read = {year: summarize_category_totals(rows) for year, rows in rows_by_year.items()}
+            self._memoize(self._year_summaries, read, generation)
+            summaries.update(read)
+        return {year: summaries[year] for year in years}
+
+    def get_category_tree(self, year=None):
+        """
+        Expenses by category for a tax year (or all years when year is None),
+        rolled up the category hierarchy and memoized like get_year_summary.
+        Every category's subtree total comes from one join of
+        category_year_totals through category_closure, so the cost does not
+        depend on how deep the hierarchy is.
+
+        Returns the top-level categories with expenses, excluding income, in
+        display order. Each is a dict with 'id', 'name', 'parent_id',
+        'own_expenses' (its own transactions), 'expenses' (itself and every
+        subcategory, negative) and 'children', a list of the same dicts.
+        """
+        year = int(year) if year else None
+        tree = self._category_trees.get(year)
+        if tree is not None:
+            return tree
+        generation = self._memo_generation
+
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT c.id, c.name, c.parent_category_id,
+                       SUM(CASE WHEN cc.depth = 0 THEN s.expense_cents ELSE 0 END) AS own_cents,
+                       SUM(s.expense_cents) AS total_cents
+                FROM category_year_totals s
+                INNER JOIN category_closure cc ON cc.descendant_id = s.category_id
+                INNER JOIN categories c ON c.id = cc.ancestor_id
+                WHERE c.name != 'income'
+                {"AND s.tax_year = ?" if year else ""}
+                GROUP BY c.id, c.name, c.parent_category_id
+                HAVING SUM(s.expense_count) > 0
+                ORDER BY {CATEGORY_ORDER}, c.name
+            """, (year,) if year else ())
+            rows = cursor.fetchall()
+
+        tree = nest_category_rollups(rows)
+        self._memoize(self._category_trees, {year: tree}, generation)
+        return tree
+
+    def get_time_series(self, start_date=None, end_date=None, grain="month"):
+        """
+        Revenue, expenses and net per month or quarter (grain, one of
+        TIME_SERIES_GRAINS) for the categorized transactions dated from
+        start_date to end_date inclusive (dates or YYYY-MM-DD strings, anything
+        else raises ValueError; None leaves that end open). One grouped pass
+        over the date range yields the totals and the per-category and
+        per-account series. Results are memoized per (start_date, end_date,
+        grain) until a write touches a tax year inside the range.
+
+        Returns a dict with 'periods' (labels such as 2024-03 or 2024-Q1, with
+        no gaps), 'revenue', 'expenses' (negative) and 'net' lists aligned with
+        the periods, and 'categories' and 'accounts', lists of dicts with 'id',
+        'name' and the same three lists. Revenue and expenses follow
+        get_year_summary.
+        """
+        if grain not in TIME_SERIES_GRAINS:
+            raise ValueError(f"Unknown grain: {grain}. Use one of {', '.join(TIME_SERIES_GRAINS)}.")
+        start_date = iso_date(start_date)
+        end_date = iso_date(end_date)
+        key = (start_date, end_date, grain)
+        series = self._time_series.get(key)
+        if series is not None:
+            return series
+        generation = self._memo_generation
+
+        conditions = []
+        params = []
+        if start_date:
+            conditions.append("t.transaction_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("t.transaction_date <= ?")
+            params.append(end_date)
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {TIME_SERIES_GRAINS[grain]} AS period,
+                       tc.category_id,
+                       t.account_id,
+                       SUM(CASE WHEN c.name = 'income' THEN CAST(ROUND(t.amount * 100) AS INTEGER) ELSE 0 END),
+                       SUM(MIN(CAST(ROUND(t.amount * 100) AS INTEGER), 0))
+                FROM transactions t
+                INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
+                INNER JOIN categories c ON tc.category_id = c.id
+                {"WHERE " + " AND ".join(conditions) if conditions else ""}
+                GROUP BY period, tc.category_id, t.account_id
+            """, params)
+            rows = cursor.fetchall()
+            category_names = dict(self.fetch_categories())
+            account_names = {account_id: account_name or account_type
+                             for account_id, account_type, account_name in self.fetch_accounts()}
+
+        if start_date and end_date:
+            periods = period_range(period_of(start_date, grain), period_of(end_date, grain), grain)
+        else:
+            # Rows dated in another format get no period, so they cannot set the bounds either
+            seen = [row[0] for row in rows if row[0] and PERIOD_LABEL_PATTERNS[grain].fullmatch(row[0])]
+            if seen:
+                periods = period_range(period_of(start_date, grain) if start_date else min(seen),
+                                       period_of(end_date, grain) if end_date else max(seen), grain)
             else:
-                cursor.execute("""
-                    SELECT c.name, SUM(t.amount) as total
-                    FROM transactions t
-                    INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
-                    INNER JOIN categories c ON tc.category_id = c.id
-                    WHERE t.amount < 0 AND c.name != 'income'
-                    GROUP BY c.id, c.name
-                    ORDER BY 
-                        CASE c.name
-                            WHEN 'contract labor' THEN 1
-                            WHEN 'rent' THEN 2
-                            WHEN 'advertising' THEN 3
-                            WHEN 'supplies' THEN 4
-                            WHEN 'office expense' THEN 5
-                            WHEN 'no category' THEN 6
-                            ELSE 7
-                        END
-                """)
+                periods = []
+        series = build_time_series(rows, periods, category_names, account_names)
+        self._memoize(self._time_series, {key: series}, generation)
+        return series
+
+    def fetch_tax_years(self):
+        """Tax years that have categorized transactions, oldest first"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT tax_year FROM category_year_totals WHERE tax_year > 0 ORDER BY tax_year")
+            return [row[0] for row in cursor.fetchall()]
+
+    def rebuild_category_year_totals(self):
+        """
+        Recompute category_year_totals from every categorized transaction, for
+        repair after the triggers were bypassed (e.g. dropped and recreated).
+        Returns the number of (year, category) rows written.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM category_year_totals")
+            cursor.execute("""
+                INSERT INTO category_year_totals
+                    (tax_year, category_id, total_cents, expense_cents, transaction_count, expense_count)
+                SELECT COALESCE(t.tax_year, 0),
+                       tc.category_id,
+                       SUM(CAST(ROUND(t.amount * 100) AS INTEGER)),
+                       SUM(MIN(CAST(ROUND(t.amount * 100) AS INTEGER), 0)),
+                       COUNT(*),
+                       SUM(CAST(ROUND(t.amount * 100) AS INTEGER) < 0)
+                FROM transactions t
+                INNER JOIN transaction_categories tc ON t.id = tc.transaction_id
+                GROUP BY COALESCE(t.tax_year, 0), tc.category_id
+            """)
+            written = cursor.rowcount
+        self.invalidate_year_summaries()
+        return written
+
+    def rebuild_category_closure(self):
+        """
+        Recompute category_closure from categories.parent_category_id, for
+        repair after the triggers were bypassed. Returns the number of rows written.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM category_closure")
+            # The depth limit stops the walk on a parent_category_id cycle
+            cursor.execute("""
+                INSERT OR IGNORE INTO category_closure (ancestor_id, descendant_id, depth)
+                WITH RECURSIVE closure (ancestor_id, descendant_id, depth) AS (
+                    SELECT id, id, 0 FROM categories
+                    UNION ALL
+                    SELECT parent.id, closure.descendant_id, closure.depth + 1
+                    FROM closure
+                    INNER JOIN categories c ON c.id = closure.ancestor_id
+                    INNER JOIN categories parent ON parent.id = c.parent_category_id
+                    WHERE closure.depth < (SELECT COUNT(*) FROM categories)
+                )
+                SELECT ancestor_id, descendant_id, MIN(depth) FROM closure GROUP BY ancestor_id, descendant_id
+            """)
+            written = cursor.rowcount
+        self.invalidate_year_summaries()
+        return written
+
+    def fetch_1099_totals(self, year, min_cents=0, below_cents=None):
+        """
+        Fetch the 1099 running totals for a tax year with total_cents of at least
+        min_cents (and under below_cents, if given), joined to the vendor and the
+        payment type. Rows are (vendor_id, vendor_name, business_name, tax_id,
+        address_line1, address_line2, city, state, zip_code, form_type,
+        box_number, description, total_cents, transaction_count), by vendor.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT v.id, v.vendor_name, v.business_name, v.tax_id,
+                       v.address_line1, v.address_line2, v.city, v.state, v.zip_code,
+                       pt.form_type, pt.box_number, pt.description,
+                       s.total_cents, s.transaction_count
+                FROM vendor_1099_totals s
+                INNER JOIN vendors v ON s.vendor_id = v.id
+                INNER JOIN payment_types_1099 pt ON s.payment_type_1099_id = pt.id
+                WHERE s.tax_year = ? AND s.total_cents >= ?
+                {"AND s.total_cents < ?" if below_cents is not None else ""}
+                ORDER BY v.vendor_name, v.id, pt.form_type, pt.box_number
+            """, (year, min_cents) if below_cents is None else (year, min_cents, below_cents))
+            return cursor.fetchall()
+
+    def rebuild_vendor_1099_totals(self):
+        """
+        Recompute vendor_1099_totals from every reportable transaction, for
+        repair after the triggers were bypassed. Returns the number of rows written.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM vendor_1099_totals")
+            cursor.execute("""
+                INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+                SELECT COALESCE(tax_year, 0),
+                       vendor_id,
+                       payment_type_1099_id,
+                       SUM(CAST(ROUND(-amount * 100) AS INTEGER)),
+                       COUNT(*)
+                FROM transactions
+                WHERE is_1099_reportable
+                  AND amount < 0
+                  AND vendor_id IS NOT NULL
+                  AND payment_type_1099_id IS NOT NULL
+                GROUP BY COALESCE(tax_year, 0), vendor_id, payment_type_1099_id
+            """)
+            return cursor.rowcount
+
+    def search_transactions(self, query, year=None, limit=SEARCH_PAGE_SIZE, before_id=None):
+        """
+        Full-text search of payee, address and note. query is free text (see
+        fts_query). Returns up to limit (id, transaction_date, payee_description,
+        amount, category_name, note) rows, newest id first, optionally limited to
+        one tax year. Fetch the next page by passing the last id received as
+        before_id.
+        """
+        match = fts_query(query)
+        if match is None:
+            return []
+        conditions = ["transactions_fts MATCH ?"]
+        params = [match]
+        if before_id is not None:
+            conditions.append("f.rowid < ?")
+            params.append(before_id)
+        if year is not None:
+            conditions.append("t.tax_year = ?")
+            params.append(year)
+        params.append(limit)
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            # Walk the index in rowid order so the LIMIT stops the scan early
+            # even for words that match most of the table
+            cursor.execute(f"""
+                SELECT t.id, t.transaction_date, t.payee_description, t.amount,
+                       (SELECT c.name
+                        FROM transaction_categories tc
+                        INNER JOIN categories c ON tc.category_id = c.id
+                        WHERE tc.transaction_id = t.id
+                        LIMIT 1),
+                       t.note
+                FROM transactions_fts f
+                INNER JOIN transactions t ON t.id = f.rowid
+                WHERE {" AND ".join(conditions)}
+                ORDER BY f.rowid DESC
+                LIMIT ?
+            """, params)
             return cursor.fetchall()
+
+    def rebuild_search_index(self):
+        """Rebuild transactions_fts from the transactions table, for repair after the triggers were bypassed"""
+        with self.transaction() as conn:
+            conn.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')")
+
+    def invalidate_year_summaries(self, years=None):
+        """Drop memoized summaries for the given years, or for every year if years is None"""
+        years = None if years is None else [int(year) for year in years if year]
+        self._drop_year_summaries(years)
+        # Drop them again when the enclosing transaction ends, in case another
+        # thread cached the pre-commit totals in the meantime
+        pending = getattr(self._local, "pending_invalidations", None)
+        if pending is not None:
+            pending.append(years)
+
+    def _drop_year_summaries(self, years):
+        with self._memo_lock:
+            self._memo_generation += 1
+            for memo in (self._year_summaries, self._category_trees):
+                if years is None:
+                    memo.clear()
+                    continue
+                for year in years:
+                    memo.pop(year, None)
+                # The all-years summary covers every year
+                memo.pop(None, None)
+            if years is None:
+                self._time_series.clear()
+                return
+            # Only the date ranges that overlap a changed year
+            for key in list(self._time_series):
+                start_date, end_date = key[:2]
+                if any((not start_date or int(start_date[:4]) <= year) and (not end_date or year <= int(end_date[:4]))
+                       for year in years):
+                    self._time_series.pop(key, None)
+
+    def _memoize(self, memo, results, generation):
+        """
+        Store results, read when the memo generation was generation, in memo
+        unless an invalidation has happened since: the read may predate the
+        write that caused it.
+        """
+        with self._memo_lock:
+            if self._memo_generation == generation:
+                memo.update(results)
+
+    def get_total_categorized_expenses(self, year=None):
+        """Calculate the total amount of all categorized transactions (expenses)"""
+        return self.get_year_summary(year)["expenses"]
+
+    def get_total_categorized_revenue(self, year=None):
+        """Calculate the total amount of transactions categorized as 'income'"""
+        return self.get_year_summary(year)["revenue"]
+
+    def get_expense_totals_by_category(self, year=None, rollup=False):
+        """
+        Get the total expenses grouped by category (excluding income). With
+        rollup=True each top-level category includes its subcategories.
+        """
+        if rollup:
+            return [(node["name"], node["expenses"]) for node in self.get_category_tree(year)]
+        return self.get_year_summary(year)["categories"]
     
     def execute_sql(self, sql_statement):
         """Execute a SQL statement"""
-        with self.connect() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(sql_statement)
-            conn.commit()
+        # Arbitrary SQL may touch any year
+        self.invalidate_year_summaries()
+
+    def bulk_insert_transactions(self, rows, batch_size=IMPORT_BATCH_SIZE, fingerprinted=False, progress=None):
+        """
+        Insert parsed transaction rows on one connection in one transaction.
+
+        rows can be any iterable of tuples ordered like TRANSACTION_COLUMNS; it is
+        consumed batch_size rows at a time. Pass fingerprinted=True for rows that
+        already went through fingerprint_rows. Rows whose fingerprint is already in
+        the database are skipped as duplicates. progress, if given, is called
+        with the number of rows read so far after each batch. If any row fails,
+        or progress raises, nothing is written. The new rows are added to the
+        search index and the 1099 totals in one statement each at the end
+        rather than row by row.
+        Returns a dict with the number of rows read, the number inserted and
+        skipped as duplicates, elapsed seconds, rows/sec and previous_max_id;
+        every inserted row has an id above previous_max_id.
+        """
+        columns = TRANSACTION_COLUMNS + ("fingerprint",)
+        sql = "INSERT INTO transactions ({}) VALUES ({}) ON CONFLICT (fingerprint) DO NOTHING".format(
+            ", ".join(columns),
+            ", ".join("?" * len(columns)),
+        )
+        rows = iter(rows) if fingerprinted else fingerprint_rows(rows)
+        count = 0
+        inserted = 0
+        years = set()
+        start = time.perf_counter()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM transactions")
+            previous_max_id = cursor.fetchone()[0]
+            # Suspend the per-row insert triggers for the batch; DDL is
+            # transactional, so a failed import restores them with everything else.
+            # sqlite3 only opens a transaction implicitly before DML, so open it
+            # here or the DROP would commit on its own
+            if not conn.in_transaction:
+                cursor.execute("BEGIN")
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({})".format(
+                    ", ".join("?" * len(BULK_SUSPENDED_TRIGGERS))),
+                BULK_SUSPENDED_TRIGGERS,
+            )
+            suspended_triggers = dict(cursor.fetchall())
+            for name in suspended_triggers:
+                cursor.execute(f"DROP TRIGGER {name}")
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                cursor.executemany(sql, batch)
+                count += len(batch)
+                inserted += cursor.rowcount
+                years.update(tax_year_of(row[1]) for row in batch)
+                if progress is not None:
+                    progress(count)
+            if "trg_transactions_fts_insert" in suspended_triggers:
+                cursor.execute("""
+                    INSERT INTO transactions_fts (rowid, payee_description, address_info, note)
+                    SELECT id, payee_description, address_info, note
+                    FROM transactions
+                    WHERE id > ?
+                """, (previous_max_id,))
+            if "trg_vendor_1099_totals_insert" in suspended_triggers:
+                cursor.execute("""
+                    INSERT INTO vendor_1099_totals (tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count)
+                    SELECT COALESCE(tax_year, 0),
+                           vendor_id,
+                           payment_type_1099_id,
+                           SUM(CAST(ROUND(-amount * 100) AS INTEGER)),
+                           COUNT(*)
+                    FROM transactions
+                    WHERE id > ?
+                      AND is_1099_reportable
+                      AND amount < 0
+                      AND vendor_id IS NOT NULL
+                      AND payment_type_1099_id IS NOT NULL
+                    GROUP BY COALESCE(tax_year, 0), vendor_id, payment_type_1099_id
+                    ON CONFLICT (tax_year, vendor_id, payment_type_1099_id) DO UPDATE SET
+                        total_cents = total_cents + excluded.total_cents,
+                        transaction_count = transaction_count + excluded.transaction_count
+                """, (previous_max_id,))
+            for trigger_sql in suspended_triggers.values():
+                cursor.execute(trigger_sql)
+        self.invalidate_year_summaries(years)
+        elapsed = time.perf_counter() - start
+        return {
+            "rows": count,
+            "inserted": inserted,
+            "duplicates": count - inserted,
+            "seconds": elapsed,
+            "rows_per_sec": count / elapsed if elapsed > 0 else 0.0,
+            "previous_max_id": previous_max_id,
+        }
+
+
+# Time every Database call while the profiler in src/core/instrumentation.py
+# is enabled; connect() and close() are covered by the connection timings
+profile_methods(Database, skip=("connect", "close"))
@@ -0,0 +1,93 @@
+"""
+1099 reporting from the vendor_1099_totals running totals.
+
+The totals table is keyed by tax year, vendor and 1099 box and kept current by
+triggers, so threshold questions are an index range scan over one row per
+vendor and box instead of a re-aggregation of every reportable payment.
+"""
+import csv
+from collections import namedtuple
+
+# IRS reporting threshold for 1099-NEC box 1 and most 1099-MISC boxes
+DEFAULT_THRESHOLD = 600
+
+# How far below the threshold a vendor counts as approaching it
+DEFAULT_MARGIN = 100
+
+# Forms written by export_1099_batch
+BATCH_FORM_TYPES = ("1099-NEC", "1099-MISC")
+
+# Recipient columns of the batch file, followed by one column per box
+BATCH_COLUMNS = [
+    "form_type", "tax_year", "recipient_name", "business_name", "recipient_tin",
+    "address_line1", "address_line2", "city", "state", "zip_code",
+]
+
+Vendor1099Total = namedtuple("Vendor1099Total", [
+    "vendor_id", "vendor_name", "business_name", "tax_id",
+    "address_line1", "address_line2", "city", "state", "zip_code",
+    "form_type", "box_number", "description", "total", "transaction_count",
+])
+
+
+def to_cents(dollars):
+    return int(round(dollars * 100))
+
+
+def vendor_totals(db, year, minimum=0, below=None):
+    """Per-vendor, per-box totals for a tax year between minimum and below dollars"""
+    rows = db.fetch_1099_totals(year, to_cents(minimum), None if below is None else to_cents(below))
+    return [Vendor1099Total(*row[:12], row[12] / 100, row[13]) for row in rows]
+
+
+def vendors_over_threshold(db, year, threshold=DEFAULT_THRESHOLD):
+    """Vendor and box totals that have reached the threshold and need a 1099"""
+    return vendor_totals(db, year, minimum=threshold)
+
+
+def vendors_approaching_threshold(db, year, threshold=DEFAULT_THRESHOLD, margin=DEFAULT_MARGIN):
+    """Vendor and box totals within margin dollars below the threshold"""
+    return vendor_totals(db, year, minimum=max(threshold - margin, 0), below=threshold)
+
+
+def box_sort_key(box_number):
+    return (int(box_number), box_number) if box_number.isdigit() else (float("inf"), box_number)
+
+
+def export_1099_batch(db, year, output_path, threshold=DEFAULT_THRESHOLD, form_types=BATCH_FORM_TYPES):
+    """
+    Write a 1099 batch CSV for a tax year: one row per vendor and form with a
+    box_N column for each box, filled where the vendor reached the threshold.
+    Returns a dict with the number of forms written per form type and the
+    names of the vendors without a tax id, which must be fixed before filing.
+    """
+    forms = {}
+    for total in vendors_over_threshold(db, year, threshold):
+        if total.form_type not in form_types:
+            continue
+        form = forms.setdefault((total.vendor_id, total.form_type), {
+            "form_type": total.form_type,
+            "tax_year": year,
+            "recipient_name": total.vendor_name,
+            "business_name": total.business_name or "",
+            "recipient_tin": total.tax_id or "",
+            "address_line1": total.address_line1 or "",
+            "address_line2": total.address_line2 or "",
+            "city": total.city or "",
+            "state": total.state or "",
+            "zip_code": total.zip_code or "",
+        })
+        box = f"box_{total.box_number}"
+        form[box] = round(form.get(box, 0) + total.total, 2)
+
+    boxes = sorted({key[4:] for form in forms.values() for key in form if key.startswith("box_")}, key=box_sort_key)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=BATCH_COLUMNS + [f"box_{box}" for box in boxes], restval="")
+        writer.writeheader()
+        writer.writerows(forms.values())
+
+    counts = {form_type: 0 for form_type in form_types}
+    for form in forms.values():
+        counts[form["form_type"]] += 1
+    missing_tin = sorted({form["recipient_name"] for form in forms.values() if not form["recipient_tin"]})
+    return {"forms": counts, "missing_tin": missing_tin}
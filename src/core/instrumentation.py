@@ -0,0 +1,415 @@
+"""
+Opt-in timing of Database calls and the SQL statements they run.
+
+The profiler is off by default and costs one attribute check per Database
+call while off. Once enabled, with --profile on the import CLI or the
+TAX_PREP_PROFILE environment variable, it records calls, time and rows
+returned for every Database method and every distinct SQL statement, plus
+the cost of opening connections. A statement is timed from execute until
+its last row is fetched. Statements slower than the slow-query threshold
+are logged with their EXPLAIN QUERY PLAN. The summary is written when the
+process exits:
+
+    TAX_PREP_PROFILE=1 python run_gui.py                  # summary on stderr
+    TAX_PREP_PROFILE=profile.json python src/cli/import_files.py data/imports/*.csv
+    TAX_PREP_PROFILE=profile.txt TAX_PREP_SLOW_QUERY_MS=20 python src/cli/categorize.py
+"""
+import atexit
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from itertools import chain
+
+PROFILE_ENV = "TAX_PREP_PROFILE"
+SLOW_QUERY_ENV = "TAX_PREP_SLOW_QUERY_MS"
+
+# Statements that take at least this long are logged with their query plan
+DEFAULT_SLOW_QUERY_MS = 100
+
+# Slow queries kept in the log; later ones are only counted
+SLOW_LOG_LIMIT = 100
+
+# Rows of each table in the printed summary
+SUMMARY_ROWS = 20
+
+# Characters of SQL shown per statement in the printed summary
+SQL_WIDTH = 72
+
+
+def normalize_sql(sql):
+    """Collapse whitespace so the same statement from different call sites shares one entry"""
+    return " ".join(sql.split())
+
+
+class Timing:
+    """Calls, total and slowest seconds and rows returned for one method or statement"""
+
+    __slots__ = ("calls", "seconds", "max_seconds", "rows")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+
+    def add(self, seconds, rows=None):
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if rows:
+            self.rows += rows
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "mean_seconds": self.seconds / self.calls if self.calls else 0.0,
+            "max_seconds": self.max_seconds,
+            "rows": self.rows,
+        }
+
+
+class QueryProfiler:
+    """Process-wide collector of method, statement and connection timings"""
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_seconds = DEFAULT_SLOW_QUERY_MS / 1000
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def enable(self, slow_query_ms=None):
+        """Start recording; connections opened from now on are profiled"""
+        if slow_query_ms is not None:
+            self.slow_seconds = slow_query_ms / 1000
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self.methods = {}        # Database method name -> Timing
+            self.statements = {}     # normalized SQL -> Timing
+            self.connections = Timing()
+            self.slow_queries = []   # oldest first, at most SLOW_LOG_LIMIT
+            self.slow_query_count = 0
+            self._plans = {}         # normalized SQL -> EXPLAIN QUERY PLAN lines
+
+    def current_method(self):
+        """Name of the innermost Database method running on this thread, or None"""
+        return getattr(self._local, "method", None)
+
+    def record_method(self, name, seconds, rows=None):
+        with self._lock:
+            timing = self.methods.get(name)
+            if timing is None:
+                timing = self.methods[name] = Timing()
+            timing.add(seconds, rows)
+
+    def record_connection(self, seconds):
+        with self._lock:
+            self.connections.add(seconds)
+
+    def record_statement(self, sql, seconds, rows, explain=None):
+        """
+        Add one run of a statement. explain, if given, is called with no
+        arguments to fetch the query plan when the statement was slow.
+        """
+        key = normalize_sql(sql)
+        with self._lock:
+            timing = self.statements.get(key)
+            if timing is None:
+                timing = self.statements[key] = Timing()
+            timing.add(seconds, rows)
+            if seconds < self.slow_seconds:
+                return
+            self.slow_query_count += 1
+            if len(self.slow_queries) >= SLOW_LOG_LIMIT:
+                return
+            plan = self._plans.get(key)
+        if plan is None and explain is not None:
+            plan = explain()
+            with self._lock:
+                self._plans[key] = plan
+        with self._lock:
+            self.slow_queries.append({
+                "seconds": seconds,
+                "rows": rows,
+                "method": self.current_method(),
+                "sql": key,
+                "plan": plan,
+            })
+
+    def summary(self):
+        """Everything recorded, as a dict of plain values"""
+        with self._lock:
+            return {
+                "slow_query_ms": self.slow_seconds * 1000,
+                "connections": self.connections.as_dict(),
+                "methods": {name: timing.as_dict() for name, timing in self.methods.items()},
+                "statements": {sql: timing.as_dict() for sql, timing in self.statements.items()},
+                "slow_query_count": self.slow_query_count,
+                "slow_queries": list(self.slow_queries),
+            }
+
+    def format_summary(self, limit=SUMMARY_ROWS):
+        """The summary as text: connections, then the top methods and statements by total time, then the slow log"""
+        summary = self.summary()
+        connections = summary["connections"]
+        lines = [
+            f"Database profile (slow query threshold {summary['slow_query_ms']:g} ms)",
+            f"Connections opened: {connections['calls']}, {connections['seconds'] * 1000:.2f} ms total, "
+            f"{connections['mean_seconds'] * 1000:.2f} ms mean",
+        ]
+        header = f"{'Calls':>7}  {'Total ms':>10}  {'Mean ms':>9}  {'Max ms':>9}  {'Rows':>10}"
+        for title, timings in (("Method", summary["methods"]), ("Statement", summary["statements"])):
+            lines.append("")
+            lines.append(f"{title:<{SQL_WIDTH}}  {header}")
+            ranked = sorted(timings.items(), key=lambda item: -item[1]["seconds"])
+            for name, timing in ranked[:limit]:
+                name = name if len(name) <= SQL_WIDTH else name[:SQL_WIDTH - 3] + "..."
+                lines.append(f"{name:<{SQL_WIDTH}}  {timing['calls']:>7,}  {timing['seconds'] * 1000:>10.2f}  "
+                             f"{timing['mean_seconds'] * 1000:>9.2f}  {timing['max_seconds'] * 1000:>9.2f}  "
+                             f"{timing['rows']:>10,}")
+            if len(ranked) > limit:
+                lines.append(f"... and {len(ranked) - limit} more")
+        lines.append("")
+        lines.append(f"Slow queries: {summary['slow_query_count']}")
+        for entry in summary["slow_queries"]:
+            lines.append(f"  {entry['seconds'] * 1000:.2f} ms in {entry['method'] or 'direct SQL'}: {entry['sql']}")
+            for detail in entry["plan"] or []:
+                lines.append(f"      {detail}")
+        return "\n".join(lines)
+
+    def dump(self, destination="-"):
+        """
+        Write the summary to stderr ("-" or "1"), to a .json file as JSON, or
+        to any other file as text. Nothing is written if nothing was recorded,
+        as in the parser processes of an import.
+        """
+        if not (self.methods or self.statements or self.connections.calls):
+            return
+        if destination in ("-", "1"):
+            print(self.format_summary(), file=sys.stderr)
+        elif destination.lower().endswith(".json"):
+            with open(destination, 'w') as f:
+                json.dump(self.summary(), f, indent=2)
+        else:
+            with open(destination, 'w') as f:
+                f.write(self.format_summary() + "\n")
+
+
+PROFILER = QueryProfiler()
+
+
+def query_plan(conn, sql, parameters):
+    """EXPLAIN QUERY PLAN lines for a statement, indented by depth, or None if it cannot be explained"""
+    try:
+        # A plain cursor, so the EXPLAIN itself is not recorded
+        rows = sqlite3.Cursor(conn).execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+    except sqlite3.Error:
+        return None
+    depths = {0: -1}
+    plan = []
+    for node_id, parent_id, _, detail in rows:
+        depths[node_id] = depths.get(parent_id, -1) + 1
+        plan.append("  " * depths[node_id] + detail)
+    return plan
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Cursor that reports each statement to PROFILER once its rows are consumed:
+    when the last row is fetched, the cursor runs another statement or is
+    closed. Statements without result rows are reported right away.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._statement = None  # [sql, parameters, seconds, rows] of the statement still being fetched
+
+    def _start(self, sql, parameters, seconds):
+        if self.description is None:
+            PROFILER.record_statement(sql, seconds, max(self.rowcount, 0), self._explainer(sql, parameters))
+        else:
+            self._statement = [sql, parameters, seconds, 0]
+
+    def _finish(self):
+        statement = self._statement
+        if statement is not None:
+            self._statement = None
+            sql, parameters, seconds, rows = statement
+            PROFILER.record_statement(sql, seconds, rows, self._explainer(sql, parameters))
+
+    def _explainer(self, sql, parameters):
+        if parameters is None:
+            return None
+        return lambda: query_plan(self.connection, sql, parameters)
+
+    def _fetched(self, seconds, rows, exhausted):
+        statement = self._statement
+        if statement is not None:
+            statement[2] += seconds
+            statement[3] += rows
+            if exhausted:
+                self._finish()
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        self._start(sql, parameters, time.perf_counter() - start)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        # Keep the first parameter set for the query plan
+        seq_of_parameters = iter(seq_of_parameters)
+        first = next(seq_of_parameters, None)
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters if first is None else chain([first], seq_of_parameters))
+        self._start(sql, first, time.perf_counter() - start)
+        return self
+
+    def executescript(self, sql_script):
+        self._finish()
+        start = time.perf_counter()
+        super().executescript(sql_script)
+        PROFILER.record_statement(sql_script, time.perf_counter() - start, None)
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(time.perf_counter() - start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(time.perf_counter() - start, 0, True)
+            raise
+        self._fetched(time.perf_counter() - start, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass  # The connection may already be closed
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors, including the ones behind execute(), are ProfiledCursors"""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    # sqlite3's own shortcuts create a plain cursor without calling cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def open_connection(db_path, **kwargs):
+    """sqlite3.connect, returning a timed ProfiledConnection while the profiler is enabled"""
+    if not PROFILER.enabled:
+        return sqlite3.connect(db_path, **kwargs)
+    start = time.perf_counter()
+    conn = sqlite3.connect(db_path, factory=ProfiledConnection, **kwargs)
+    PROFILER.record_connection(time.perf_counter() - start)
+    return conn
+
+
+def profile_methods(cls, skip=()):
+    """
+    Wrap the public methods of cls so each call is timed while the profiler is
+    enabled. Generators and context managers are left alone, since a call only
+    creates them.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or name in skip or not inspect.isfunction(method):
+            continue
+        if inspect.isgeneratorfunction(getattr(method, "__wrapped__", method)):
+            continue
+        setattr(cls, name, _profiled(name, method))
+
+
+def result_rows(result):
+    """Rows a Database method returned: the length of a list, or the "rows" count of a stats dict"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict) and isinstance(result.get("rows"), int):
+        return result["rows"]
+    return None
+
+
+def _profiled(name, method):
+    local = PROFILER._local
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if not PROFILER.enabled:
+            return method(*args, **kwargs)
+        outer = getattr(local, "method", None)
+        local.method = name
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            local.method = outer
+            elapsed = time.perf_counter() - start
+        PROFILER.record_method(name, elapsed, result_rows(result))
+        return result
+
+    return wrapper
+
+
+def profile_until_exit(destination="-", slow_query_ms=None):
+    """Enable the profiler and write its summary to destination (see QueryProfiler.dump) when the process exits"""
+    PROFILER.enable(slow_query_ms)
+    atexit.register(PROFILER.dump, destination)
+
+
+def enable_from_environment():
+    """Profile until exit if TAX_PREP_PROFILE is set, writing the summary where it says"""
+    destination = os.environ.get(PROFILE_ENV, "")
+    if destination in ("", "0"):
+        return
+    slow_query_ms = os.environ.get(SLOW_QUERY_ENV)
+    profile_until_exit(destination, float(slow_query_ms) if slow_query_ms else None)
+
+
+enable_from_environment()
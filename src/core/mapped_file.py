@@ -0,0 +1,53 @@
+"""
+Chunked reads of memory-mapped import files.
+
+The file is mapped instead of read through a buffered text stream. Each
+chunk is cut just after a record boundary, decoded in one call and handed
+to the parser, which splits it with str methods that run in C rather than
+pulling one line at a time through the io layer.
+"""
+import mmap
+import os
+
+# Bytes decoded per chunk; a chunk runs on to the end of the record it stops in
+MMAP_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def iter_text_chunks(file_path, separator=b"\n", chunk_size=MMAP_CHUNK_SIZE, quote=None, encoding="utf-8"):
+    """
+    Yield the file as decoded strings of about chunk_size bytes, each ending
+    with a complete record. A record ends at the end of the line containing
+    separator. If quote is given, a chunk is also never cut while an odd number
+    of quote characters is open, so quoted fields may span lines.
+    """
+    if os.path.getsize(file_path) == 0:
+        return  # mmap cannot map an empty file
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        release = hasattr(mm, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+        if release and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        start = 0
+        released = 0
+        while start < size:
+            end = record_end(mm, separator, min(start + chunk_size, size) - 1)
+            if quote is not None:
+                while end < size and mm[start:end].count(quote) % 2:
+                    end = record_end(mm, b"\n", end)
+            yield mm[start:end].decode(encoding)
+            start = end
+            # Unmap the pages already parsed so resident memory stays at about
+            # one chunk; they are still in the page cache if needed again
+            parsed = start - start % mmap.PAGESIZE
+            if release and parsed > released:
+                mm.madvise(mmap.MADV_DONTNEED, released, parsed - released)
+                released = parsed
+
+
+def record_end(mm, separator, position):
+    """Offset just past the line that holds the next separator at or after position, or the end of mm"""
+    found = mm.find(separator, position)
+    if found < 0:
+        return len(mm)
+    newline = mm.find(b"\n", found + len(separator) - 1)
+    return len(mm) if newline < 0 else newline + 1
@@ -0,0 +1,228 @@
+"""
+Schedule C profit/loss reports rendered from year summaries.
+
+Nothing here imports Qt: the GUI's print preview and the headless
+report_schedule_c.py CLI share these renderers. A report is a list of
+(tax year, summary) pairs, where summary is a Database.get_year_summary dict.
+"""
+import csv
+import html
+import io
+import json
+from datetime import datetime
+
+REPORT_FORMATS = ("html", "csv", "json")
+
+CSV_COLUMNS = ["tax_year", "section", "name", "amount"]
+
+HTML_STYLE = """
+                body {
+                    font-family: 'Times New Roman', 'Times', serif;
+                    font-size: 12pt;
+                    line-height: 1.6;
+                    margin: 40px;
+                    color: black;
+                }
+                .header {
+                    text-align: center;
+                    margin-bottom: 30px;
+                    border-bottom: 2px solid black;
+                    padding-bottom: 20px;
+                }
+                .title {
+                    font-size: 24pt;
+                    font-weight: bold;
+                    margin-bottom: 10px;
+                }
+                .subtitle {
+                    font-size: 14pt;
+                    color: #333;
+                    margin-bottom: 5px;
+                }
+                .timestamp {
+                    font-size: 10pt;
+                    color: #777;
+                    font-style: italic;
+                }
+                .summary {
+                    margin: 30px 0;
+                }
+                .summary-item {
+                    margin: 10px 0;
+                    padding: 8px;
+                    border-bottom: 1px dotted #ccc;
+                }
+                .summary-label {
+                    font-weight: bold;
+                    display: inline-block;
+                    width: 120px;
+                }
+                .summary-value {
+                    font-weight: normal;
+                }
+                .profit {
+                    color: black;
+                }
+                .loss {
+                    color: red;
+                }
+                .categories {
+                    margin-top: 30px;
+                }
+                .categories-title {
+                    font-size: 16pt;
+                    font-weight: bold;
+                    margin-bottom: 15px;
+                    text-align: center;
+                    border-bottom: 1px solid black;
+                    padding-bottom: 10px;
+                }
+                .category-item {
+                    margin: 8px 0;
+                    padding: 5px;
+                    border-bottom: 1px dotted #ddd;
+                }
+                .category-name {
+                    font-weight: bold;
+                    display: inline-block;
+                    width: 200px;
+                }
+                .category-amount {
+                    font-weight: normal;
+                }
+                .no-data {
+                    font-style: italic;
+                    color: #666;
+                    text-align: center;
+                    margin: 20px 0;
+                }
+                .footer {
+                    margin-top: 50px;
+                    border-top: 1px solid #ccc;
+                    padding-top: 20px;
+                    font-size: 10pt;
+                    color: #777;
+                    text-align: center;
+                }
+                .page-break {
+                    page-break-after: always;
+                }
+"""
+
+
+def profit_loss(summary):
+    """Net profit (positive) or loss (negative); expenses are stored as negative amounts"""
+    return summary["revenue"] + summary["expenses"]
+
+
+def year_report_html(year, summary, timestamp):
+    """The body of one tax year's report: header, totals, expenses by category and footer"""
+    net = profit_loss(summary)
+    content = f"""
+            <div class="header">
+                <div class="title">Schedule C Prep</div>
+                <div class="subtitle">Tax Year {year}</div>
+                <div class="timestamp">Generated on {timestamp}</div>
+            </div>
+
+            <div class="summary">
+                <div class="summary-item">
+                    <span class="summary-label">Revenue:</span>
+                    <span class="summary-value">${summary["revenue"]:,.2f}</span>
+                </div>
+                <div class="summary-item">
+                    <span class="summary-label">Expenses:</span>
+                    <span class="summary-value">${abs(summary["expenses"]):,.2f}</span>
+                </div>
+                <div class="summary-item">
+                    <span class="summary-label">{"Profit:" if net >= 0 else "Loss:"}</span>
+                    <span class="summary-value {'profit' if net >= 0 else 'loss'}">${abs(net):,.2f}</span>
+                </div>
+            </div>
+
+            <div class="categories">
+                <div class="categories-title">Expenses by Category</div>
+        """
+
+    if summary["categories"]:
+        for category_name, total_amount in summary["categories"]:
+            content += f"""
+                <div class="category-item">
+                    <span class="category-name">{html.escape(category_name.title())}:</span>
+                    <span class="category-amount">${abs(total_amount):,.2f}</span>
+                </div>
+                """
+    else:
+        content += '<div class="no-data">No categorized expenses found</div>'
+
+    content += """
+            </div>
+
+            <div class="footer">
+                Generated by Schedule C Prep Application
+            </div>
+        """
+    return content
+
+
+def render_html(reports, generated_at=None):
+    """One HTML document with a page per tax year, for printing"""
+    timestamp = (generated_at or datetime.now()).strftime("%B %d, %Y at %I:%M %p")
+    pages = [year_report_html(year, summary, timestamp) for year, summary in reports]
+    return f"""
+        <html>
+        <head>
+            <style>{HTML_STYLE}            </style>
+        </head>
+        <body>{'<div class="page-break"></div>'.join(pages)}
+        </body>
+        </html>
+        """
+
+
+def render_csv(reports, generated_at=None):
+    """
+    CSV with one row per figure: revenue, expenses, profit_loss (section
+    "summary") and each category's expenses (section "category"), per tax year.
+    Expenses are positive; a loss is a negative profit_loss.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for year, summary in reports:
+        writer.writerow([year, "summary", "revenue", f"{summary['revenue']:.2f}"])
+        writer.writerow([year, "summary", "expenses", f"{abs(summary['expenses']):.2f}"])
+        writer.writerow([year, "summary", "profit_loss", f"{profit_loss(summary):.2f}"])
+        for category_name, total_amount in summary["categories"]:
+            writer.writerow([year, "category", category_name, f"{abs(total_amount):.2f}"])
+    return output.getvalue()
+
+
+def render_json(reports, generated_at=None):
+    """JSON with the same figures as render_csv, one object per tax year"""
+    return json.dumps({
+        "generated": (generated_at or datetime.now()).isoformat(timespec="seconds"),
+        "years": [{
+            "tax_year": year,
+            "revenue": round(summary["revenue"], 2),
+            "expenses": round(abs(summary["expenses"]), 2),
+            "profit_loss": round(profit_loss(summary), 2),
+            "categories": [{"name": name, "expenses": round(abs(amount), 2)}
+                           for name, amount in summary["categories"]],
+        } for year, summary in reports],
+    }, indent=2)
+
+
+RENDERERS = {"html": render_html, "csv": render_csv, "json": render_json}
+
+
+def render_report(reports, report_format, generated_at=None):
+    """Render (tax year, summary) pairs in one of REPORT_FORMATS"""
+    return RENDERERS[report_format](reports, generated_at)
+
+
+def year_reports(db, years):
+    """(tax year, summary) pairs for the given years, read with one grouped query"""
+    years = [int(year) for year in years]
+    summaries = db.get_year_summaries(years)
+    return [(year, summaries[year]) for year in years]
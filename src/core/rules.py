@@ -0,0 +1,211 @@
+"""
+Rule-based auto-categorization.
+
+Rules match the normalized payee (exact, prefix, substring or regex) and can be
+limited to an amount range. RuleMatcher compiles every rule into three lookup
+structures instead of looping over the rules for each transaction:
+
+- exact rules: a dict keyed by pattern
+- prefix and substring rules: one Aho-Corasick automaton
+- regex rules: each compiled on its own, tried once per distinct payee
+"""
+import re
+import time
+from collections import deque
+
+# Uncategorized rows matched and written per round trip
+RULES_BATCH_SIZE = 10000
+
+# Tie-breaker between rules of equal priority: the more specific match wins
+MATCH_TYPE_RANK = {"exact": 0, "prefix": 1, "substring": 2, "regex": 3}
+
+NON_ALPHANUMERIC = re.compile(r"[^A-Z0-9&]+")
+
+
+def normalize_payee(payee):
+    """Upper-case a payee and collapse punctuation and whitespace to single spaces"""
+    if not payee:
+        return ""
+    return NON_ALPHANUMERIC.sub(" ", payee.upper()).strip()
+
+
+def compile_regex_rule(pattern):
+    """Compile a regex rule's pattern as RuleMatcher uses it; raises re.error if it is invalid"""
+    return re.compile(pattern, re.IGNORECASE)
+
+
+class Rule:
+    """A categorization rule as stored in the categorization_rules table"""
+
+    __slots__ = ("id", "match_type", "pattern", "category_id", "min_amount", "max_amount", "priority")
+
+    def __init__(self, id, match_type, pattern, category_id, min_amount=None, max_amount=None, priority=100):
+        self.id = id
+        self.match_type = match_type
+        self.pattern = pattern
+        self.category_id = category_id
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.priority = 100 if priority is None else priority
+
+    def sort_key(self):
+        return (self.priority, MATCH_TYPE_RANK[self.match_type], self.id)
+
+    def accepts_amount(self, amount):
+        if self.min_amount is not None and amount < self.min_amount:
+            return False
+        if self.max_amount is not None and amount > self.max_amount:
+            return False
+        return True
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring search. Finds every (pattern, end position) pair in
+    one pass over the text, regardless of how many patterns there are.
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(pattern)
+
+        # Breadth-first pass to set failure links and merge outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find_all(self, text):
+        """Yield (pattern, start index) for every occurrence of every pattern"""
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern in output[state]:
+                yield pattern, index - len(pattern) + 1
+
+
+class RuleMatcher:
+    """Pick the winning rule for a payee and amount from a compiled rule set"""
+
+    def __init__(self, rules):
+        self.rules = [rule if isinstance(rule, Rule) else Rule(*rule) for rule in rules]
+        self.exact = {}
+        self.prefix = {}
+        self.substring = {}
+        regex_rules = []
+
+        for rule in self.rules:
+            if rule.match_type == "regex":
+                regex_rules.append(rule)
+                continue
+            pattern = normalize_payee(rule.pattern)
+            if not pattern:
+                continue
+            table = getattr(self, rule.match_type)
+            table.setdefault(pattern, []).append(rule)
+
+        self.automaton = AhoCorasick(set(self.prefix) | set(self.substring))
+
+        # Compiled separately rather than as one alternation: an alternation
+        # reports only the first rule matching at each position, hiding a
+        # lower-priority rule whose amount range would accept the row, and
+        # patterns with inline flags or backreferences do not combine
+        self.regex_rules = [(compile_regex_rule(rule.pattern), rule) for rule in regex_rules]
+
+        # Candidate rules per normalized payee; recurring payees are matched once
+        self.cache = {}
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def candidates(self, payee):
+        """All rules whose pattern matches a normalized payee, best first"""
+        found = self.cache.get(payee)
+        if found is not None:
+            return found
+
+        found = list(self.exact.get(payee, ()))
+        for pattern, start in self.automaton.find_all(payee):
+            if start == 0 and pattern in self.prefix:
+                found.extend(self.prefix[pattern])
+            if pattern in self.substring:
+                found.extend(self.substring[pattern])
+        for regex, rule in self.regex_rules:
+            if regex.search(payee):
+                found.append(rule)
+        found = sorted(set(found), key=Rule.sort_key)
+
+        self.cache[payee] = found
+        return found
+
+    def match(self, payee, amount):
+        """Return the category id of the best matching rule, or None"""
+        for rule in self.candidates(normalize_payee(payee)):
+            if rule.accepts_amount(amount):
+                return rule.category_id
+        return None
+
+
+def auto_categorize(db, after_id=0, batch_size=RULES_BATCH_SIZE, progress=None):
+    """
+    Apply the categorization rules to every uncategorized transaction with an
+    id greater than after_id (0 means all of them), in one transaction.
+    progress, if given, is called with the rows examined so far after each
+    batch. Returns a dict with rows examined, rows categorized, seconds and
+    rows/sec.
+    """
+    start = time.perf_counter()
+    examined = 0
+    categorized = 0
+    matcher = RuleMatcher(db.fetch_rules())
+    if matcher:
+        with db.transaction():
+            while True:
+                rows = db.fetch_uncategorized_after(after_id, batch_size)
+                if not rows:
+                    break
+                after_id = rows[-1][0]
+                assignments = {}
+                for txn_id, payee, amount in rows:
+                    category_id = matcher.match(payee, amount)
+                    if category_id is not None:
+                        assignments[txn_id] = category_id
+                if assignments:
+                    db.save_categorizations(assignments, {})
+                examined += len(rows)
+                categorized += len(assignments)
+                if progress is not None:
+                    progress(examined)
+    elapsed = time.perf_counter() - start
+    return {
+        "examined": examined,
+        "categorized": categorized,
+        "seconds": elapsed,
+        "rows_per_sec": examined / elapsed if elapsed > 0 else 0.0,
+    }
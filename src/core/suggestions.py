@@ -0,0 +1,53 @@
+"""
+Category suggestions learned from past assignments.
+
+Every saved categorization bumps a (payee key, category) hit count in the
+payee_category_counts table. PayeeCategoryIndex loads those counts once and
+answers "most likely category for this payee" with a single dict lookup.
+"""
+import re
+
+from src.core.rules import normalize_payee
+
+# Tokens with three or more digits are store numbers, references or dates
+NUMBER_TOKEN = re.compile(r"(?:\D*\d){3}")
+
+
+def payee_key(payee):
+    """
+    Normalized payee with store numbers, reference codes and dates removed,
+    so recurring payees share one key.
+    """
+    return " ".join(token for token in normalize_payee(payee).split() if not NUMBER_TOKEN.match(token))
+
+
+class PayeeCategoryIndex:
+    """In-memory payee key -> category frequency index"""
+
+    def __init__(self, counts=()):
+        self.counts = {}  # payee key -> {category id: hits}
+        self.best = {}    # payee key -> category id with the most hits
+        for key, category_id, hits in counts:
+            self._add(key, category_id, hits)
+
+    @classmethod
+    def load(cls, db):
+        """Build the index from the counts persisted in the database"""
+        return cls(db.fetch_payee_category_counts())
+
+    def _add(self, key, category_id, hits):
+        if not key:
+            return
+        categories = self.counts.setdefault(key, {})
+        categories[category_id] = categories.get(category_id, 0) + hits
+        best = self.best.get(key)
+        if best is None or categories[category_id] > categories[best]:
+            self.best[key] = category_id
+
+    def record(self, payee, category_id):
+        """Count one more assignment of category_id to payee"""
+        self._add(payee_key(payee), category_id, 1)
+
+    def suggest(self, payee):
+        """Return the category id most often assigned to payee, or None"""
+        return self.best.get(payee_key(payee))
@@ -0,0 +1,111 @@
+"""
+Vendor resolution: link transactions to the vendors table by payee.
+
+Vendor names, business names and the vendor_aliases table are normalized
+into one in-memory alias index. A payee resolves to the vendor of the longest
+alias that matches it on a whole-word prefix, so the alias "ACME PLUMBING"
+covers "ACME PLUMBING LLC #4411 SEATTLE WA". Matched transactions get the
+vendor id, the vendor's 1099 flag and its default 1099 box in batched
+UPDATEs; the vendor_1099_totals triggers pick the changes up from there.
+"""
+import time
+
+from src.core.suggestions import payee_key
+
+# Transactions resolved and written per batch
+RESOLVE_BATCH_SIZE = 10000
+
+# Legal-form words that bank exports add or drop at random
+CORPORATE_SUFFIXES = frozenset(["LLC", "INC", "CO", "CORP", "CORPORATION", "LTD", "LLP", "PLLC", "PC", "PA"])
+
+
+def vendor_key(name):
+    """Payee key without corporate suffixes, used for vendor names and aliases"""
+    # Drop dots first so "L.L.C." and "Inc." become single tokens
+    name = (name or "").replace(".", "")
+    return " ".join(token for token in payee_key(name).split() if token not in CORPORATE_SUFFIXES)
+
+
+class VendorIndex:
+    """In-memory alias -> vendor index with the vendors' 1099 settings"""
+
+    def __init__(self, vendors=(), aliases=()):
+        self.vendors = {}   # vendor id -> (requires_1099, default payment type id)
+        self.aliases = {}   # normalized alias -> vendor id
+        for vendor_id, vendor_name, business_name, requires_1099, payment_type_id in vendors:
+            self.vendors[vendor_id] = (bool(requires_1099), payment_type_id)
+            for name in (vendor_name, business_name):
+                key = vendor_key(name)
+                if key:
+                    self.aliases.setdefault(key, vendor_id)
+        # Explicit aliases win over names
+        for alias, vendor_id in aliases:
+            if vendor_id in self.vendors:
+                self.aliases[alias] = vendor_id
+        # Vendor per raw payee; bank exports repeat the same payees constantly
+        self.cache = {}
+
+    @classmethod
+    def load(cls, db):
+        """Build the index from the vendors and vendor_aliases tables"""
+        return cls(db.fetch_vendors(), db.fetch_vendor_aliases())
+
+    def __bool__(self):
+        return bool(self.aliases)
+
+    def resolve(self, payee):
+        """Return the vendor id for a payee, or None"""
+        if payee in self.cache:
+            return self.cache[payee]
+        vendor_id = None
+        tokens = vendor_key(payee).split()
+        for length in range(len(tokens), 0, -1):
+            vendor_id = self.aliases.get(" ".join(tokens[:length]))
+            if vendor_id is not None:
+                break
+        self.cache[payee] = vendor_id
+        return vendor_id
+
+
+def resolve_vendors(db, after_id=0, batch_size=RESOLVE_BATCH_SIZE, progress=None):
+    """
+    Link every transaction without a vendor and with an id greater than
+    after_id (0 means a full backfill) to its vendor. Each batch is written
+    and committed on its own, so an interrupted backfill keeps its progress
+    and the next run continues with the rows still unresolved. progress, if
+    given, is called with the rows examined so far after each batch.
+    Returns a dict with rows examined, rows resolved, how many of those are
+    1099 reportable, seconds and rows/sec.
+    """
+    start = time.perf_counter()
+    examined = 0
+    resolved = 0
+    reportable = 0
+    index = VendorIndex.load(db)
+    if index:
+        while True:
+            rows = db.fetch_unresolved_after(after_id, batch_size)
+            if not rows:
+                break
+            after_id = rows[-1][0]
+            assignments = []
+            for txn_id, payee in rows:
+                vendor_id = index.resolve(payee)
+                if vendor_id is not None:
+                    requires_1099, payment_type_id = index.vendors[vendor_id]
+                    assignments.append((txn_id, vendor_id, requires_1099, payment_type_id))
+                    reportable += requires_1099
+            if assignments:
+                db.assign_vendors(assignments)
+            examined += len(rows)
+            resolved += len(assignments)
+            if progress is not None:
+                progress(examined)
+    elapsed = time.perf_counter() - start
+    return {
+        "examined": examined,
+        "resolved": resolved,
+        "reportable": reportable,
+        "seconds": elapsed,
+        "rows_per_sec": examined / elapsed if elapsed > 0 else 0.0,
+    }
@@ -1,25 +1,214 @@
 import sys
 import os
-from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
-                             QHBoxLayout, QLabel, QScrollArea,
-                             QGridLayout, QComboBox)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QKeySequence, QShortcut
+import sqlite3
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QLabel,
+                             QComboBox, QPushButton, QTableView, QHeaderView,
+                             QStyledItemDelegate, QAbstractItemView)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QFont, QColor, QKeySequence, QShortcut
 
 # Add the project root to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.core.db import Database
+from src.core.suggestions import PayeeCategoryIndex
+from src.gui.workers import Worker
+
+
+# Rows fetched each time the view scrolls near the end
+FETCH_BATCH_SIZE = 200
+
+CATEGORY_PLACEHOLDER = "-- Select Category --"
+
+
+class UncategorizedTransactionModel(QAbstractTableModel):
+    """
+    Table model over the uncategorized transactions. Rows are fetched a page at
+    a time as the view scrolls, each page continuing after the last row shown,
+    so opening the window costs the same no matter how many transactions are
+    waiting to be categorized. No query stays open between pages, so an import
+    committing in the background cannot leave the window's connection with a
+    stale read that blocks its next save. Each row's category is pre-filled
+    with the suggestion from the payee history index.
+    """
+
+    HEADERS = ["ID", "Date", "Payee", "Amount", "Category", "Note"]
+    CATEGORY_COLUMN = 4
+    NOTE_COLUMN = 5
+
+    def __init__(self, db, categories, suggestions, parent=None):
+        super().__init__(parent)
+        self.category_names = {cat_id: name for cat_id, name in categories}
+        self.suggestions = suggestions
+        self.suggested = {}         # transaction id -> suggested category id
+        self.rows = []              # (id, date, payee, amount, note) tuples fetched so far
+        self.pending_changes = {}   # transaction id -> selected category id
+        self.notes = {}             # transaction id -> edited note text that differs from the database
+        self.db = db
+        self.exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        after = (self.rows[-1][1], self.rows[-1][0]) if self.rows else None
+        batch = self.db.fetch_uncategorized_page(after, FETCH_BATCH_SIZE)
+        if len(batch) < FETCH_BATCH_SIZE:
+            self.exhausted = True
+        for txn_id, _, txn_payee, _, _ in batch:
+            category_id = self.suggestions.suggest(txn_payee)
+            if category_id is not None:
+                self.suggested[txn_id] = category_id
+        if batch:
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(batch) - 1)
+            self.rows.extend(batch)
+            self.endInsertRows()
+
+    def note_text(self, row):
+        """Current note for a row, including unsaved edits"""
+        txn_id, _, _, _, txn_note = self.rows[row]
+        if txn_id in self.notes:
+            return self.notes[txn_id]
+        return str(txn_note) if txn_note else ""
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        txn_id, txn_date, txn_payee, txn_amount, _ = self.rows[index.row()]
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(txn_id)
+            if column == 1:
+                return str(txn_date)
+            if column == 2:
+                return str(txn_payee)
+            if column == 3:
+                return f"{float(txn_amount):.2f}"
+            if column == self.CATEGORY_COLUMN:
+                category_id = self.pending_changes.get(txn_id, self.suggested.get(txn_id))
+                return self.category_names.get(category_id, CATEGORY_PLACEHOLDER)
+            if column == self.NOTE_COLUMN:
+                return self.note_text(index.row())
+        elif role == Qt.ItemDataRole.EditRole:
+            if column == self.CATEGORY_COLUMN:
+                return self.pending_changes.get(txn_id, self.suggested.get(txn_id))
+            if column == self.NOTE_COLUMN:
+                return self.note_text(index.row())
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            # Suggestions are shown in gray until they are accepted
+            if column == self.CATEGORY_COLUMN and txn_id not in self.pending_changes and txn_id in self.suggested:
+                return QColor("#888888")
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if column in (0, 3):
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        elif role == Qt.ItemDataRole.BackgroundRole:
+            # Visual feedback that a category change is pending
+            if column == self.CATEGORY_COLUMN and txn_id in self.pending_changes:
+                return QColor("#fff3cd")
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() in (self.CATEGORY_COLUMN, self.NOTE_COLUMN):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        txn_id = self.rows[index.row()][0]
+        if index.column() == self.CATEGORY_COLUMN:
+            if value is None:
+                return False
+            self.pending_changes[txn_id] = value
+        elif index.column() == self.NOTE_COLUMN:
+            # Only track notes that actually differ from what was loaded
+            original = self.rows[index.row()][4] or ""
+            if value.strip() == str(original).strip():
+                self.notes.pop(txn_id, None)
+            else:
+                self.notes[txn_id] = value
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+    
+    def accept_suggestions(self):
+        """Turn the suggestions of every loaded row into pending changes"""
+        for txn_id, category_id in self.suggested.items():
+            self.pending_changes.setdefault(txn_id, category_id)
+        if self.rows:
+            self.dataChanged.emit(self.index(0, self.CATEGORY_COLUMN),
+                                  self.index(len(self.rows) - 1, self.CATEGORY_COLUMN))
+
+
+class CategoryDelegate(QStyledItemDelegate):
+    """Edit the category column with a dropdown of category names"""
+
+    def __init__(self, categories, parent=None):
+        super().__init__(parent)
+        self.categories = categories
+
+    def createEditor(self, parent, option, index):
+        dropdown = QComboBox(parent)
+        dropdown.addItem(CATEGORY_PLACEHOLDER, None)
+        for cat_id, name in self.categories:
+            dropdown.addItem(name, cat_id)
+        # Store the choice as soon as it is made
+        dropdown.activated.connect(lambda _, dd=dropdown: self.commitData.emit(dd))
+        return dropdown
+
+    def setEditorData(self, editor, index):
+        position = editor.findData(index.data(Qt.ItemDataRole.EditRole))
+        editor.setCurrentIndex(max(position, 0))
+
+    def setModelData(self, editor, model, index):
+        category_id = editor.currentData()
+        if category_id is not None:  # Skip placeholder
+            model.setData(index, category_id, Qt.ItemDataRole.EditRole)
+
+
+def load_categorize_data(worker, db, suggestions):
+    """
+    Fetch the categories and, the first time, build the payee history index;
+    runs on a worker thread. The model fetches its pages afterwards on the GUI
+    thread.
+    """
+    categories = db.fetch_categories()
+    if suggestions is None:
+        suggestions = PayeeCategoryIndex.load(db)
+    return categories, suggestions
 
 
 class CategorizeWindow(QMainWindow):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_window = parent
-        self.db = Database()
-        self.pending_changes = {}  # Store changes before database update
+        # Share the main window's connections instead of opening new ones
+        self.db = parent.db if parent is not None and hasattr(parent, 'db') else Database(persistent=True)
+        self.model = None
+        # Built on the first load from the persisted history counts, then updated on each save
+        self.suggestions = None
+        self.load_worker = None
+        self.import_running = False
         self.setup_ui()
         self.load_data()
-        
+
     def setup_ui(self):
         self.setWindowTitle("Categorize Transactions")
         self.setGeometry(400, 0, 860, self.screen().availableGeometry().height())
@@ -34,10 +223,9 @@ class CategorizeWindow(QMainWindow):
         layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         
         # Add update button at the top
-        from PyQt6.QtWidgets import QPushButton
-        update_btn = QPushButton("Update Database")
-        update_btn.setFixedHeight(35)
-        update_btn.setStyleSheet("""
+        self.update_btn = QPushButton("Update Database")
+        self.update_btn.setFixedHeight(35)
+        self.update_btn.setStyleSheet("""
             QPushButton {
                 background-color: #4CAF50;
                 color: white;
@@ -49,186 +237,132 @@ class CategorizeWindow(QMainWindow):
             QPushButton:hover {
                 background-color: #45a049;
             }
+            QPushButton:disabled {
+                background-color: #a5d6a7;
+            }
         """)
-        update_btn.clicked.connect(self.update_all_categories)
-        layout.addWidget(update_btn)
-        
-        # Create scroll area
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.update_btn.clicked.connect(self.update_all_categories)
+        layout.addWidget(self.update_btn)
         
-        # Create scrollable widget
-        scroll_widget = QWidget()
-        scroll_area.setWidget(scroll_widget)
+        # Accept every pre-filled suggestion at once
+        accept_btn = QPushButton("Accept Suggestions")
+        accept_btn.setFixedHeight(30)
+        accept_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #757575;
+                color: white;
+                border: none;
+                border-radius: 3px;
+                font-size: 13px;
+            }
+            QPushButton:hover {
+                background-color: #616161;
+            }
+        """)
+        accept_btn.clicked.connect(lambda: self.model is not None and self.model.accept_suggestions())
+        layout.addWidget(accept_btn)
         
-        # Create grid layout for the scrollable content
-        self.grid_layout = QGridLayout(scroll_widget)
-        self.grid_layout.setSpacing(1)
-        self.grid_layout.setContentsMargins(0, 0, 0, 0)
-        self.grid_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        # Message shown instead of the table when there is nothing to categorize
+        self.no_data_label = QLabel("No uncategorized transactions found.\n\nAll transactions have been categorized.")
+        self.no_data_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.no_data_label.setFont(QFont("Verdana", 16))
+        self.no_data_label.setStyleSheet("color: #666; margin: 50px; line-height: 1.5;")
+        self.no_data_label.hide()
+        layout.addWidget(self.no_data_label)
         
-        layout.addWidget(scroll_area)
+        # Table view only creates widgets for the rows on screen
+        self.table_view = QTableView()
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.setStyleSheet("alternate-background-color: #f8f8f8; background-color: #ffffff;")
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.table_view.verticalHeader().hide()
+        header = self.table_view.horizontalHeader()
+        header.setFont(QFont("Verdana", 14, QFont.Weight.Bold))
+        header.setStyleSheet("QHeaderView::section { background-color: #e0e0e0; padding: 8px; border: 1px solid #ccc; }")
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)  # Note column takes the remaining width
+        layout.addWidget(self.table_view)
         
         # Add keyboard shortcut for Command-W to close window
         close_shortcut = QShortcut(QKeySequence.StandardKey.Close, self)
         close_shortcut.activated.connect(self.close)
-        
+
     def load_data(self):
-        # Clear existing layout
-        for i in reversed(range(self.grid_layout.count())): 
-            child = self.grid_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
-        # Get data from database
-        categories = self.db.fetch_categories()
-        transactions = self.db.fetch_uncategorized_transactions()
-        
-        # Check if there are any uncategorized transactions
-        if not transactions:
-            # Show message when no uncategorized transactions
-            no_data_label = QLabel("No uncategorized transactions found.\n\nAll transactions have been categorized.")
-            no_data_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_data_label.setFont(QFont("Verdana", 16))
-            no_data_label.setStyleSheet("color: #666; margin: 50px; line-height: 1.5;")
-            self.grid_layout.addWidget(no_data_label, 0, 0, 1, 5)
-            return
-        
-        self.category_choices = [cat[1] for cat in categories]
-        self.category_id_map = {cat[1]: cat[0] for cat in categories}
-        
-        # Create headers
-        headers = ["ID", "Date", "Payee", "Amount", "Category", "Note"]
-        header_font = QFont("Verdana", 14, QFont.Weight.Bold)
+        """Load the categories and payee history on a worker thread, then show the table"""
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+        if self.suggestions is None:
+            self.statusBar().showMessage("Loading transactions...")
+        self.load_worker = Worker(load_categorize_data, self.db, self.suggestions)
+        self.load_worker.signals.result.connect(self.show_data)
+        self.load_worker.signals.error.connect(self.show_load_error)
+        self.load_worker.start()
+
+    def show_load_error(self, message):
+        """Report a load that failed"""
+        self.statusBar().showMessage(f"Error: {message}")
+
+    def show_data(self, result):
+        """Build the table model from the data loaded by load_data"""
+        categories, self.suggestions = result
+        if self.statusBar().currentMessage() == "Loading transactions...":
+            self.statusBar().clearMessage()
         
-        for col, header in enumerate(headers):
-            header_label = QLabel(header)
-            header_label.setFont(header_font)
-            header_label.setStyleSheet("background-color: #e0e0e0; padding: 8px; border: 1px solid #ccc;")
-            self.grid_layout.addWidget(header_label, 0, col)
+        self.model = UncategorizedTransactionModel(self.db, categories, self.suggestions, self)
+        self.table_view.setModel(self.model)
+        self.category_delegate = CategoryDelegate(categories, self.table_view)
+        self.table_view.setItemDelegateForColumn(UncategorizedTransactionModel.CATEGORY_COLUMN, self.category_delegate)
         
-        # Add transaction rows
-        for row_num, txn in enumerate(transactions, start=1):
-            txn_id, txn_date, txn_payee, txn_amount, txn_note = txn
-            
-            # Alternate row colors
-            row_bg = "#ffffff" if row_num % 2 == 1 else "#f8f8f8"
-            style = f"background-color: {row_bg}; padding: 4px; border: 1px solid #ddd;"
-            
-            # Create labels for transaction data
-            id_label = QLabel(str(txn_id))
-            id_label.setStyleSheet(style)
-            id_label.setFixedWidth(40)
-            id_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.grid_layout.addWidget(id_label, row_num, 0)
-            
-            date_label = QLabel(str(txn_date))
-            date_label.setStyleSheet(style)
-            date_label.setFixedWidth(80)  # Set width for exactly 10 characters
-            self.grid_layout.addWidget(date_label, row_num, 1)
-            
-            payee_label = QLabel(str(txn_payee))
-            payee_label.setStyleSheet(style)
-            payee_label.setFixedWidth(275)  # Updated width
-            self.grid_layout.addWidget(payee_label, row_num, 2)
-            
-            amount_label = QLabel(f"{float(txn_amount):.2f}")
-            amount_label.setStyleSheet(style)
-            amount_label.setFixedWidth(70)  # Set width for maximum 8 characters
-            amount_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.grid_layout.addWidget(amount_label, row_num, 3)
-            
-            # Create category dropdown - EXACT copy from working test
-            dropdown = QComboBox()
-            dropdown.addItem("-- Select Category --")
-            dropdown.addItems(self.category_choices)
-            dropdown.setFixedWidth(132)  # Set width for 22 characters
-            # Remove custom styling that's causing hover issues
-            # dropdown.setStyleSheet(f"background-color: {row_bg}; border: 1px solid #ddd;")
-            
-            # Store transaction ID for later use
-            dropdown.setProperty("transaction_id", txn_id)
-            
-            # Connect using EXACT same method as working test
-            dropdown.currentIndexChanged.connect(
-                lambda index, dd=dropdown: self.handle_selection(index, dd)
-            )
-            
-            self.grid_layout.addWidget(dropdown, row_num, 4)
-            
-            # Create note input field - moved to last column
-            from PyQt6.QtWidgets import QLineEdit
-            note_input = QLineEdit()
-            note_input.setStyleSheet(style)
-            note_input.setFixedWidth(240)  # Double the original width
-            note_input.setProperty("transaction_id", txn_id)
-            # Set existing note value if it exists
-            if txn_note:
-                note_input.setText(str(txn_note))
-            self.grid_layout.addWidget(note_input, row_num, 5)
+        # Column widths: ID, Date (10 characters), Payee, Amount (8 characters), Category (22 characters)
+        for column, width in enumerate([40, 80, 275, 70, 132]):
+            self.table_view.setColumnWidth(column, width)
         
-        # Set column stretch factors
-        self.grid_layout.setColumnStretch(0, 0)  # ID column - fixed
-        self.grid_layout.setColumnStretch(1, 1)  # Date
-        self.grid_layout.setColumnStretch(2, 1)  # Payee - reduced width
-        self.grid_layout.setColumnStretch(3, 1)  # Amount
-        self.grid_layout.setColumnStretch(4, 1)  # Category
-        self.grid_layout.setColumnStretch(5, 2)  # Note - wider
-    
-    def handle_selection(self, index, dropdown):
-        """Handle dropdown selection - store change for later update"""
-        if index > 0:  # Skip placeholder
-            # Get selected text
-            selected_category = dropdown.itemText(index)
-            
-            # Get transaction ID
-            txn_id = dropdown.property("transaction_id")
-            
-            # Store the pending change (don't update database yet)
-            category_id = self.category_id_map[selected_category]
-            self.pending_changes[txn_id] = category_id
-            
-            # Visual feedback that change is pending
-            dropdown.setStyleSheet("background-color: #fff3cd; border: 2px solid #ffc107;")
-    
+        # Pull the first page so we know whether there is anything to show
+        self.model.fetchMore()
+        has_rows = self.model.rowCount() > 0
+        self.table_view.setVisible(has_rows)
+        self.no_data_label.setVisible(not has_rows)
+
     def update_all_categories(self):
         """Update all pending category changes and notes to database"""
-        from PyQt6.QtWidgets import QLineEdit
-        
-        # First, update all category changes
-        for txn_id, category_id in self.pending_changes.items():
-            self.db.update_transaction_category(txn_id, category_id)
-        
-        # Then update ALL notes from ALL note input fields (regardless of category changes)
-        for row in range(1, self.grid_layout.rowCount()):
-            widget = self.grid_layout.itemAtPosition(row, 5)
-            if widget and isinstance(widget.widget(), QLineEdit):
-                input_widget = widget.widget()
-                txn_id = input_widget.property("transaction_id")
-                note_text = input_widget.text().strip()
-                
-                # Update note - handle both setting and clearing notes
-                if note_text:
-                    escaped_note = note_text.replace("'", "''")
-                    self.db.execute_sql(f"UPDATE transactions SET note = '{escaped_note}' WHERE id = {txn_id}")
-                else:
-                    # Clear the note if the field is empty
-                    self.db.execute_sql(f"UPDATE transactions SET note = NULL WHERE id = {txn_id}")
-        
-        # Clear pending changes
-        self.pending_changes.clear()
+        if self.model is None or self.import_running:
+            return  # Still loading, or an import is writing
+        # Write only what changed, in one batched transaction
+        try:
+            stats = self.db.save_categorizations(self.model.pending_changes, self.model.notes)
+        except sqlite3.Error as e:
+            # Nothing was written; the pending changes stay for another try
+            self.statusBar().showMessage(f"Could not save: {e}")
+            return
+        for txn_id, _, txn_payee, _, _ in self.model.rows:
+            if txn_id in self.model.pending_changes:
+                self.suggestions.record(txn_payee, self.model.pending_changes[txn_id])
+        self.statusBar().showMessage(
+            f"Saved {stats['categories']} categories and {stats['notes']} notes "
+            f"in {stats['seconds'] * 1000:.0f} ms"
+        )
         
         # Refresh parent window
         if self.parent_window and hasattr(self.parent_window, 'refresh_totals'):
             self.parent_window.refresh_totals()
-            
+        
         # Reload the categorize window to show updated data
         self.load_data()
-    
+
+    def set_import_running(self, running):
+        """Disable saving while the main window's import writes to the database"""
+        self.import_running = running
+        self.update_btn.setEnabled(not running)
+        if running:
+            self.statusBar().showMessage("Saving is paused until the import finishes")
+        elif self.statusBar().currentMessage() == "Saving is paused until the import finishes":
+            self.statusBar().clearMessage()
+
     def closeEvent(self, event):
         """Handle window close event"""
+        if self.load_worker is not None:
+            self.load_worker.cancel()
         if self.parent_window and hasattr(self.parent_window, 'refresh_totals'):
             self.parent_window.refresh_totals()
         event.accept()
@@ -0,0 +1,292 @@
+import sys
+import os
+import re
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QLineEdit, QComboBox, QPushButton,
+                             QTableView, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QFont, QDoubleValidator, QKeySequence, QShortcut
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, LEDGER_PAGE_SIZE
+from src.gui.workers import Worker
+
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Choices of the categorized-state filter and the value passed for each
+CATEGORIZED_CHOICES = [("All Transactions", None), ("Categorized", True), ("Uncategorized", False)]
+
+
+def load_ledger_options(worker, db):
+    """Fetch the accounts and categories for the filter dropdowns; runs on a worker thread"""
+    return db.fetch_accounts(), db.fetch_categories()
+
+
+def load_ledger_page(worker, db, page_number, after, filters):
+    """Fetch one ledger page and whether an older page follows it; runs on a worker thread"""
+    # One extra row tells whether there is an older page without another query
+    rows = db.fetch_transaction_page(after, LEDGER_PAGE_SIZE + 1, **filters)
+    return page_number, filters, rows[:LEDGER_PAGE_SIZE], len(rows) > LEDGER_PAGE_SIZE
+
+
+class LedgerPageModel(QAbstractTableModel):
+    """Table model over a single ledger page, so memory stays the same however far the user pages"""
+
+    HEADERS = ["ID", "Date", "Account", "Payee", "Amount", "Category", "Note"]
+
+    def __init__(self, rows, account_names, parent=None):
+        super().__init__(parent)
+        self.rows = rows    # (id, date, account id, payee, amount, category, note) tuples
+        self.account_names = account_names
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        txn_id, txn_date, account_id, txn_payee, txn_amount, category_name, txn_note = self.rows[index.row()]
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(txn_id)
+            if column == 1:
+                return str(txn_date)
+            if column == 2:
+                return self.account_names.get(account_id, str(account_id))
+            if column == 3:
+                return str(txn_payee)
+            if column == 4:
+                return f"{float(txn_amount):.2f}"
+            if column == 5:
+                return category_name or ""
+            if column == 6:
+                return str(txn_note) if txn_note else ""
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if column in (0, 4):
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+
+class LedgerWindow(QMainWindow):
+    """
+    Browse every transaction, newest first, a page at a time. Pages are
+    fetched by keyset from the last row shown, and the keys of the pages
+    already visited are kept so Newer can step back without re-counting.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Share the main window's connections instead of opening new ones
+        self.db = parent.db if parent is not None and hasattr(parent, 'db') else Database(persistent=True)
+        self.account_names = {}
+        self.filters = {}
+        self.page_keys = [None]     # after-key of each page visited; page 0 starts at the top
+        self.page_number = 0
+        self.last_page = True
+        self.options_worker = None
+        self.page_worker = None
+        self.setup_ui()
+        self.load_options()
+
+    def setup_ui(self):
+        self.setWindowTitle("Ledger")
+        self.setGeometry(300, 0, 1000, self.screen().availableGeometry().height())
+        
+        # Create central widget and main layout
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        
+        layout = QVBoxLayout(central_widget)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(5)
+        
+        # Filters: date range, account, category, categorized state and amount range
+        filter_font = QFont("Verdana", 12)
+        filter_layout = QHBoxLayout()
+        
+        self.start_date_edit = QLineEdit()
+        self.start_date_edit.setPlaceholderText("from YYYY-MM-DD")
+        self.end_date_edit = QLineEdit()
+        self.end_date_edit.setPlaceholderText("to YYYY-MM-DD")
+        self.min_amount_edit = QLineEdit()
+        self.min_amount_edit.setPlaceholderText("min amount")
+        self.max_amount_edit = QLineEdit()
+        self.max_amount_edit.setPlaceholderText("max amount")
+        for amount_edit in (self.min_amount_edit, self.max_amount_edit):
+            amount_edit.setValidator(QDoubleValidator(amount_edit))
+        
+        self.account_combo = QComboBox()
+        self.account_combo.addItem("All Accounts", None)
+        self.category_combo = QComboBox()
+        self.category_combo.addItem("All Categories", None)
+        self.categorized_combo = QComboBox()
+        for label, value in CATEGORIZED_CHOICES:
+            self.categorized_combo.addItem(label, value)
+        
+        for line_edit in (self.start_date_edit, self.end_date_edit, self.min_amount_edit, self.max_amount_edit):
+            line_edit.setFont(filter_font)
+            line_edit.setFixedWidth(130)
+            line_edit.editingFinished.connect(self.apply_filters)
+            filter_layout.addWidget(line_edit)
+        for combo in (self.account_combo, self.category_combo, self.categorized_combo):
+            combo.setFont(filter_font)
+            combo.currentIndexChanged.connect(self.apply_filters)
+            filter_layout.addWidget(combo)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+        
+        # Page navigation
+        nav_layout = QHBoxLayout()
+        self.newer_btn = QPushButton("◀ newer")
+        self.newer_btn.clicked.connect(self.show_newer_page)
+        self.older_btn = QPushButton("older ▶")
+        self.older_btn.clicked.connect(self.show_older_page)
+        self.page_label = QLabel()
+        self.page_label.setFont(filter_font)
+        nav_layout.addWidget(self.newer_btn)
+        nav_layout.addWidget(self.page_label)
+        nav_layout.addWidget(self.older_btn)
+        nav_layout.addStretch()
+        layout.addLayout(nav_layout)
+        
+        # Table view only creates widgets for the rows on screen
+        self.table_view = QTableView()
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.setStyleSheet("alternate-background-color: #f8f8f8; background-color: #ffffff;")
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_view.verticalHeader().hide()
+        header = self.table_view.horizontalHeader()
+        header.setFont(QFont("Verdana", 14, QFont.Weight.Bold))
+        header.setStyleSheet("QHeaderView::section { background-color: #e0e0e0; padding: 8px; border: 1px solid #ccc; }")
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)  # Note column takes the remaining width
+        layout.addWidget(self.table_view)
+        
+        # Add keyboard shortcut for Command-W to close window
+        close_shortcut = QShortcut(QKeySequence.StandardKey.Close, self)
+        close_shortcut.activated.connect(self.close)
+        
+        self.update_navigation()
+
+    def load_options(self):
+        """Load the filter dropdowns on a worker thread, then show the first page"""
+        self.statusBar().showMessage("Loading transactions...")
+        self.options_worker = Worker(load_ledger_options, self.db)
+        self.options_worker.signals.result.connect(self.show_options)
+        self.options_worker.signals.error.connect(self.show_load_error)
+        self.options_worker.start()
+
+    def show_options(self, result):
+        """Fill the account and category dropdowns loaded by load_options"""
+        accounts, categories = result
+        for combo in (self.account_combo, self.category_combo):
+            combo.blockSignals(True)
+        for account_id, account_type, account_name in accounts:
+            name = account_name or account_type
+            self.account_names[account_id] = name
+            self.account_combo.addItem(name, account_id)
+        for cat_id, name in sorted(categories, key=lambda category: category[1]):
+            self.category_combo.addItem(name, cat_id)
+        for combo in (self.account_combo, self.category_combo):
+            combo.blockSignals(False)
+        self.apply_filters()
+
+    def current_filters(self):
+        """Return the filter arguments for fetch_transaction_page, or None if a field is invalid"""
+        filters = {}
+        for key, line_edit in (("start_date", self.start_date_edit), ("end_date", self.end_date_edit)):
+            text = line_edit.text().strip()
+            if text:
+                if not DATE_PATTERN.match(text):
+                    self.statusBar().showMessage(f"Dates must be YYYY-MM-DD: {text}")
+                    return None
+                filters[key] = text
+        for key, line_edit in (("min_amount", self.min_amount_edit), ("max_amount", self.max_amount_edit)):
+            text = line_edit.text().strip()
+            if text:
+                try:
+                    filters[key] = float(text)
+                except ValueError:
+                    self.statusBar().showMessage(f"Not an amount: {text}")
+                    return None
+        for key, combo in (("account_id", self.account_combo), ("category_id", self.category_combo),
+                           ("categorized", self.categorized_combo)):
+            if combo.currentData() is not None:
+                filters[key] = combo.currentData()
+        return filters
+
+    def apply_filters(self):
+        """Start over at the newest page with the current filters"""
+        filters = self.current_filters()
+        if filters is None:
+            return
+        self.filters = filters
+        self.page_keys = [None]
+        self.load_page(0)
+
+    def show_older_page(self):
+        if not self.last_page:
+            self.load_page(self.page_number + 1)
+
+    def show_newer_page(self):
+        if self.page_number > 0:
+            self.load_page(self.page_number - 1)
+
+    def load_page(self, page_number):
+        """Fetch a page on a worker thread; a newer request supersedes the last one"""
+        if self.page_worker is not None:
+            self.page_worker.cancel()
+        self.page_worker = Worker(load_ledger_page, self.db, page_number, self.page_keys[page_number], self.filters)
+        self.page_worker.signals.result.connect(self.show_page)
+        self.page_worker.signals.error.connect(self.show_load_error)
+        self.page_worker.start()
+
+    def show_page(self, result):
+        """Show a page loaded by load_page"""
+        page_number, filters, rows, has_older = result
+        if filters != self.filters:
+            return  # The filters changed while this page was loading
+        if self.statusBar().currentMessage() == "Loading transactions...":
+            self.statusBar().clearMessage()
+        self.page_number = page_number
+        self.last_page = not has_older
+        # Remember where the next page starts
+        del self.page_keys[page_number + 1:]
+        if not self.last_page:
+            self.page_keys.append((rows[-1][1], rows[-1][0]))
+        
+        self.table_view.setModel(LedgerPageModel(rows, self.account_names, self))
+        # Column widths: ID, Date (10 characters), Account, Payee, Amount (8 characters), Category (22 characters)
+        for column, width in enumerate([60, 80, 110, 275, 70, 132]):
+            self.table_view.setColumnWidth(column, width)
+        self.table_view.scrollToTop()
+        self.update_navigation()
+
+    def update_navigation(self):
+        self.newer_btn.setEnabled(self.page_number > 0)
+        self.older_btn.setEnabled(not self.last_page)
+        self.page_label.setText(f"Page {self.page_number + 1}")
+
+    def show_load_error(self, message):
+        """Report a load that failed"""
+        self.statusBar().showMessage(f"Error: {message}")
+
+    def closeEvent(self, event):
+        """Handle window close event"""
+        for worker in (self.options_worker, self.page_worker):
+            if worker is not None:
+                worker.cancel()
+        event.accept()
@@ -1,23 +1,73 @@
 import sys
 import os
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
-                             QHBoxLayout, QLabel, QPushButton, QScrollArea, 
-                             QFrame, QComboBox)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
+                             QHBoxLayout, QLabel, QPushButton, QTreeWidget, 
+                             QTreeWidgetItem, QHeaderView, QFrame, QComboBox, QProgressBar)
+from PyQt6.QtCore import Qt, QThreadPool
+from PyQt6.QtGui import QFont, QColor
 
-# Add the project root to Python path
+# Add the project root and the CLI scripts to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'cli'))
 from src.core.db import Database
+from src.core.reports import render_html
+from src.core.rules import auto_categorize
+from src.core.vendors import resolve_vendors
 from src.gui.categorize_window import CategorizeWindow
+from src.gui.ledger_window import LedgerWindow
+from src.gui.search_window import SearchWindow
+from src.gui.sparkline import Sparkline
+from src.gui.workers import Worker
+from import_files import import_files
+
+
+def load_year_summary(worker, db, year):
+    """Fetch one year's dashboard figures, category tree and monthly series; runs on a worker thread"""
+    monthly = db.get_time_series(f"{year}-01-01", f"{year}-12-31", "month")
+    return year, db.get_year_summary(year), db.get_category_tree(year), monthly
+
+
+def import_and_categorize(worker, db, file_paths):
+    """Import files, then apply the rules and link vendors on the new rows; runs on a worker thread"""
+    progress = {"rows": 0, "files": 0}
+    
+    def on_rows(rows):
+        progress["rows"] = rows
+        worker.report_progress(rows, progress["files"], len(file_paths))
+    
+    def on_file_done(result):
+        progress["files"] += 1
+        worker.report_progress(progress["rows"], progress["files"], len(file_paths))
+    
+    stats = import_files(db, file_paths, on_file_done=on_file_done, progress=on_rows)
+    
+    # Apply the categorization rules to the new rows only
+    stats["categorized"] = 0
+    if stats['previous_max_id'] is not None:
+        rule_stats = auto_categorize(db, after_id=stats['previous_max_id'],
+                                     progress=lambda examined: worker.check_cancelled())
+        stats["categorized"] = rule_stats['categorized']
+    
+    # Link the new rows to vendors for 1099 reporting
+    stats["vendors"] = 0
+    if stats['previous_max_id'] is not None:
+        vendor_stats = resolve_vendors(db, after_id=stats['previous_max_id'],
+                                       progress=lambda examined: worker.check_cancelled())
+        stats["vendors"] = vendor_stats['resolved']
+    return stats
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.db = Database()
+        self.db = Database(persistent=True)
+        self.db.migrate()  # Bring older databases up to the current schema
         self.categorize_window = None
+        self.search_window = None
+        self.ledger_window = None
         self.current_tax_year = 2025  # Current tax year
+        self.totals_worker = None
+        self.import_worker = None
         self.setup_ui()
         self.refresh_totals()
         
@@ -56,7 +106,7 @@ class MainWindow(QMainWindow):
                 border: 1px solid #aaaaaa;
                 border-radius: 8px;
             }
-            QFrame QLabel, QFrame QScrollArea, QFrame QWidget {
+            QFrame QLabel, QFrame QTreeWidget, QFrame QWidget {
                 border: none;
             }
         """)
@@ -131,6 +181,11 @@ class MainWindow(QMainWindow):
         self.profit_loss_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         summary_layout.addWidget(self.profit_loss_label)
         
+        # Net profit or loss per month of the selected year
+        self.net_sparkline = Sparkline()
+        self.net_sparkline.setFixedHeight(50)
+        summary_layout.addWidget(self.net_sparkline)
+        
         # Category breakdown section
         breakdown_title = QLabel("Expenses by Category")
         breakdown_title_font = QFont("Verdana", 16, QFont.Weight.Bold)
@@ -139,23 +194,20 @@ class MainWindow(QMainWindow):
         breakdown_title.setStyleSheet("margin-top: 40px; margin-bottom: 5px;")
         summary_layout.addWidget(breakdown_title)
         
-        # Create scroll area for category breakdown
-        self.breakdown_scroll = QScrollArea()
-        self.breakdown_scroll.setMaximumHeight(250)
-        self.breakdown_scroll.setMinimumHeight(150)
-        self.breakdown_scroll.setWidgetResizable(True)
-        self.breakdown_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.breakdown_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.breakdown_scroll.setStyleSheet("border: none; background-color: transparent; margin-top: 0px;")
-        
-        # Create widget for breakdown content
-        self.breakdown_widget = QWidget()
-        self.breakdown_layout = QVBoxLayout(self.breakdown_widget)
-        self.breakdown_layout.setSpacing(2)
-        self.breakdown_layout.setContentsMargins(5, 5, 5, 5)
-        self.breakdown_scroll.setWidget(self.breakdown_widget)
-        
-        summary_layout.addWidget(self.breakdown_scroll)
+        # Category breakdown; a category with subcategories expands to show them
+        self.breakdown_tree = QTreeWidget()
+        self.breakdown_tree.setColumnCount(2)
+        self.breakdown_tree.setHeaderHidden(True)
+        self.breakdown_tree.setMaximumHeight(250)
+        self.breakdown_tree.setMinimumHeight(150)
+        self.breakdown_tree.setFont(QFont("Verdana", 14))
+        self.breakdown_tree.setStyleSheet("border: none; background-color: transparent; margin-top: 0px; color: #333;")
+        header = self.breakdown_tree.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        
+        summary_layout.addWidget(self.breakdown_tree)
         
         # Add the summary container to the main layout with centering
         container_layout = QHBoxLayout()
@@ -171,10 +223,10 @@ class MainWindow(QMainWindow):
         button_font = QFont("Verdana", 12)
         
         # Import button
-        import_btn = QPushButton("import")
-        import_btn.setFont(button_font)
-        import_btn.setFixedSize(90, 36)
-        import_btn.setStyleSheet("""
+        self.import_btn = QPushButton("import")
+        self.import_btn.setFont(button_font)
+        self.import_btn.setFixedSize(90, 36)
+        self.import_btn.setStyleSheet("""
             QPushButton {
                 background-color: #2196F3;
                 color: white;
@@ -188,13 +240,13 @@ class MainWindow(QMainWindow):
                 background-color: #1565C0;
             }
         """)
-        import_btn.clicked.connect(self.open_import_dialog)
+        self.import_btn.clicked.connect(self.open_import_dialog)
         
         # Categorize button
-        categorize_btn = QPushButton("categorize")
-        categorize_btn.setFont(button_font)
-        categorize_btn.setFixedSize(90, 36)
-        categorize_btn.setStyleSheet("""
+        self.categorize_btn = QPushButton("categorize")
+        self.categorize_btn.setFont(button_font)
+        self.categorize_btn.setFixedSize(90, 36)
+        self.categorize_btn.setStyleSheet("""
             QPushButton {
                 background-color: #4CAF50;
                 color: white;
@@ -208,7 +260,47 @@ class MainWindow(QMainWindow):
                 background-color: #3d8b40;
             }
         """)
-        categorize_btn.clicked.connect(self.open_categorize_window)
+        self.categorize_btn.clicked.connect(self.open_categorize_window)
+        
+        # Ledger button
+        ledger_btn = QPushButton("ledger")
+        ledger_btn.setFont(button_font)
+        ledger_btn.setFixedSize(90, 36)
+        ledger_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #009688;
+                color: white;
+                border: none;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #00897B;
+            }
+            QPushButton:pressed {
+                background-color: #00796B;
+            }
+        """)
+        ledger_btn.clicked.connect(self.open_ledger_window)
+        
+        # Search button
+        search_btn = QPushButton("search")
+        search_btn.setFont(button_font)
+        search_btn.setFixedSize(90, 36)
+        search_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #FF9800;
+                color: white;
+                border: none;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #FB8C00;
+            }
+            QPushButton:pressed {
+                background-color: #EF6C00;
+            }
+        """)
+        search_btn.clicked.connect(self.open_search_window)
         
         # Print button
         print_btn = QPushButton("print")
@@ -233,15 +325,30 @@ class MainWindow(QMainWindow):
         # Center the buttons
         button_layout = QHBoxLayout()
         button_layout.addStretch()
-        button_layout.addWidget(import_btn)
+        button_layout.addWidget(self.import_btn)
+        button_layout.addSpacing(20)  # Space between buttons
+        button_layout.addWidget(self.categorize_btn)
+        button_layout.addSpacing(20)  # Space between buttons
+        button_layout.addWidget(ledger_btn)
         button_layout.addSpacing(20)  # Space between buttons
-        button_layout.addWidget(categorize_btn)
+        button_layout.addWidget(search_btn)
         button_layout.addSpacing(20)  # Space between buttons
         button_layout.addWidget(print_btn)
         button_layout.addStretch()
         
         layout.addLayout(button_layout)
         layout.addStretch()
+        
+        # Import progress lives in the status bar and only shows during an import
+        self.import_progress = QProgressBar()
+        self.import_progress.setFixedWidth(420)
+        self.import_progress.setTextVisible(True)
+        self.import_progress.hide()
+        self.cancel_import_btn = QPushButton("cancel")
+        self.cancel_import_btn.clicked.connect(self.cancel_import)
+        self.cancel_import_btn.hide()
+        self.statusBar().addPermanentWidget(self.import_progress)
+        self.statusBar().addPermanentWidget(self.cancel_import_btn)
     
     def on_year_changed(self):
         """Handle year selection change"""
@@ -252,9 +359,23 @@ class MainWindow(QMainWindow):
         self.refresh_totals()
     
     def refresh_totals(self):
-        """Refresh the revenue, expenses, and profit/loss display"""
-        total_revenue = self.db.get_total_categorized_revenue(self.current_tax_year)
-        total_expenses = self.db.get_total_categorized_expenses(self.current_tax_year)
+        """Reload the revenue, expenses, and profit/loss display in the background"""
+        # Only the newest request matters; a year switch supersedes the last one
+        if self.totals_worker is not None:
+            self.totals_worker.cancel()
+        self.totals_worker = Worker(load_year_summary, self.db, self.current_tax_year)
+        self.totals_worker.signals.result.connect(self.show_totals)
+        self.totals_worker.signals.error.connect(self.show_worker_error)
+        self.totals_worker.start()
+    
+    def show_totals(self, result):
+        """Show a year summary loaded by refresh_totals"""
+        year, summary, category_tree, monthly = result
+        if year != self.current_tax_year:
+            return  # The year changed while this summary was loading
+        
+        total_revenue = summary["revenue"]
+        total_expenses = summary["expenses"]
         profit_loss = total_revenue + total_expenses  # expenses are negative, so we add them
         
         self.revenue_label.setText(f"Revenue: ${total_revenue:,.2f}")
@@ -270,53 +391,51 @@ class MainWindow(QMainWindow):
         
         self.profit_loss_label.setText(profit_loss_text)
         self.profit_loss_label.setStyleSheet(f"color: {profit_loss_color};")
+        self.net_sparkline.set_series(monthly["periods"], monthly["net"])
         
         # Update category breakdown
-        self.refresh_category_breakdown()
+        self.refresh_category_breakdown(category_tree)
     
-    def refresh_category_breakdown(self):
-        """Refresh the category breakdown section"""
-        # Clear existing breakdown
-        for i in reversed(range(self.breakdown_layout.count())): 
-            child = self.breakdown_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
-        # Get expense data by category
-        category_expenses = self.db.get_expense_totals_by_category(self.current_tax_year)
-        
-        if not category_expenses:
-            no_data_label = QLabel("No categorized expenses found")
-            no_data_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_data_label.setStyleSheet("color: #666; font-style: italic; padding: 4px;")
-            self.breakdown_layout.addWidget(no_data_label)
+    def refresh_category_breakdown(self, category_tree):
+        """Refresh the category breakdown with a Database.get_category_tree result"""
+        self.breakdown_tree.clear()
+        
+        if not category_tree:
+            no_data_item = QTreeWidgetItem(["No categorized expenses found", ""])
+            no_data_item.setForeground(0, QColor("#666"))
+            no_data_item.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.breakdown_tree.addTopLevelItem(no_data_item)
             return
         
-        # Create category expense entries
-        category_font = QFont("Verdana", 14)
-        for i, (category_name, total_amount) in enumerate(category_expenses):
-            # Create a container widget for each row
-            row_widget = QWidget()
-            row_layout = QHBoxLayout(row_widget)
-            row_layout.setContentsMargins(0, 2, 0, 2)
-            row_layout.setSpacing(0)  # Remove default spacing
-            
-            # Combined category and amount label
-            combined_text = f"{category_name.title()}: ${abs(total_amount):,.2f}"
-            combined_label = QLabel(combined_text)
-            combined_label.setFont(category_font)
-            combined_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            combined_label.setStyleSheet("color: #333; border: none; background: transparent; font-size: 14px;")
-            
-            # Center the combined label
-            row_layout.addStretch()  # Left stretch to center
-            row_layout.addWidget(combined_label)
-            row_layout.addStretch()  # Right stretch to center
-            
-            self.breakdown_layout.addWidget(row_widget)
-        
-        # Add stretch at the end to push items to the top
-        self.breakdown_layout.addStretch()
+        for node in category_tree:
+            self.breakdown_tree.addTopLevelItem(self.category_item(node))
+    
+    def category_item(self, node):
+        """Tree item for a category showing its subtree total, with one child per subcategory"""
+        item = QTreeWidgetItem([node["name"].title(), f"${abs(node['expenses']):,.2f}"])
+        item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        if node["children"]:
+            # Expenses booked to the parent itself rather than a subcategory
+            if node["own_expenses"]:
+                own_item = QTreeWidgetItem([f"{node['name'].title()} (other)", f"${abs(node['own_expenses']):,.2f}"])
+                own_item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                item.addChild(own_item)
+            for child in node["children"]:
+                item.addChild(self.category_item(child))
+        return item
+    
+    def show_worker_error(self, message):
+        """Report a background job that failed"""
+        self.statusBar().showMessage(f"Error: {message}")
+    
+    def closeEvent(self, event):
+        """Stop background jobs, then close the database connections"""
+        for worker in (self.totals_worker, self.import_worker):
+            if worker is not None:
+                worker.cancel()
+        QThreadPool.globalInstance().waitForDone()
+        self.db.close()
+        event.accept()
     
     def open_categorize_window(self):
         """Open the categorize transactions window"""
@@ -327,69 +446,113 @@ class MainWindow(QMainWindow):
             self.categorize_window.raise_()
             self.categorize_window.activateWindow()
     
+    def open_ledger_window(self):
+        """Open the paged ledger of all transactions"""
+        if self.ledger_window is None or not self.ledger_window.isVisible():
+            self.ledger_window = LedgerWindow(self)
+            self.ledger_window.show()
+        else:
+            self.ledger_window.raise_()
+            self.ledger_window.activateWindow()
+    
+    def open_search_window(self):
+        """Open the transaction search window"""
+        if self.search_window is None or not self.search_window.isVisible():
+            self.search_window = SearchWindow(self)
+            self.search_window.show()
+        else:
+            self.search_window.raise_()
+            self.search_window.activateWindow()
+    
     def open_import_dialog(self):
-        """Open the import file dialog for QIF and CSV files"""
-        from PyQt6.QtWidgets import QFileDialog, QMessageBox
+        """Open the import file dialog for one or more QIF and CSV files"""
+        from PyQt6.QtWidgets import QFileDialog
         import os
         
         # Set default directory to project's data/imports folder
         default_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'imports')
         
-        # Open file dialog to select QIF or CSV file
-        file_path, _ = QFileDialog.getOpenFileName(
+        # Open file dialog to select QIF or CSV files
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self,
-            "Select File to Import",
+            "Select Files to Import",
             default_dir,
             "Financial Files (*.qif *.csv);;QIF Files (*.qif);;CSV Files (*.csv);;All Files (*)"
         )
         
-        if file_path:
-            try:
-                # Determine file type by extension
-                file_ext = os.path.splitext(file_path)[1].lower()
-                
-                import sys
-                import os
-                sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'cli'))
-                
-                if file_ext == '.qif':
-                    # Import QIF file
-                    from import_qif import qif_to_sql
-                    sql_statements = qif_to_sql(file_path)
-                    
-                elif file_ext == '.csv':
-                    # Import CSV file
-                    from import_csv import csv_to_sql
-                    sql_statements = csv_to_sql(file_path)
-                    
-                else:
-                    # Try to detect format by content
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        first_line = f.readline().strip()
-                    
-                    if first_line.startswith('!Type:'):
-                        # QIF format detected
-                        from import_qif import qif_to_sql
-                        sql_statements = qif_to_sql(file_path)
-                    elif ',' in first_line:
-                        # CSV format detected
-                        from import_csv import csv_to_sql
-                        sql_statements = csv_to_sql(file_path)
-                    else:
-                        raise ValueError("Unsupported file format. Please use QIF or CSV files.")
-                
-                # Execute the SQL statements using the database
-                for statement in sql_statements.split('\n'):
-                    if statement.strip():
-                        self.db.execute_sql(statement)
-                
-                # Refresh the totals after import
-                self.refresh_totals()
-                
-                QMessageBox.information(self, "Import Complete", f"Successfully imported transactions from {os.path.basename(file_path)}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Import Error", f"Failed to import file: {str(e)}")
+        if file_paths:
+            # Parse the files in parallel and write them from a pool thread so
+            # the window keeps repainting; this is the only writer meanwhile
+            self.import_btn.setEnabled(False)
+            self.categorize_btn.setEnabled(False)
+            if self.categorize_window is not None:
+                self.categorize_window.set_import_running(True)
+            self.import_progress.setRange(0, len(file_paths))
+            self.import_progress.setValue(0)
+            self.import_progress.setFormat(f"0/{len(file_paths)} files")
+            self.import_progress.show()
+            self.cancel_import_btn.setEnabled(True)
+            self.cancel_import_btn.show()
+            
+            self.import_worker = Worker(import_and_categorize, self.db, file_paths)
+            self.import_worker.signals.progress.connect(self.show_import_progress)
+            self.import_worker.signals.result.connect(self.show_import_result)
+            self.import_worker.signals.error.connect(self.show_import_error)
+            self.import_worker.signals.cancelled.connect(self.show_import_cancelled)
+            self.import_worker.signals.finished.connect(self.finish_import)
+            self.import_worker.start()
+    
+    def show_import_progress(self, progress):
+        """Update the import progress bar with files done and rows/sec"""
+        self.import_progress.setValue(progress["done"])
+        self.import_progress.setFormat(
+            f"{progress['done']}/{progress['total']} files · {progress['rows']:,} rows · "
+            f"{progress['rows_per_sec']:,.0f} rows/sec"
+        )
+    
+    def cancel_import(self):
+        """Ask the running import to stop at its next batch"""
+        if self.import_worker is not None:
+            self.import_worker.cancel()
+            self.cancel_import_btn.setEnabled(False)
+            self.statusBar().showMessage("Cancelling import...")
+    
+    def show_import_result(self, stats):
+        """Report a finished import"""
+        from PyQt6.QtWidgets import QMessageBox
+        import os
+        
+        failures = [f"{os.path.basename(result['file'])}: {result['error']}"
+                    for result in stats['files'] if result['error']]
+        file_count = len(stats['files'])
+        message = (f"Successfully imported {stats['inserted']:,} new transactions from {file_count - len(failures)} of {file_count} files\n"
+                   f"{stats['duplicates']:,} duplicates skipped, {stats['categorized']:,} categorized by rules, "
+                   f"{stats['vendors']:,} linked to vendors\n"
+                   f"({stats['rows_per_sec']:,.0f} rows/sec)")
+        if failures:
+            QMessageBox.warning(self, "Import Incomplete", message + "\n\nFailed:\n" + "\n".join(failures))
+        else:
+            QMessageBox.information(self, "Import Complete", message)
+    
+    def show_import_error(self, message):
+        """Report an import that failed"""
+        from PyQt6.QtWidgets import QMessageBox
+        QMessageBox.critical(self, "Import Error", f"Failed to import files: {message}")
+    
+    def show_import_cancelled(self):
+        """Report a cancelled import"""
+        self.statusBar().showMessage("Import cancelled; files finished before cancelling were kept", 10000)
+    
+    def finish_import(self):
+        """Restore the buttons and refresh the totals after an import"""
+        self.import_worker = None
+        self.import_progress.hide()
+        self.cancel_import_btn.hide()
+        self.import_btn.setEnabled(True)
+        self.categorize_btn.setEnabled(True)
+        if self.categorize_window is not None:
+            self.categorize_window.set_import_running(False)
+        self.refresh_totals()
     
     def open_print_dialog(self):
         """Open the print dialog"""
@@ -489,157 +652,6 @@ class MainWindow(QMainWindow):
     
     def generate_print_content(self):
         """Generate HTML content for printing"""
-        from datetime import datetime
-        
-        # Get the data
-        total_revenue = self.db.get_total_categorized_revenue(self.current_tax_year)
-        total_expenses = self.db.get_total_categorized_expenses(self.current_tax_year)
-        profit_loss = total_revenue + total_expenses
-        category_expenses = self.db.get_expense_totals_by_category(self.current_tax_year)
-        
-        # Generate timestamp
-        timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-        
-        # Create HTML content
-        html_content = f"""
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: 'Times New Roman', 'Times', serif;
-                    font-size: 12pt;
-                    line-height: 1.6;
-                    margin: 40px;
-                    color: black;
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 30px;
-                    border-bottom: 2px solid black;
-                    padding-bottom: 20px;
-                }}
-                .title {{
-                    font-size: 24pt;
-                    font-weight: bold;
-                    margin-bottom: 10px;
-                }}
-                .subtitle {{
-                    font-size: 14pt;
-                    color: #333;
-                    margin-bottom: 5px;
-                }}
-                .timestamp {{
-                    font-size: 10pt;
-                    color: #777;
-                    font-style: italic;
-                }}
-                .summary {{
-                    margin: 30px 0;
-                }}
-                .summary-item {{
-                    margin: 10px 0;
-                    padding: 8px;
-                    border-bottom: 1px dotted #ccc;
-                }}
-                .summary-label {{
-                    font-weight: bold;
-                    display: inline-block;
-                    width: 120px;
-                }}
-                .summary-value {{
-                    font-weight: normal;
-                }}
-                .profit {{
-                    color: black;
-                }}
-                .loss {{
-                    color: red;
-                }}
-                .categories {{
-                    margin-top: 30px;
-                }}
-                .categories-title {{
-                    font-size: 16pt;
-                    font-weight: bold;
-                    margin-bottom: 15px;
-                    text-align: center;
-                    border-bottom: 1px solid black;
-                    padding-bottom: 10px;
-                }}
-                .category-item {{
-                    margin: 8px 0;
-                    padding: 5px;
-                    border-bottom: 1px dotted #ddd;
-                }}
-                .category-name {{
-                    font-weight: bold;
-                    display: inline-block;
-                    width: 200px;
-                }}
-                .category-amount {{
-                    font-weight: normal;
-                }}
-                .no-data {{
-                    font-style: italic;
-                    color: #666;
-                    text-align: center;
-                    margin: 20px 0;
-                }}
-                .footer {{
-                    margin-top: 50px;
-                    border-top: 1px solid #ccc;
-                    padding-top: 20px;
-                    font-size: 10pt;
-                    color: #777;
-                    text-align: center;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <div class="title">Schedule C Prep</div>
-                <div class="subtitle">Tax Year {self.current_tax_year}</div>
-                <div class="timestamp">Generated on {timestamp}</div>
-            </div>
-            
-            <div class="summary">
-                <div class="summary-item">
-                    <span class="summary-label">Revenue:</span>
-                    <span class="summary-value">${total_revenue:,.2f}</span>
-                </div>
-                <div class="summary-item">
-                    <span class="summary-label">Expenses:</span>
-                    <span class="summary-value">${abs(total_expenses):,.2f}</span>
-                </div>
-                <div class="summary-item">
-                    <span class="summary-label">{"Profit:" if profit_loss >= 0 else "Loss:"}</span>
-                    <span class="summary-value {'profit' if profit_loss >= 0 else 'loss'}">${abs(profit_loss):,.2f}</span>
-                </div>
-            </div>
-            
-            <div class="categories">
-                <div class="categories-title">Expenses by Category</div>
-        """
-        
-        if category_expenses:
-            for category_name, total_amount in category_expenses:
-                html_content += f"""
-                <div class="category-item">
-                    <span class="category-name">{category_name.title()}:</span>
-                    <span class="category-amount">${abs(total_amount):,.2f}</span>
-                </div>
-                """
-        else:
-            html_content += '<div class="no-data">No categorized expenses found</div>'
-        
-        html_content += """
-            </div>
-            
-            <div class="footer">
-                Generated by Schedule C Prep Application
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html_content
+        # Get the data (cached since the last dashboard refresh)
+        summary = self.db.get_year_summary(self.current_tax_year)
+        return render_html([(self.current_tax_year, summary)])
@@ -0,0 +1,195 @@
+import sys
+import os
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLineEdit, QComboBox, QTableView, QHeaderView,
+                             QAbstractItemView)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt6.QtGui import QFont, QKeySequence, QShortcut
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.core.db import Database, SEARCH_PAGE_SIZE
+from src.gui.workers import Worker
+
+
+# Pause after the last keystroke before searching, so fast typing runs one query
+SEARCH_DELAY_MS = 150
+
+
+def search_first_page(worker, db, query, year):
+    """Run a search and fetch its first page; runs on a worker thread"""
+    return query, year, db.search_transactions(query, year)
+
+
+class SearchResultModel(QAbstractTableModel):
+    """
+    Table model over the results of one search, newest first. The first page is
+    fetched in the background by SearchWindow; later pages are fetched as the
+    view scrolls, each one continuing after the last id already shown.
+    """
+
+    HEADERS = ["ID", "Date", "Payee", "Amount", "Category", "Note"]
+
+    def __init__(self, db, query, year, rows, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.query = query
+        self.year = year
+        self.rows = list(rows)      # (id, date, payee, amount, category, note) tuples fetched so far
+        self.exhausted = len(self.rows) < SEARCH_PAGE_SIZE
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        batch = self.db.search_transactions(self.query, self.year, before_id=self.rows[-1][0])
+        if len(batch) < SEARCH_PAGE_SIZE:
+            self.exhausted = True
+        if batch:
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(batch) - 1)
+            self.rows.extend(batch)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        txn_id, txn_date, txn_payee, txn_amount, category_name, txn_note = self.rows[index.row()]
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(txn_id)
+            if column == 1:
+                return str(txn_date)
+            if column == 2:
+                return str(txn_payee)
+            if column == 3:
+                return f"{float(txn_amount):.2f}"
+            if column == 4:
+                return category_name or ""
+            if column == 5:
+                return str(txn_note) if txn_note else ""
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if column in (0, 3):
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+
+class SearchWindow(QMainWindow):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Share the main window's connections instead of opening new ones
+        self.db = parent.db if parent is not None and hasattr(parent, 'db') else Database(persistent=True)
+        self.current_tax_year = getattr(parent, 'current_tax_year', None)
+        self.search_worker = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setWindowTitle("Search Transactions")
+        self.setGeometry(400, 0, 860, self.screen().availableGeometry().height())
+        
+        # Create central widget and main layout
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        
+        layout = QVBoxLayout(central_widget)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(5)
+        
+        # Search box and year filter
+        search_layout = QHBoxLayout()
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search payee, address and notes")
+        self.search_box.setFont(QFont("Verdana", 14))
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setStyleSheet("QLineEdit { border: 1px solid #ccc; border-radius: 4px; padding: 6px; }")
+        search_layout.addWidget(self.search_box)
+        
+        self.year_combo = QComboBox()
+        self.year_combo.setFont(QFont("Verdana", 12))
+        self.year_combo.addItem("All Years", None)
+        if self.current_tax_year is not None:
+            self.year_combo.addItem(f"Tax Year {self.current_tax_year}", self.current_tax_year)
+        search_layout.addWidget(self.year_combo)
+        layout.addLayout(search_layout)
+        
+        # Filter as the user types, once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_box.textChanged.connect(self.search_timer.start)
+        self.year_combo.currentIndexChanged.connect(self.run_search)
+        
+        # Table view only creates widgets for the rows on screen
+        self.table_view = QTableView()
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.setStyleSheet("alternate-background-color: #f8f8f8; background-color: #ffffff;")
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_view.verticalHeader().hide()
+        header = self.table_view.horizontalHeader()
+        header.setFont(QFont("Verdana", 14, QFont.Weight.Bold))
+        header.setStyleSheet("QHeaderView::section { background-color: #e0e0e0; padding: 8px; border: 1px solid #ccc; }")
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)  # Note column takes the remaining width
+        layout.addWidget(self.table_view)
+        
+        # Add keyboard shortcut for Command-W to close window
+        close_shortcut = QShortcut(QKeySequence.StandardKey.Close, self)
+        close_shortcut.activated.connect(self.close)
+
+    def run_search(self):
+        """Search for the current text on a worker thread; a newer search supersedes the last one"""
+        self.search_timer.stop()
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+        query = self.search_box.text()
+        self.search_worker = Worker(search_first_page, self.db, query, self.year_combo.currentData())
+        self.search_worker.signals.result.connect(self.show_results)
+        self.search_worker.signals.error.connect(self.show_search_error)
+        self.search_worker.start()
+
+    def show_results(self, result):
+        """Show the first page of results loaded by run_search"""
+        query, year, rows = result
+        # Ignore a search the user has already typed past
+        if query != self.search_box.text() or year != self.year_combo.currentData():
+            return
+        self.table_view.setModel(SearchResultModel(self.db, query, year, rows, self))
+        
+        # Column widths: ID, Date (10 characters), Payee, Amount (8 characters), Category (22 characters)
+        for column, width in enumerate([60, 80, 275, 70, 132]):
+            self.table_view.setColumnWidth(column, width)
+        
+        if not query.strip():
+            self.statusBar().clearMessage()
+        elif not rows:
+            self.statusBar().showMessage("No matching transactions")
+        else:
+            self.statusBar().showMessage(f"Showing matches for '{query}'")
+
+    def show_search_error(self, message):
+        """Report a search that failed"""
+        self.statusBar().showMessage(f"Error: {message}")
+
+    def closeEvent(self, event):
+        """Handle window close event"""
+        self.search_timer.stop()
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+        event.accept()
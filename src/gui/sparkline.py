@@ -0,0 +1,65 @@
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtGui import QPainter, QPen, QColor, QPolygonF
+
+
+class Sparkline(QWidget):
+    """
+    A small line chart of one value per period with a dashed zero line, for
+    trends such as monthly net profit. Points below zero are drawn red.
+    Hovering shows each period's value.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.labels = []
+        self.values = []
+        self.setMinimumHeight(40)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setMouseTracking(True)
+
+    def set_series(self, labels, values):
+        """Show values, one per period label"""
+        self.labels = list(labels)
+        self.values = list(values)
+        self.setToolTip("")
+        self.update()
+
+    def points(self):
+        """Widget coordinates of each value, scaled so zero and every value fit"""
+        margin = 4
+        low = min(self.values + [0])
+        high = max(self.values + [0])
+        span = (high - low) or 1
+        width = self.width() - 2 * margin
+        height = self.height() - 2 * margin
+        step = width / max(len(self.values) - 1, 1)
+        return [QPointF(margin + i * step, margin + (high - value) / span * height)
+                for i, value in enumerate(self.values)], margin + high / span * height
+
+    def paintEvent(self, event):
+        if not self.values:
+            return
+        points, zero_y = self.points()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        painter.setPen(QPen(QColor("#bbb"), 1, Qt.PenStyle.DashLine))
+        painter.drawLine(QPointF(0, zero_y), QPointF(self.width(), zero_y))
+
+        painter.setPen(QPen(QColor("#2196F3"), 2))
+        painter.drawPolyline(QPolygonF(points))
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        for point, value in zip(points, self.values):
+            painter.setBrush(QColor("red") if value < 0 else QColor("#2196F3"))
+            painter.drawEllipse(point, 2.5, 2.5)
+
+    def mouseMoveEvent(self, event):
+        if not self.values:
+            return
+        points, _ = self.points()
+        x = event.position().x()
+        i = min(range(len(points)), key=lambda index: abs(points[index].x() - x))
+        value = self.values[i]
+        self.setToolTip(f"{self.labels[i]}: {'-' if value < 0 else ''}${abs(value):,.2f}")
@@ -0,0 +1,93 @@
+"""
+Background jobs for the GUI.
+
+Database work runs on QThreadPool threads so the event loop keeps painting.
+Each Worker reports back through queued signals, which Qt delivers on the
+GUI thread, so slots can update widgets directly. Database(persistent=True)
+gives every pool thread its own connection.
+"""
+import time
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class WorkerCancelled(BaseException):
+    """
+    Raised inside a job when its worker has been cancelled. Like
+    KeyboardInterrupt it is not an Exception, so it passes through the
+    per-file error handling in the importers and rolls back the open
+    transaction on its way out.
+    """
+
+
+class WorkerSignals(QObject):
+    # dict with rows, rows_per_sec, and optionally done and total steps
+    progress = pyqtSignal(object)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """
+    Run fn(worker, *args, **kwargs) on a pool thread.
+
+    Long jobs call worker.report_progress() between batches; that is also
+    where a cancelled job stops, by raising WorkerCancelled. A cancelled job
+    never emits result, even if it ran to the end.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.is_cancelled = False
+        self.started_at = None
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def check_cancelled(self):
+        if self.is_cancelled:
+            raise WorkerCancelled()
+
+    def report_progress(self, rows, done=None, total=None):
+        """Emit progress with the rows/sec since the job started, or stop if cancelled"""
+        self.check_cancelled()
+        elapsed = time.perf_counter() - self.started_at
+        self.signals.progress.emit({
+            "rows": rows,
+            "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0,
+            "done": done,
+            "total": total,
+        })
+
+    def start(self, pool=None):
+        """Queue the job on pool, the global thread pool by default"""
+        (pool or QThreadPool.globalInstance()).start(self)
+        return self
+
+    def run(self):
+        self.started_at = time.perf_counter()
+        try:
+            self.check_cancelled()
+            result = self.fn(self, *self.args, **self.kwargs)
+        except WorkerCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            if self.is_cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.error.emit(str(e))
+        else:
+            if self.is_cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Add the project root and the scripts directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from src.core.db import Database
+from setup_database import setup_database
+
+
+@pytest.fixture
+def new_db(tmp_path):
+    """An empty database from the current schema with one account, id 1"""
+    db_path = str(tmp_path / "tax_prep.db")
+    setup_database(db_path)
+    db = Database(db_path, persistent=True)
+    db.execute_sql("INSERT INTO accounts (account_type, account_name) VALUES ('checking', 'Checking')")
+    yield db
+    db.close()
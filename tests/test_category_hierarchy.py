@@ -0,0 +1,113 @@
+"""
+category_closure, kept by triggers, matches rebuild_category_closure as
+categories are added, moved and deleted, and get_category_tree rolls expenses
+up the hierarchy it describes.
+"""
+import random
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def db(new_db):
+    """office > (supplies > paper, software), travel > meals, and income"""
+    ids = {"income": new_db.add_category("income"), "office": new_db.add_category("office")}
+    ids["supplies"] = new_db.add_category("supplies", ids["office"])
+    ids["paper"] = new_db.add_category("paper", ids["supplies"])
+    ids["software"] = new_db.add_category("software", ids["office"])
+    ids["travel"] = new_db.add_category("travel")
+    ids["meals"] = new_db.add_category("meals", ids["travel"])
+    new_db.ids = ids
+    return new_db
+
+
+def closure(db):
+    with db.transaction() as conn:
+        return conn.execute("SELECT * FROM category_closure ORDER BY ancestor_id, descendant_id").fetchall()
+
+
+def assert_matches_rebuild(db):
+    expected = closure(db)
+    db.rebuild_category_closure()
+    assert closure(db) == expected
+
+
+def ancestors(db, category_id):
+    with db.transaction() as conn:
+        return [row[0] for row in conn.execute(
+            "SELECT ancestor_id FROM category_closure WHERE descendant_id = ? ORDER BY depth", (category_id,))]
+
+
+def test_adding_categories(db):
+    ids = db.ids
+    assert ancestors(db, ids["paper"]) == [ids["paper"], ids["supplies"], ids["office"]]
+    assert_matches_rebuild(db)
+
+
+def test_moving_a_subtree(db):
+    ids = db.ids
+    db.set_category_parent(ids["supplies"], ids["travel"])
+    assert ancestors(db, ids["paper"]) == [ids["paper"], ids["supplies"], ids["travel"]]
+    assert_matches_rebuild(db)
+    db.set_category_parent(ids["supplies"], None)
+    assert ancestors(db, ids["paper"]) == [ids["paper"], ids["supplies"]]
+    assert_matches_rebuild(db)
+
+
+def test_moving_under_own_subcategory_is_rejected(db):
+    ids = db.ids
+    before = closure(db)
+    with pytest.raises(sqlite3.IntegrityError):
+        db.set_category_parent(ids["office"], ids["paper"])
+    with pytest.raises(sqlite3.IntegrityError):
+        db.set_category_parent(ids["office"], ids["office"])
+    assert closure(db) == before
+
+
+def test_deleting_a_category_moves_its_children_up(db):
+    ids = db.ids
+    db.execute_sql(f"DELETE FROM categories WHERE id = {ids['supplies']}")
+    assert ancestors(db, ids["paper"]) == [ids["paper"], ids["office"]]
+    assert dict((row[0], row[2]) for row in db.fetch_category_hierarchy())[ids["paper"]] == ids["office"]
+    assert_matches_rebuild(db)
+
+
+def test_random_moves_match_rebuild(db):
+    rng = random.Random(24)
+    category_ids = list(db.ids.values())
+    for i in range(40):
+        category_ids.append(db.add_category(f"extra {i}", rng.choice(category_ids + [None])))
+    for _ in range(200):
+        try:
+            db.set_category_parent(rng.choice(category_ids), rng.choice(category_ids + [None]))
+        except sqlite3.IntegrityError:
+            pass
+    assert_matches_rebuild(db)
+
+
+def test_category_tree_rolls_expenses_up(db):
+    ids = db.ids
+    db.bulk_insert_transactions([
+        (1, "2025-01-02", None, "Paper Co", None, -10.00, None, None),
+        (1, "2025-01-03", None, "Stationer", None, -5.00, None, None),
+        (1, "2025-01-04", None, "SaaS", None, -20.00, None, None),
+        (1, "2025-01-05", None, "Diner", None, -7.00, None, None),
+        (1, "2025-01-06", None, "Client", None, 500.00, None, None),
+        (1, "2024-12-30", None, "Paper Co", None, -99.00, None, None),
+    ])
+    db.save_categorizations({1: ids["paper"], 2: ids["supplies"], 3: ids["software"], 4: ids["meals"],
+                             5: ids["income"], 6: ids["paper"]}, {})
+
+    tree = {node["name"]: node for node in db.get_category_tree(2025)}
+    assert set(tree) == {"office", "travel"}
+    assert tree["office"]["expenses"] == -35.00
+    assert tree["office"]["own_expenses"] == 0
+    supplies = next(node for node in tree["office"]["children"] if node["name"] == "supplies")
+    assert (supplies["own_expenses"], supplies["expenses"]) == (-5.00, -15.00)
+    assert tree["travel"]["expenses"] == -7.00
+    assert dict(db.get_expense_totals_by_category(2025, rollup=True)) == {"office": -35.00, "travel": -7.00}
+
+    db.set_category_parent(ids["supplies"], ids["travel"])
+    assert dict(db.get_expense_totals_by_category(2025, rollup=True)) == {"office": -20.00, "travel": -22.00}
+    assert dict(db.get_expense_totals_by_category(None, rollup=True)) == {"office": -20.00, "travel": -121.00}
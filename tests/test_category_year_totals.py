@@ -0,0 +1,74 @@
+"""
+category_year_totals, kept by triggers, matches rebuild_category_year_totals
+after every kind of write to transactions and their categories.
+"""
+import random
+
+import pytest
+
+
+@pytest.fixture
+def db(new_db):
+    """A database with categories and uncategorized transactions over three years"""
+    for name in ("income", "office expense", "travel", "meals"):
+        new_db.add_category(name)
+    rng = random.Random(14)
+    new_db.bulk_insert_transactions(
+        (1, f"{rng.choice((2023, 2024, 2025))}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+         None, f"payee {i}", None, round(rng.uniform(-500, 500), 2), None, None)
+        for i in range(200)
+    )
+    return new_db
+
+
+def category_totals(db):
+    with db.transaction() as conn:
+        return conn.execute("SELECT * FROM category_year_totals ORDER BY tax_year, category_id").fetchall()
+
+
+def assert_matches_rebuild(db):
+    """The trigger-maintained totals and the summaries read from them survive a rebuild unchanged"""
+    totals = category_totals(db)
+    summaries = {year: db.get_year_summary(year) for year in (None, 2023, 2024, 2025)}
+    db.rebuild_category_year_totals()
+    assert category_totals(db) == totals
+    assert {year: db.get_year_summary(year) for year in summaries} == summaries
+
+
+def test_categorizing_and_recategorizing(db):
+    category_ids = [category_id for category_id, _ in db.fetch_categories()]
+    rng = random.Random(5)
+    db.save_categorizations({txn_id: rng.choice(category_ids) for txn_id in range(1, 151)}, {})
+    assert_matches_rebuild(db)
+    db.save_categorizations({txn_id: rng.choice(category_ids + [None]) for txn_id in range(100, 201)}, {})
+    assert_matches_rebuild(db)
+    for txn_id in range(1, 20):
+        db.update_transaction_category(txn_id, rng.choice(category_ids + [None]))
+    assert_matches_rebuild(db)
+
+
+def test_editing_and_deleting_categorized_transactions(db):
+    category_ids = [category_id for category_id, _ in db.fetch_categories()]
+    db.save_categorizations({txn_id: category_ids[txn_id % len(category_ids)] for txn_id in range(1, 201)}, {})
+    db.execute_sql("UPDATE transactions SET amount = -amount WHERE id % 7 = 0")
+    assert_matches_rebuild(db)
+    db.execute_sql("UPDATE transactions SET transaction_date = '2022-06-30' WHERE id % 5 = 0")
+    assert_matches_rebuild(db)
+    db.execute_sql("UPDATE transactions SET tax_year = NULL WHERE id % 11 = 0")
+    assert_matches_rebuild(db)
+    db.execute_sql("DELETE FROM transactions WHERE id % 3 = 0")
+    assert_matches_rebuild(db)
+    db.execute_sql(f"UPDATE transaction_categories SET category_id = {category_ids[0]} WHERE transaction_id % 4 = 0")
+    assert_matches_rebuild(db)
+
+
+def test_transactions_inserted_outside_bulk_imports(db):
+    db.execute_sql("INSERT INTO transactions (account_id, transaction_date, payee_description, amount) "
+                   "VALUES (1, '2025-03-04', 'manual', -25.00)")
+    db.execute_sql("INSERT INTO transactions (account_id, transaction_date, payee_description, amount) "
+                   "VALUES (1, '3/4/25', 'odd date', -30.00)")
+    category_id = db.fetch_categories()[1][0]
+    db.save_categorizations({201: category_id, 202: category_id}, {})
+    assert_matches_rebuild(db)
+    with db.transaction() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM category_year_totals WHERE tax_year = 0").fetchone()[0] == 1
@@ -0,0 +1,52 @@
+"""
+Bulk imports skip transactions that are already in the database, matched by
+fingerprint, without dropping genuine repeats of the same transaction.
+"""
+from src.core.db import fingerprint_rows
+
+
+def row(date, payee, amount):
+    return (1, date, None, payee, None, amount, None, None)
+
+
+COFFEE = row("2024-01-02", "Coffee", -5.00)
+LUNCH = row("2024-01-03", "Lunch", -12.50)
+RENT = row("2024-02-01", "Rent", -900.00)
+
+
+def count_transactions(db):
+    with db.transaction() as conn:
+        return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+
+def test_unsorted_file_keeps_identical_rows_apart(new_db):
+    result = new_db.bulk_insert_transactions([COFFEE, LUNCH, COFFEE])
+    assert (result["inserted"], result["duplicates"]) == (3, 0)
+    assert count_transactions(new_db) == 3
+
+
+def test_identical_rows_get_distinct_fingerprints_in_any_order():
+    in_date_order = [row[-1] for row in fingerprint_rows([COFFEE, COFFEE, LUNCH])]
+    unsorted = [row[-1] for row in fingerprint_rows([COFFEE, LUNCH, COFFEE])]
+    assert len(set(unsorted)) == 3
+    assert sorted(in_date_order) == sorted(unsorted)
+
+
+def test_reimport_in_another_order_skips_everything(new_db):
+    new_db.bulk_insert_transactions([COFFEE, LUNCH, COFFEE, RENT])
+    result = new_db.bulk_insert_transactions([RENT, COFFEE, COFFEE, LUNCH])
+    assert (result["rows"], result["inserted"], result["duplicates"]) == (4, 0, 4)
+    assert count_transactions(new_db) == 4
+
+
+def test_overlapping_export_adds_only_new_rows(new_db):
+    new_db.bulk_insert_transactions([COFFEE, LUNCH])
+    result = new_db.bulk_insert_transactions([LUNCH, COFFEE, COFFEE, RENT])
+    assert (result["inserted"], result["duplicates"]) == (2, 2)
+    assert count_transactions(new_db) == 4
+
+
+def test_fingerprinted_rows_are_inserted_as_given(new_db):
+    rows = list(fingerprint_rows([COFFEE, LUNCH, COFFEE]))
+    assert new_db.bulk_insert_transactions(rows, fingerprinted=True)["inserted"] == 3
+    assert new_db.bulk_insert_transactions(iter(rows), fingerprinted=True)["duplicates"] == 3
@@ -0,0 +1,69 @@
+"""
+import_files gives the same transactions whether files are parsed in a
+process pool, through staging files, or streamed in this process.
+"""
+from setup_database import setup_database
+from src.cli.import_files import file_to_rows, import_files, parse_file, staged_rows
+from src.core.db import Database, fingerprint_rows
+
+CSV = (
+    "Posted Date,Reference Number,Payee,Address,Amount\n"
+    "07/18/2025,1001,Coffee Shop,1 Main St,-4.50\n"
+    "07/19/2025,,Client Payment,,\"$1,200.00\"\n"
+    "07/18/2025,1001,Coffee Shop,1 Main St,-4.50\n"
+)
+
+QIF = (
+    "!Type:Bank\n"
+    "D07/20'25\nT-25.00\nPHardware\n^\n"
+    "D07/21'25\nT-9.99\nPSoftware\n^\n"
+)
+
+
+def write_files(tmp_path):
+    paths = []
+    for name, text in (("a.csv", CSV), ("b.qif", QIF), ("c.csv", CSV.replace("2025", "2024"))):
+        path = tmp_path / name
+        path.write_text(text)
+        paths.append(str(path))
+    return paths
+
+
+def transactions(db):
+    with db.transaction() as conn:
+        return sorted(conn.execute(
+            "SELECT account_id, transaction_date, reference_number, payee_description, amount, fingerprint "
+            "FROM transactions").fetchall())
+
+
+def test_staged_rows_round_trip(tmp_path):
+    path = write_files(tmp_path)[0]
+    staging_path = str(tmp_path / "staged.db")
+    count, _ = parse_file(path, staging_path, 1)
+    expected = list(fingerprint_rows(file_to_rows(path, 1)))
+    assert count == len(expected) == 3
+    assert list(staged_rows(staging_path)) == expected
+
+
+def test_pool_matches_single_process(tmp_path, new_db):
+    paths = write_files(tmp_path)
+    result = import_files(new_db, paths, workers=3)
+    assert [f["error"] for f in result["files"]] == [None, None, None]
+    assert (result["rows"], result["inserted"], result["duplicates"]) == (8, 8, 0)
+
+    single_path = str(tmp_path / "single.db")
+    setup_database(single_path)
+    single = Database(single_path, persistent=True)
+    try:
+        single.execute_sql("INSERT INTO accounts (account_type, account_name) VALUES ('checking', 'Checking')")
+        import_files(single, paths, workers=1)
+        assert transactions(single) == transactions(new_db)
+    finally:
+        single.close()
+
+
+def test_pool_reimport_skips_everything(tmp_path, new_db):
+    paths = write_files(tmp_path)
+    import_files(new_db, paths, workers=3)
+    result = import_files(new_db, reversed(paths), workers=3)
+    assert (result["rows"], result["inserted"], result["duplicates"]) == (8, 0, 8)
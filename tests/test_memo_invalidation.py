@@ -0,0 +1,51 @@
+"""
+A summary, category tree or time series read before an invalidation is
+returned but not memoized, so a write committed by another thread while the
+read was running is not hidden behind a stale result.
+"""
+import pytest
+
+from src.core import db as db_module
+
+
+@pytest.fixture
+def db(new_db):
+    """One categorized expense in 2024"""
+    office = new_db.add_category("office expense")
+    new_db.bulk_insert_transactions([(1, "2024-02-10", None, "Paper", None, -40.00, None, None)])
+    new_db.save_categorizations({1: office}, {})
+    return new_db
+
+
+def invalidate_during(monkeypatch, db, name):
+    """Make the module function name run as if another thread committed a write just before it"""
+    original = getattr(db_module, name)
+
+    def wrapper(*args, **kwargs):
+        db.invalidate_year_summaries([2024])
+        return original(*args, **kwargs)
+    monkeypatch.setattr(db_module, name, wrapper)
+
+
+@pytest.mark.parametrize("read, builder, memo", [
+    (lambda db: db.get_year_summary(2024), "summarize_category_totals", "_year_summaries"),
+    (lambda db: db.get_year_summaries([2024]), "summarize_category_totals", "_year_summaries"),
+    (lambda db: db.get_category_tree(2024), "nest_category_rollups", "_category_trees"),
+    (lambda db: db.get_time_series("2024-01-01", "2024-12-31"), "build_time_series", "_time_series"),
+])
+def test_result_read_across_an_invalidation_is_not_memoized(monkeypatch, db, read, builder, memo):
+    invalidate_during(monkeypatch, db, builder)
+    first = read(db)
+    assert not getattr(db, memo)
+    monkeypatch.undo()
+    assert read(db) == first
+    assert getattr(db, memo)
+
+
+def test_result_read_without_an_invalidation_is_memoized(db):
+    summary = db.get_year_summary(2024)
+    assert db.get_year_summary(2024) is summary
+    db.invalidate_year_summaries([2023])
+    assert db.get_year_summary(2024) is summary
+    db.invalidate_year_summaries([2024])
+    assert db.get_year_summary(2024) is not summary
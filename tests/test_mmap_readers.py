@@ -0,0 +1,106 @@
+"""
+The memory-mapped readers yield exactly the rows of the streaming readers,
+including when records straddle chunk boundaries.
+"""
+import random
+from functools import partial
+
+import pytest
+
+from src.cli import import_csv, import_qif
+from src.core import mapped_file
+
+CHUNK_SIZES = [1, 7, 64, mapped_file.MMAP_CHUNK_SIZE]
+
+CSV_FILES = {
+    "header": (
+        "Posted Date,Reference Number,Payee,Address,Amount\n"
+        "07/18/2025,1001,Coffee Shop,1 Main St,-4.50\n"
+        "07/19/2025,,Client Payment,,\"$1,200.00\"\n"
+        "07/20/2025,1003,Hardware,,(25.00)\n"
+    ),
+    "no header, CRLF": (
+        "2025-01-02,1,Rent,\"Suite 5\r\nSpringfield\",-900\r\n"
+        "2025-01-03,2,Power,,-80.12\r\n"
+    ),
+    "semicolon, short and blank rows": (
+        "date;reference;payee;address;amount\n"
+        "01/02/24;7;Lunch;;-12.50\n"
+        "\n"
+        "01/03/24;8;too short\n"
+        "01/04/24;9;\"Quote; inside\";;-3\n"
+    ),
+    "quoted multi-line fields": (
+        "Date,Ref,Payee,Address,Amount\n"
+        "03/04/2025,11,\"Acme \"\"Plumbing\"\"\",\"line one\nline two\nline three\",-300\n"
+        "03/05/2025,12,Plain,,-1\n"
+        "03/06/2025,13,\"Multi\nline payee\",,-2\n"
+    ),
+}
+
+QIF_FILES = {
+    "bank and card": (
+        "!Type:Bank\n"
+        "D07/18'25\nT-4.50\nN1001\nPCoffee Shop\nA1 Main St\nASpringfield\n^\n"
+        "D7/19/2025\nT1,200.00\nPClient Payment\n^\n"
+        "!Type:CCard\n"
+        "D07-20-2025\nT-25.00\nPHardware\nMReceipt lost\n^\n"
+    ),
+    "skipped types, CRLF and blank lines": (
+        "!Type:Invst\r\nD01/02'24\r\nT-1\r\n^\r\n"
+        "!Type:Bank\r\n\r\nD01/03'24\r\nT-2\r\nPLunch\r\n^\r\n"
+        "D13/45'24\r\nT-3\r\n^\r\n"
+        "^\r\n"
+    ),
+}
+
+
+def synthetic_csv(rng):
+    lines = ["Posted Date,Reference Number,Payee,Address,Amount"]
+    for i in range(300):
+        payee = rng.choice(["Coffee", "\"Smith, Jones\"", "\"Two\nlines\"", "Rent"])
+        lines.append(f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2024,{i},{payee},,{rng.uniform(-500, 500):.2f}")
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_qif(rng):
+    entries = ["!Type:Bank"]
+    for i in range(300):
+        entries.append(f"D{rng.randint(1, 12)}/{rng.randint(1, 28)}'24\nT{rng.uniform(-500, 500):,.2f}\nN{i}\n"
+                       f"P{rng.choice(['Coffee', 'Rent', 'Smith & Jones'])}\nA{i} Main St\n^")
+    return "\n".join(entries) + "\n"
+
+
+CSV_FILES["synthetic"] = synthetic_csv(random.Random(19))
+QIF_FILES["synthetic"] = synthetic_qif(random.Random(19))
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("name", CSV_FILES)
+def test_csv_mmap_reader_matches_streaming_reader(tmp_path, monkeypatch, name, chunk_size):
+    monkeypatch.setattr(import_csv, "iter_text_chunks", partial(mapped_file.iter_text_chunks, chunk_size=chunk_size))
+    path = write(tmp_path, "export.csv", CSV_FILES[name])
+    expected = list(import_csv.csv_to_rows(path, account_id=3))
+    assert expected
+    assert list(import_csv.csv_to_rows_mmap(path, account_id=3)) == expected
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("name", QIF_FILES)
+def test_qif_mmap_reader_matches_streaming_reader(tmp_path, monkeypatch, name, chunk_size):
+    monkeypatch.setattr(import_qif, "iter_text_chunks", partial(mapped_file.iter_text_chunks, chunk_size=chunk_size))
+    path = write(tmp_path, "export.qif", QIF_FILES[name])
+    expected = list(import_qif.qif_to_rows(path))
+    assert expected
+    assert list(import_qif.qif_to_rows_mmap(path)) == expected
+
+
+def test_empty_files_yield_no_rows(tmp_path):
+    assert list(import_qif.qif_to_rows_mmap(write(tmp_path, "empty.qif", ""))) == []
+    assert list(import_csv.csv_to_rows_mmap(write(tmp_path, "empty.csv", ""))) == []
@@ -0,0 +1,77 @@
+"""
+EXPLAIN QUERY PLAN checks that the year- and date-scoped queries search their
+indexes instead of scanning the transactions table.
+
+The plans are taken for the statements Database actually runs, captured with
+a trace callback, so a rewritten query that loses its index fails here.
+"""
+import pytest
+
+
+@pytest.fixture
+def db(new_db):
+    """A database with a few transactions over two years"""
+    db = new_db
+    db.bulk_insert_transactions([
+        (1, "2023-11-02", None, "Office Depot", None, -42.10, None, None),
+        (1, "2024-01-15", None, "Client payment", None, 1200.00, None, None),
+        (1, "2024-02-03", None, "Office Depot", None, -18.75, None, None),
+    ])
+    category_id = db.add_category("office expense")
+    db.save_categorizations({1: category_id, 3: category_id}, {})
+    return db
+
+
+def query_plan(conn, sql):
+    """The detail column of EXPLAIN QUERY PLAN for sql"""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def plans_of(db, call, *args):
+    """Query plans of the SELECT statements run by a Database method, as one list"""
+    conn = db.connect()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call(*args)
+    finally:
+        conn.set_trace_callback(None)
+    plans = [query_plan(conn, sql) for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+    assert plans, f"{call.__name__} ran no SELECT"
+    return [detail for plan in plans for detail in plan]
+
+
+def assert_no_scan(plan, alias):
+    scans = [detail for detail in plan if detail.startswith(f"SCAN {alias}")]
+    assert not scans, f"full scan of {alias}: {plan}"
+
+
+def test_year_summary_searches_category_totals_by_year(db):
+    plan = plans_of(db, db.get_year_summary, 2024)
+    assert "SEARCH s USING PRIMARY KEY (tax_year=?)" in plan
+    assert_no_scan(plan, "s")
+
+
+def test_count_uncategorized_searches_tax_year(db):
+    plan = plans_of(db, db.count_uncategorized, 2024)
+    assert "SEARCH t USING COVERING INDEX idx_transactions_tax_year (tax_year=?)" in plan
+    assert_no_scan(plan, "t")
+
+
+@pytest.mark.parametrize("grain", ["month", "quarter"])
+def test_time_series_searches_date_range(db, grain):
+    plan = plans_of(db, db.get_time_series, "2024-01-01", "2024-12-31", grain)
+    assert "SEARCH t USING INDEX idx_transactions_date (transaction_date>? AND transaction_date<?)" in plan
+    assert_no_scan(plan, "t")
+
+
+def test_ledger_page_searches_date_range(db):
+    plan = plans_of(db, lambda: db.fetch_transaction_page(start_date="2024-01-01", end_date="2024-03-31"))
+    assert "SEARCH t USING INDEX idx_transactions_date (transaction_date>? AND transaction_date<?)" in plan
+    assert_no_scan(plan, "t")
+
+
+def test_1099_threshold_searches_year_totals(db):
+    plan = plans_of(db, db.fetch_1099_totals, 2024, 60000)
+    assert "SEARCH s USING INDEX idx_vendor_1099_totals_year_total (tax_year=? AND total_cents>?)" in plan
+    assert_no_scan(plan, "s")
@@ -0,0 +1,88 @@
+"""
+RuleMatcher picks the same rule as checking every rule in priority order,
+and auto_categorize writes what it picks.
+"""
+import random
+import re
+
+from src.core.rules import Rule, RuleMatcher, auto_categorize, normalize_payee
+
+WORDS = ["acme", "amazon", "web", "services", "coffee", "shop", "aa", "a", "uber", "eats", "#1042", "st."]
+
+REGEXES = [r"^acme", r"(?i)amazon\s+web", r"(A)\1", r"\d{4}", r"shop$", r"uber (eats)?", r"^$"]
+
+
+def reference_match(rules, payee, amount):
+    """The category of the first rule, in priority order, that matches payee and accepts amount"""
+    payee = normalize_payee(payee)
+    for rule in sorted(rules, key=Rule.sort_key):
+        pattern = normalize_payee(rule.pattern)
+        if rule.match_type == "exact":
+            matched = bool(pattern) and payee == pattern
+        elif rule.match_type == "prefix":
+            matched = bool(pattern) and payee.startswith(pattern)
+        elif rule.match_type == "substring":
+            matched = bool(pattern) and pattern in payee
+        else:
+            matched = re.search(rule.pattern, payee, re.IGNORECASE) is not None
+        if matched and rule.accepts_amount(amount):
+            return rule.category_id
+    return None
+
+
+def random_rules(rng, count):
+    rules = []
+    for rule_id in range(1, count + 1):
+        match_type = rng.choice(["exact", "prefix", "substring", "regex"])
+        if match_type == "regex":
+            pattern = rng.choice(REGEXES)
+        else:
+            pattern = " ".join(rng.sample(WORDS, rng.randint(1, 2)))
+        low = rng.choice([None, -100, 0])
+        high = rng.choice([None, 0, 100])
+        rules.append(Rule(rule_id, match_type, pattern, rng.randint(1, 20), low, high, rng.choice([None, 1, 50, 100])))
+    return rules
+
+
+def random_payee(rng):
+    return rng.choice(["", " ", "-"]) + " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 4)))
+
+
+def test_matcher_agrees_with_per_rule_loop():
+    rng = random.Random(9)
+    for _ in range(50):
+        rules = random_rules(rng, rng.randint(1, 40))
+        matcher = RuleMatcher(rules)
+        for _ in range(200):
+            payee = random_payee(rng)
+            amount = rng.choice([-500, -100, -5, 0, 5, 100, 500])
+            assert matcher.match(payee, amount) == reference_match(rules, payee, amount), (payee, amount)
+
+
+def test_lower_priority_regex_rule_is_tried_when_the_first_rejects_the_amount():
+    rules = [Rule(1, "regex", r"^coffee", 10, None, -50, 1), Rule(2, "regex", r"shop", 20, None, None, 2)]
+    assert RuleMatcher(rules).match("Coffee Shop", -4.50) == 20
+    assert RuleMatcher(rules).match("Coffee Shop", -75) == 10
+
+
+def test_auto_categorize_writes_the_matched_categories(new_db):
+    db = new_db
+    category_ids = [db.add_category(f"category {i}") for i in range(5)]
+    rng = random.Random(90)
+    for rule in random_rules(rng, 30):
+        db.add_rule(rule.match_type, rule.pattern, rng.choice(category_ids),
+                    rule.min_amount, rule.max_amount, rule.priority or 100)
+    rows = [(1, "2025-02-03", None, random_payee(rng), None, rng.choice([-500, -5, 5, 500]), None, None)
+            for _ in range(300)]
+    result = db.bulk_insert_transactions(rows)
+    rules = [Rule(*row) for row in db.fetch_rules()]
+
+    summary = auto_categorize(db, after_id=result["previous_max_id"], batch_size=64)
+
+    with db.transaction() as conn:
+        written = dict(conn.execute("SELECT transaction_id, category_id FROM transaction_categories"))
+        transactions = conn.execute("SELECT id, payee_description, amount FROM transactions").fetchall()
+    expected = {txn_id: reference_match(rules, payee, amount) for txn_id, payee, amount in transactions}
+    expected = {txn_id: category_id for txn_id, category_id in expected.items() if category_id is not None}
+    assert written == expected
+    assert (summary["examined"], summary["categorized"]) == (len(transactions), len(expected))
@@ -0,0 +1,94 @@
+"""
+get_time_series: period bounds for open ranges, rows with non-ISO dates,
+agreement with get_year_summary, invalidation of the memoized series and
+rejection of bounds that are not YYYY-MM-DD.
+"""
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture
+def db(new_db):
+    """Categorized income and expenses in 2023 and 2024, with a gap and a non-ISO date"""
+    db = new_db
+    income = db.add_category("income")
+    office = db.add_category("office expense")
+    db.bulk_insert_transactions([
+        (1, "2023-11-15", None, "Client", None, 1000.00, None, None),
+        (1, "2023-11-20", None, "Paper", None, -40.00, None, None),
+        (1, "2024-02-03", None, "Client", None, 250.00, None, None),
+        (1, "2024-02-10", None, "Software", None, -60.00, None, None),
+        (1, "7/18/25", None, "Odd date", None, -5.00, None, None),
+        (1, "2024-03-01", None, "Uncategorized", None, -999.00, None, None),
+    ])
+    db.save_categorizations({1: income, 2: office, 3: income, 4: office, 5: office}, {})
+    return db
+
+
+def test_open_range_spans_the_first_to_the_last_valid_date(db):
+    series = db.get_time_series(grain="month")
+    assert series["periods"] == ["2023-11", "2023-12", "2024-01", "2024-02"]
+    assert series["revenue"] == [1000.00, 0, 0, 250.00]
+    assert series["expenses"] == [-40.00, 0, 0, -60.00]
+    assert series["net"] == [960.00, 0, 0, 190.00]
+
+
+def test_half_open_ranges(db):
+    assert db.get_time_series(start_date="2023-10-01", grain="quarter")["periods"] == \
+        ["2023-Q4", "2024-Q1"]
+    assert db.get_time_series(end_date="2024-06-30", grain="quarter")["periods"] == \
+        ["2023-Q4", "2024-Q1", "2024-Q2"]
+    assert db.get_time_series(start_date="2024-01-01", grain="month")["periods"] == ["2024-01", "2024-02"]
+
+
+def test_only_non_iso_dates_give_no_periods(db):
+    db.execute_sql("DELETE FROM transactions WHERE transaction_date LIKE '20%'")
+    for grain in ("month", "quarter"):
+        series = db.get_time_series(grain=grain)
+        assert series["periods"] == []
+        assert series["revenue"] == []
+
+
+def test_breakdowns_line_up_with_the_totals(db):
+    series = db.get_time_series("2023-01-01", "2024-12-31", "quarter")
+    assert len(series["periods"]) == 8
+    for breakdown in ("categories", "accounts"):
+        for field in ("revenue", "expenses"):
+            assert [round(sum(values), 2) for values in zip(*(group[field] for group in series[breakdown]))] == \
+                series[field]
+
+
+@pytest.mark.parametrize("year", [2023, 2024])
+def test_year_totals_match_the_year_summary(db, year):
+    series = db.get_time_series(f"{year}-01-01", f"{year}-12-31", "month")
+    summary = db.get_year_summary(year)
+    assert round(sum(series["revenue"]), 2) == summary["revenue"]
+    assert round(sum(series["expenses"]), 2) == summary["expenses"]
+
+
+def test_writes_drop_only_the_overlapping_series(db):
+    series_2023 = db.get_time_series("2023-01-01", "2023-12-31")
+    series_2024 = db.get_time_series("2024-01-01", "2024-12-31")
+    db.update_transaction_category(6, db.fetch_categories()[1][0])
+    assert db.get_time_series("2023-01-01", "2023-12-31") is series_2023
+    refreshed = db.get_time_series("2024-01-01", "2024-12-31")
+    assert refreshed is not series_2024
+    assert refreshed["expenses"][2] == -999.00
+
+
+@pytest.mark.parametrize("bound", ["7/18/2025", "2025-2-3", "2025-02-30", "20250203", "2025", "2025-02-03x"])
+def test_non_iso_bounds_are_rejected_and_not_cached(db, bound):
+    with pytest.raises(ValueError):
+        db.get_time_series(start_date=bound)
+    with pytest.raises(ValueError):
+        db.get_time_series(end_date=bound)
+    assert not db._time_series
+    db.get_time_series("2024-01-01", "2024-12-31")
+    db.update_transaction_category(6, db.fetch_categories()[1][0])
+    assert not db._time_series
+
+
+def test_date_bounds_share_the_string_bounds_entry(db):
+    series = db.get_time_series(" 2024-01-01 ", "2024-12-31")
+    assert db.get_time_series(date(2024, 1, 1), date(2024, 12, 31)) is series
@@ -0,0 +1,109 @@
+"""
+vendor_1099_totals, kept by triggers, agrees with v_1099_summary and with
+rebuild_vendor_1099_totals after inserts, updates and deletes.
+"""
+import pytest
+
+from src.core.form_1099 import vendors_over_threshold
+
+INSERT_SQL = """
+    INSERT INTO transactions (account_id, transaction_date, payee_description, amount,
+                              vendor_id, payment_type_1099_id, is_1099_reportable, tax_year)
+    VALUES (1, ?, 'payment', ?, ?, ?, ?, ?)
+"""
+
+
+@pytest.fixture
+def db(new_db):
+    """A database with two vendors"""
+    new_db.add_vendor("Acme Plumbing", requires_1099=True)
+    new_db.add_vendor("Bolt Electric", requires_1099=True)
+    return new_db
+
+
+def run(db, sql, params=()):
+    with db.transaction() as conn:
+        return conn.execute(sql, params).lastrowid
+
+
+def insert(db, date, amount, vendor_id=1, payment_type_id=1, reportable=True, tax_year=None):
+    return run(db, INSERT_SQL, (date, amount, vendor_id, payment_type_id, reportable, tax_year))
+
+
+def running_totals(db):
+    """(tax_year, vendor_id, payment type id, total cents, count) rows of vendor_1099_totals"""
+    with db.transaction() as conn:
+        return conn.execute("""
+            SELECT tax_year, vendor_id, payment_type_1099_id, total_cents, transaction_count
+            FROM vendor_1099_totals
+            ORDER BY tax_year, vendor_id, payment_type_1099_id
+        """).fetchall()
+
+
+def assert_consistent(db):
+    """The running totals match v_1099_summary and a rebuild from scratch"""
+    totals = running_totals(db)
+    with db.transaction() as conn:
+        summary = conn.execute("""
+            SELECT COALESCE(s.tax_year, 0), s.vendor_id, CAST(ROUND(s.total_amount * 100) AS INTEGER), s.transaction_count
+            FROM v_1099_summary s
+            ORDER BY 1, 2
+        """).fetchall()
+    over_threshold = [(year, vendor_id, cents, count)
+                      for year, vendor_id, _, cents, count in totals if cents >= 60000]
+    assert over_threshold == summary
+    assert all(count > 0 for *_, count in totals), totals
+    db.rebuild_vendor_1099_totals()
+    assert running_totals(db) == totals
+
+
+def test_insert_with_tax_year_is_counted(db):
+    insert(db, "2031-02-03", -5000, tax_year=2031)
+    assert running_totals(db) == [(2031, 1, 1, 500000, 1)]
+    assert [total.vendor_id for total in vendors_over_threshold(db, 2031)] == [1]
+    assert_consistent(db)
+
+
+def test_insert_without_tax_year_is_counted_once(db):
+    insert(db, "2031-02-03", -700)
+    insert(db, "7/18/31", -800)
+    assert running_totals(db) == [(0, 1, 1, 80000, 1), (2031, 1, 1, 70000, 1)]
+    assert_consistent(db)
+
+
+def test_insert_without_tax_year_after_bulk_import_recreates_triggers(db):
+    # A bulk import drops and recreates the insert triggers, which changes
+    # the order they fire in
+    db.bulk_insert_transactions([(1, "2031-01-05", None, "Coffee", None, -5.00, None, None)])
+    insert(db, "2031-02-03", -700)
+    insert(db, "2031-02-04", -900, tax_year=2031)
+    assert running_totals(db) == [(2031, 1, 1, 160000, 2)]
+    assert_consistent(db)
+
+
+def test_non_reportable_inserts_are_not_counted(db):
+    insert(db, "2031-02-03", -5000, reportable=False, tax_year=2031)
+    insert(db, "2031-02-03", 5000, tax_year=2031)
+    insert(db, "2031-02-03", -5000, vendor_id=None, tax_year=2031)
+    assert running_totals(db) == []
+    assert_consistent(db)
+
+
+def test_updates_move_payments_between_totals(db):
+    first = insert(db, "2031-02-03", -400, reportable=False)
+    second = insert(db, "2031-03-04", -300, tax_year=2031)
+    run(db, "UPDATE transactions SET is_1099_reportable = 1 WHERE id = ?", (first,))
+    assert_consistent(db)
+    run(db, "UPDATE transactions SET amount = -650 WHERE id = ?", (second,))
+    assert_consistent(db)
+    run(db, "UPDATE transactions SET vendor_id = 2 WHERE id = ?", (first,))
+    assert_consistent(db)
+    run(db, "UPDATE transactions SET payment_type_1099_id = 2 WHERE id = ?", (second,))
+    assert_consistent(db)
+    run(db, "UPDATE transactions SET transaction_date = '2032-01-02' WHERE id = ?", (first,))
+    assert running_totals(db) == [(2031, 1, 2, 65000, 1), (2032, 2, 1, 40000, 1)]
+    assert_consistent(db)
+    run(db, "UPDATE transactions SET is_1099_reportable = 0 WHERE id = ?", (first,))
+    run(db, "DELETE FROM transactions WHERE id = ?", (second,))
+    assert running_totals(db) == []
+    assert_consistent(db)